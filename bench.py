@@ -0,0 +1,371 @@
+"""Замер скорости планировщика, сохранения и статистики.
+
+Запуск:
+    python bench.py                              # 1k, 100k и 1M клиентов
+    python bench.py --sizes 1000,100000 --output base.json
+    python bench.py --sizes 1000 --repeat 5 --compare base.json
+
+На каждый размер и распределение весов строится синтетическая компания
+(клиенты и парк с запасом грузоподъемности ~10%) и замеряются:
+add_client, optimize_cargo_distribution, get_statistics, save_to_file и
+load_from_file во всех форматах, remove_client. Каждый случай считается
+в отдельном процессе, поэтому пик памяти (максимальный RSS) относится
+только к нему; у каждого этапа записан пик на момент его окончания.
+
+При --repeat каждый случай прогоняется несколько раз и у каждого этапа
+берется лучшее время. Результаты сохраняются в JSON вместе с коммитом,
+версией Python и параметрами запуска; --compare печатает изменение
+времени и качества упаковки относительно прошлого прогона. При
+--workers больше 1 та же компания считается еще и в одном процессе, и в
+отчет попадает разница загрузки использованного транспорта.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from core import Airplane, Client, TransportCompany, Train, Vehicle
+from packing import DEFAULT_STRATEGY, STRATEGIES, pack
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+STATISTICS_CALLS = 10000
+REMOVE_CALLS = 1000
+FORMATS = ('.json', '.jsonl', '.bin')
+CAPACITY_RESERVE = 1.1  # Грузоподъемность парка относительно суммарного веса
+
+
+# ==================== ГЕНЕРАТОРЫ ====================
+
+def _uniform(rng):
+    return rng.uniform(0.1, 5.0)
+
+
+def _normal(rng):
+    return min(max(rng.gauss(2.0, 0.7), 0.1), 10.0)
+
+
+def _bimodal(rng):
+    # Много мелких посылок и немного тяжелых грузов
+    if rng.random() < 0.8:
+        return rng.uniform(0.2, 1.0)
+    return rng.uniform(5.0, 10.0)
+
+
+def _heavy_tail(rng):
+    return min(0.5 * rng.paretovariate(2.5), 20.0)
+
+
+DISTRIBUTIONS = {
+    'uniform': _uniform,
+    'normal': _normal,
+    'bimodal': _bimodal,
+    'heavy': _heavy_tail,
+}
+
+
+def generate_clients(count, distribution='uniform', seed=0):
+    """Список из count клиентов с весами из распределения distribution."""
+    weight = DISTRIBUTIONS[distribution]
+    rng = random.Random(seed)
+    return [Client(f"client{i}", round(weight(rng), 1), rng.random() < 0.1)
+            for i in range(count)]
+
+
+def generate_fleet(total_weight, seed=0):
+    """Смешанный парк с грузоподъемностью около CAPACITY_RESERVE * total_weight.
+
+    Машины - 70% парка, самолеты - 20%, поезда - 10%.
+    """
+    rng = random.Random(seed)
+    vehicles = []
+    capacity = 0.0
+    while capacity < total_weight * CAPACITY_RESERVE:
+        kind = rng.random()
+        if kind < 0.7:
+            vehicle = Vehicle(rng.uniform(10.0, 40.0))
+        elif kind < 0.9:
+            vehicle = Airplane(rng.uniform(20.0, 60.0), rng.choice((8000, 10000, 12000)))
+        else:
+            vehicle = Train(rng.uniform(100.0, 400.0), rng.randint(4, 10))
+        vehicles.append(vehicle)
+        capacity += vehicle.capacity
+    return vehicles
+
+
+# ==================== ЗАМЕРЫ ====================
+
+def _peak_rss_mb():
+    """Максимальный RSS процесса в МБ (None, если модуля resource нет)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдает килобайты, macOS - байты
+    return peak / 1024 / (1024 if sys.platform == 'darwin' else 1)
+
+
+def _phase(seconds, ops, **extra):
+    phase = {
+        'seconds': seconds,
+        'ops': ops,
+        'ops_per_sec': ops / seconds if seconds > 0 else None,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+    phase.update(extra)
+    return phase
+
+
+def _min_vehicles(vehicles, load):
+    """Нижняя оценка числа машин: самые вместительные, пока не наберется load."""
+    count = 0
+    for capacity in sorted((v.capacity for v in vehicles), reverse=True):
+        if load <= 0:
+            break
+        load -= capacity
+        count += 1
+    return count
+
+
+def _quality(company, result):
+    placed_load = result.total_load
+    lower_bound = _min_vehicles(company.vehicles, placed_load)
+    used = len(result.used_vehicles)
+    return {
+        'vehicles_used': used,
+        'vehicles_lower_bound': lower_bound,
+        'excess_vehicles': used - lower_bound,
+        'unplaced_clients': len(result.unplaced),
+        'used_fill_percentage': result.get_used_fill(),
+        'fleet_fill_percentage': result.get_fleet_fill(),
+    }
+
+
+def _serial_used_fill(count, distribution, strategy, seed):
+    """Загрузка использованного транспорта при расчете в одном процессе."""
+    clients = generate_clients(count, distribution, seed)
+    vehicles = generate_fleet(sum(c.cargo_weight for c in clients), seed)
+    return pack(vehicles, clients, strategy).get_used_fill()
+
+
+def run_case(count, distribution, strategy, seed=0, workers=1):
+    """Замеряет все этапы для одной синтетической компании."""
+    phases = {}
+
+    start = time.perf_counter()
+    clients = generate_clients(count, distribution, seed)
+    total_weight = sum(c.cargo_weight for c in clients)
+    vehicles = generate_fleet(total_weight, seed)
+    phases['generate'] = _phase(time.perf_counter() - start, count + len(vehicles))
+
+    company = TransportCompany("Замер")
+    start = time.perf_counter()
+    for client in clients:
+        company.add_client(client)
+    phases['add_client'] = _phase(time.perf_counter() - start, count)
+    company.add_vehicles(vehicles)
+
+    start = time.perf_counter()
+    company.optimize_cargo_distribution(strategy, workers=workers)
+    quality = _quality(company, company.last_packing)
+    phases['optimize'] = _phase(time.perf_counter() - start, count, quality=quality)
+    if workers > 1:
+        # Параллельный расчет делит парк на группы и может загрузить его
+        # хуже: сравниваем с обычным расчетом тех же данных
+        quality['serial_used_fill_percentage'] = _serial_used_fill(count, distribution,
+                                                                   strategy, seed)
+        quality['used_fill_gap'] = (quality['serial_used_fill_percentage']
+                                    - quality['used_fill_percentage'])
+
+    start = time.perf_counter()
+    for _ in range(STATISTICS_CALLS):
+        statistics = company.get_statistics()
+    phases['get_statistics'] = _phase(time.perf_counter() - start, STATISTICS_CALLS)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for extension in FORMATS:
+            filename = os.path.join(folder, 'company' + extension)
+            name = extension.lstrip('.')
+
+            start = time.perf_counter()
+            company.save_to_file(filename)
+            size = os.path.getsize(filename)
+            phases['save_' + name] = _phase(time.perf_counter() - start, count, bytes=size)
+
+            loaded = TransportCompany("Замер")
+            start = time.perf_counter()
+            issues = loaded.load_from_file(filename)
+            phases['load_' + name] = _phase(
+                time.perf_counter() - start, count, bytes=size,
+                consistent=not issues and loaded.get_statistics()['clients_loaded']
+                == statistics['clients_loaded'])
+            del loaded
+
+    removed = random.Random(seed).sample([c.name for c in clients], min(REMOVE_CALLS, count))
+    start = time.perf_counter()
+    for name in removed:
+        company.remove_client(name)
+    phases['remove_client'] = _phase(time.perf_counter() - start, len(removed))
+
+    return {
+        'clients': count,
+        'distribution': distribution,
+        'strategy': strategy,
+        'workers': workers,
+        'vehicles': len(vehicles),
+        'total_weight': total_weight,
+        'peak_rss_mb': _peak_rss_mb(),
+        'phases': phases,
+    }
+
+
+def run_isolated(*args):
+    """run_case в отдельном процессе, чтобы пик памяти не копился между случаями."""
+    with ProcessPoolExecutor(max_workers=1,
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(run_case, *args).result()
+
+
+def merge_best(best, case):
+    """Оставляет в best лучшее время каждого этапа из двух прогонов одного случая."""
+    for name, phase in case['phases'].items():
+        if phase['seconds'] < best['phases'][name]['seconds']:
+            best['phases'][name] = phase
+    best['peak_rss_mb'] = max(best['peak_rss_mb'] or 0, case['peak_rss_mb'] or 0) or None
+    return best
+
+
+# ==================== ОТЧЕТ ====================
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        'commit': _git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def _case_key(case):
+    return case['clients'], case['distribution'], case['strategy'], case['workers']
+
+
+def print_case(case):
+    print(f"\n{case['clients']} клиентов, {case['distribution']}, {case['strategy']}: "
+          f"транспорта {case['vehicles']}, пик памяти {_format_mb(case['peak_rss_mb'])}")
+    for name, phase in case['phases'].items():
+        rate = phase['ops_per_sec']
+        print(f"  {name:<16} {phase['seconds'] * 1000:10.1f} мс"
+              f"  {rate if rate is not None else 0:14.0f} оп/с")
+    quality = case['phases']['optimize']['quality']
+    print(f"  качество: транспорта {quality['vehicles_used']} "
+          f"(нижняя оценка {quality['vehicles_lower_bound']}), "
+          f"загрузка {quality['used_fill_percentage']:.1f}%, "
+          f"не размещено {quality['unplaced_clients']}")
+    if 'used_fill_gap' in quality:
+        print(f"  в одном процессе: загрузка {quality['serial_used_fill_percentage']:.1f}% "
+              f"(параллельный хуже на {quality['used_fill_gap']:+.2f} п.п.)")
+
+
+def _format_mb(value):
+    return '—' if value is None else f"{value:.0f} МБ"
+
+
+def print_comparison(base, current):
+    """Печатает изменение времени этапов и числа машин относительно base."""
+    base_cases = {_case_key(case): case for case in base['results']}
+    print(f"\nСравнение с {base['environment'].get('commit') or 'прошлым прогоном'}:")
+    for case in current['results']:
+        old = base_cases.get(_case_key(case))
+        if old is None:
+            continue
+        print(f"  {case['clients']} клиентов, {case['distribution']}, {case['strategy']}:")
+        for name, phase in case['phases'].items():
+            old_phase = old['phases'].get(name)
+            if old_phase is None or not old_phase['seconds']:
+                continue
+            change = (phase['seconds'] / old_phase['seconds'] - 1) * 100
+            print(f"    {name:<16} {change:+7.1f}%")
+        used = case['phases']['optimize']['quality']['vehicles_used']
+        old_used = old['phases']['optimize']['quality']['vehicles_used']
+        print(f"    {'транспорта':<16} {old_used} -> {used}")
+
+
+def _sizes(text):
+    try:
+        sizes = [int(part) for part in text.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError("Размеры задаются целыми числами через запятую")
+    if any(size <= 0 for size in sizes):
+        raise argparse.ArgumentTypeError("Размеры должны быть положительными")
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер скорости транспортной компании")
+    parser.add_argument('--sizes', type=_sizes, default=list(DEFAULT_SIZES),
+                        help="число клиентов через запятую (по умолчанию 1000,100000,1000000)")
+    parser.add_argument('--distributions', default=','.join(DISTRIBUTIONS),
+                        help="распределения весов через запятую: " + ', '.join(DISTRIBUTIONS))
+    parser.add_argument('--strategy', default=DEFAULT_STRATEGY, choices=sorted(STRATEGIES))
+    parser.add_argument('--workers', type=int, default=1,
+                        help="процессов для optimize_cargo_distribution")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="прогонов каждого случая; берется лучшее время этапа")
+    parser.add_argument('--output', help="файл результатов (по умолчанию bench-<коммит>-<время>.json)")
+    parser.add_argument('--compare', help="JSON прошлого прогона для сравнения")
+    args = parser.parse_args()
+
+    distributions = args.distributions.split(',')
+    unknown = [d for d in distributions if d not in DISTRIBUTIONS]
+    if unknown:
+        parser.error(f"Неизвестное распределение: {', '.join(unknown)}")
+    if args.repeat <= 0:
+        parser.error("Число прогонов должно быть положительным")
+
+    report = {'environment': environment(), 'options': vars(args), 'results': []}
+    for count in args.sizes:
+        for distribution in distributions:
+            case = run_isolated(count, distribution, args.strategy, args.seed, args.workers)
+            for _ in range(args.repeat - 1):
+                case = merge_best(case, run_isolated(count, distribution, args.strategy,
+                                                     args.seed, args.workers))
+            report['results'].append(case)
+            print_case(case)
+
+    output = args.output or "bench-{}-{}.json".format(
+        report['environment']['commit'] or 'local', datetime.now().strftime('%Y%m%d-%H%M%S'))
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультаты сохранены в {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
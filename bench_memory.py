@@ -0,0 +1,76 @@
+"""Замер памяти на одного клиента и один транспорт.
+
+Запуск: python bench_memory.py [количество]
+
+Объекты создаются под tracemalloc, поэтому учитывается все, что они
+держат: сам объект, имя, числа, пустой clients_list, вагоны поезда.
+Для сравнения замеряются те же классы с __dict__ (копия класса без
+__slots__) и компания целиком, где значения транспорта лежат в FleetStore.
+"""
+
+import sys
+import tracemalloc
+
+from core import Airplane, Client, TransportCompany, Train, Vehicle
+
+
+def _without_slots(cls):
+    """Копия класса с теми же методами, но с __dict__ вместо __slots__."""
+    skip = set(cls.__slots__) | {'__slots__', '__dict__', '__weakref__'}
+    namespace = {key: value for key, value in vars(cls).items() if key not in skip}
+    return type(cls.__name__ + 'WithDict', cls.__bases__, namespace)
+
+
+_DictClient = _without_slots(Client)
+_DictVehicle = _without_slots(Vehicle)
+
+
+def measure(factory, count):
+    """Средний прирост памяти в байтах на один объект, созданный factory(i)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(objects)
+    tracemalloc.stop()
+    del objects
+    return used / count
+
+
+def measure_company(clients, vehicles):
+    """Байт на клиента и на транспорт внутри компании (с индексами и FleetStore)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    company = TransportCompany("Замер")
+    company.add_clients(Client(f"client{i}", 1.0 + i % 7) for i in range(clients))
+    after_clients = tracemalloc.get_traced_memory()[0]
+    company.add_vehicles(Vehicle(10.0 + i % 5) for i in range(vehicles))
+    after_vehicles = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del company
+    return (after_clients - before) / clients, (after_vehicles - after_clients) / vehicles
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    rows = [
+        ("Клиент", lambda i: Client(f"client{i}", 1.0 + i % 7)),
+        ("Клиент с __dict__", lambda i: _DictClient(f"client{i}", 1.0 + i % 7)),
+        ("Транспорт", lambda i: Vehicle(10.0 + i % 5)),
+        ("Транспорт с __dict__", lambda i: _DictVehicle(10.0 + i % 5)),
+        ("Самолет", lambda i: Airplane(10.0 + i % 5, 9000)),
+        ("Поезд, 10 вагонов", lambda i: Train(100.0 + i % 5, 10)),
+    ]
+
+    print(f"Объектов в замере: {count}")
+    for title, factory in rows:
+        print(f"  {title:<24} {measure(factory, count):8.1f} байт")
+
+    per_client, per_vehicle = measure_company(count, max(1, count // 10))
+    print("В компании (вместе с индексами):")
+    print(f"  {'Клиент':<24} {per_client:8.1f} байт")
+    print(f"  {'Транспорт':<24} {per_vehicle:8.1f} байт")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Замер времени холодного запуска без графического интерфейса.
+
+Запуск: python bench_startup.py [повторов]
+
+Каждый замер - отдельный процесс Python, поэтому модули грузятся с нуля.
+Сравниваются пустой интерпретатор, импорт core, main и main_gui и
+холодный расчет: импорт core, компания из 1000 клиентов, распределение
+и статистика. Для расчета дополнительно печатается, какие тяжелые модули
+оказались загружены (tkinter, json, csv и пул процессов грузиться не должны).
+
+Без скомпилированного байткода (__pycache__) модули каждый раз
+компилируются заново и время выше; перед замером стоит выполнить
+python -m compileall .
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ('tkinter', 'json', 'csv', 'multiprocessing', 'concurrent.futures')
+
+HEADLESS_RUN = f'''
+import sys, time
+started = time.perf_counter()
+from core import Client, TransportCompany, Vehicle
+company = TransportCompany("Замер")
+company.add_clients(Client(f"client{{i}}", 1.0 + i % 7) for i in range(1000))
+company.add_vehicles(Vehicle(40.0) for _ in range(150))
+company.optimize_cargo_distribution()
+company.get_statistics()
+elapsed = time.perf_counter() - started
+print(elapsed, ",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+'''
+
+CASES = [
+    ("Пустой интерпретатор", "pass"),
+    ("import core", "import core"),
+    ("import main", "import main"),
+    ("import main_gui", "import main_gui"),
+]
+
+
+def _run(code):
+    """Запускает code в новом процессе; возвращает (время в секундах, вывод)."""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    return time.perf_counter() - started, result.stdout
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    print(f"Медиана из {repeat} запусков, мс (процесс целиком):")
+    for title, code in CASES:
+        try:
+            times = [_run(code)[0] for _ in range(repeat)]
+        except subprocess.CalledProcessError as e:
+            print(f"  {title:<24} ошибка: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        print(f"  {title:<24} {statistics.median(times) * 1000:8.1f}")
+
+    runs = [_run(HEADLESS_RUN) for _ in range(repeat)]
+    inside = [float(output.split()[0]) for _, output in runs]
+    loaded = runs[-1][1].split()[1:]
+    print("\nХолодный расчет без интерфейса (1000 клиентов):")
+    print(f"  {'процесс целиком':<24} {statistics.median(t for t, _ in runs) * 1000:8.1f}")
+    print(f"  {'импорт и расчет':<24} {statistics.median(inside) * 1000:8.1f}")
+    print(f"  загружены тяжелые модули: {loaded[0] if loaded else 'нет'}")
+
+
+if __name__ == '__main__':
+    main()
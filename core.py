@@ -0,0 +1,1251 @@
+"""Модель транспортной компании: клиенты, транспорт и сама компания.
+
+Общая для консольной (main.py) и графической (main_gui.py) версий.
+Модуль не импортирует tkinter, json и csv: программа, которая только
+планирует перевозки, запускается за миллисекунды. Модули форматов
+файлов (json, snapshot) грузятся при первом сохранении или загрузке,
+пул процессов - при первом параллельном расчете (см. bench_startup.py).
+"""
+
+import gc
+from contextlib import contextmanager
+from operator import attrgetter, itemgetter
+
+from fleet import FleetStore
+from ids import VEHICLE_IDS
+from packing import (DEFAULT_PARTITION, DEFAULT_STRATEGY, UNLIMITED, CarIndex,
+                     PackingPlan, check_strategy, pack, plan_moves)
+
+LOAD_BATCH_SIZE = 10000  # Записей снимка в одной пачке проверки при загрузке
+
+
+@contextmanager
+def _gc_paused():
+    """Отключает сборщик циклического мусора на время массовой загрузки.
+    
+    Сборщик запускается по числу созданных объектов и каждый раз обходит
+    все уже загруженные данные; циклов-мусора загрузка не создает.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+# Типы, которые проверки isinstance(value, (int, float)) и isinstance(value, int)
+# в конструкторах пропускают без подклассов
+_NUMBER_TYPES = {int, float, bool}
+_COUNT_TYPES = {int, bool}
+
+
+def _column(items, key, default=None):
+    """Значения ключа key из списка словарей; без default ключ обязателен."""
+    try:
+        return list(map(itemgetter(key), items))
+    except KeyError:
+        if default is None:
+            raise
+        return [data.get(key, default) for data in items]
+
+
+class Client:
+    """Класс для представления клиента компании."""
+    
+    # Без __dict__: клиентов бывают миллионы (память на объект - см. bench_memory.py)
+    # _position - место в списке clients компании (для удаления за O(1))
+    __slots__ = ('name', 'cargo_weight', 'is_vip', 'volume', 'pallets', 'is_loaded', '_position')
+    
+    def __init__(self, name: str, cargo_weight: float, is_vip: bool = False,
+                 volume: float = 0.0, pallets: int = 0):
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Имя клиента должно быть непустой строкой")
+        
+        if not isinstance(cargo_weight, (int, float)) or cargo_weight <= 0:
+            raise ValueError("Вес груза должен быть положительным числом")
+        
+        if not isinstance(is_vip, bool):
+            raise ValueError("is_vip должен быть булевым значением")
+        
+        if not isinstance(volume, (int, float)) or volume < 0:
+            raise ValueError("Объем груза должен быть неотрицательным числом")
+        
+        if not isinstance(pallets, int) or pallets < 0:
+            raise ValueError("Количество паллет должно быть неотрицательным целым числом")
+        
+        self.name = name.strip()
+        self.cargo_weight = float(cargo_weight)
+        self.is_vip = is_vip
+        self.volume = float(volume)  # м³
+        self.pallets = pallets
+        self.is_loaded = False
+    
+    def to_dict(self):
+        """Конвертирует объект в словарь."""
+        return {
+            'name': self.name,
+            'cargo_weight': self.cargo_weight,
+            'is_vip': self.is_vip,
+            'is_loaded': self.is_loaded,
+            'volume': self.volume,
+            'pallets': self.pallets
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Создает объект из словаря."""
+        client = cls(data['name'], data['cargo_weight'], data['is_vip'],
+                     data.get('volume', 0.0), data.get('pallets', 0))
+        client.is_loaded = data.get('is_loaded', False)
+        return client
+    
+    @classmethod
+    def from_dicts(cls, items):
+        """Создает клиентов из списка словарей с одной проверкой на весь список."""
+        columns = cls._check_columns(_column(items, 'name'), _column(items, 'cargo_weight'),
+                                     _column(items, 'is_vip'), _column(items, 'volume', 0.0),
+                                     _column(items, 'pallets', 0))
+        return list(map(cls._from_trusted, *columns, _column(items, 'is_loaded', False)))
+    
+    @classmethod
+    def _from_trusted(cls, name, cargo_weight, is_vip=False, volume=0.0, pallets=0,
+                      is_loaded=False):
+        """Создает клиента без проверок и приведения типов.
+        
+        Значения должны быть уже проверены, например _check_columns.
+        """
+        client = cls.__new__(cls)
+        client.name = name
+        client.cargo_weight = cargo_weight
+        client.is_vip = is_vip
+        client.volume = volume
+        client.pallets = pallets
+        client.is_loaded = is_loaded
+        return client
+    
+    @classmethod
+    def _check_columns(cls, names, weights, vips, volumes, pallets):
+        """Проверяет колонки значений клиентов так же, как __init__.
+        
+        Каждая колонка проверяется целиком. Возвращает колонки с
+        приведенными значениями для _from_trusted; при ошибке бросает
+        ValueError с тем же текстом, что и __init__.
+        """
+        if not names:
+            return names, weights, vips, volumes, pallets
+        weight_types = set(map(type, weights))
+        volume_types = set(map(type, volumes))
+        # min сравнивает без перехода в Python на каждое значение. NaN, как
+        # и в __init__, проверку проходит: либо min его пропускает, либо
+        # возвращает NaN, и тогда значения проверяются по одному
+        if (set(map(type, names)) <= {str}
+                and set(map(type, vips)) <= {bool}
+                and weight_types <= _NUMBER_TYPES and min(weights) > 0
+                and volume_types <= _NUMBER_TYPES and min(volumes) >= 0
+                and set(map(type, pallets)) <= _COUNT_TYPES and min(pallets) >= 0):
+            names = list(map(str.strip, names))
+            if '' not in names:
+                if weight_types != {float}:
+                    weights = list(map(float, weights))
+                if volume_types != {float}:
+                    volumes = list(map(float, volumes))
+                return names, weights, vips, volumes, pallets
+        
+        # Есть ошибка или значения необычных типов: проверяем по одному
+        clients = [cls(*row) for row in zip(names, weights, vips, volumes, pallets)]
+        return ([c.name for c in clients], [c.cargo_weight for c in clients],
+                [c.is_vip for c in clients], [c.volume for c in clients],
+                [c.pallets for c in clients])
+    
+    def __str__(self):
+        vip_status = "VIP" if self.is_vip else "Обычный"
+        status = "✓ Загружен" if self.is_loaded else "✗ Не загружен"
+        cargo = f"{self.cargo_weight} т"
+        if self.volume:
+            cargo += f", {self.volume} м³"
+        if self.pallets:
+            cargo += f", {self.pallets} пал."
+        return f"{self.name} | Груз: {cargo} | {vip_status} | {status}"
+    
+    def __repr__(self):
+        return f"Client('{self.name}', {self.cargo_weight}, {self.is_vip})"
+
+
+class Vehicle:
+    """Базовый класс для транспортного средства."""
+    
+    ID_PREFIX = 'VHC'
+    
+    __slots__ = ('vehicle_id', '_fleet', '_slot', '_capacity', '_current_load',
+                 'max_volume', 'max_pallets', 'current_volume', 'current_pallets',
+                 'cars', 'clients_list', '_company', '_position')
+    
+    def __init__(self, capacity: float, max_volume: float = None, max_pallets: int = None):
+        if not isinstance(capacity, (int, float)) or capacity <= 0:
+            raise ValueError("Грузоподъемность должна быть положительным числом")
+        
+        if max_volume is not None and (not isinstance(max_volume, (int, float)) or max_volume <= 0):
+            raise ValueError("Вместимость по объему должна быть положительным числом")
+        
+        if max_pallets is not None and (not isinstance(max_pallets, int) or max_pallets <= 0):
+            raise ValueError("Вместимость по паллетам должна быть положительным целым числом")
+        
+        self._setup(VEHICLE_IDS.allocate(self.ID_PREFIX), capacity, max_volume, max_pallets)
+    
+    def _setup(self, vehicle_id, capacity, max_volume, max_pallets):
+        """Заполняет поля пустого транспорта по уже проверенным значениям."""
+        self.vehicle_id = vehicle_id
+        self._fleet = None  # FleetStore компании: пока транспорт в ней, значения хранятся там
+        self._slot = -1
+        self._capacity = float(capacity)
+        self._current_load = 0.0
+        # Ограничения по объему и паллетам; UNLIMITED - ограничения нет
+        self.max_volume = float(max_volume) if max_volume is not None else UNLIMITED
+        self.max_pallets = max_pallets if max_pallets is not None else UNLIMITED
+        self.current_volume = 0.0
+        self.current_pallets = 0
+        self.cars = None  # CarIndex у транспорта из нескольких вагонов
+        self.clients_list = []
+        self._company = None  # Компания-владелец, получает уведомления о загрузке/выгрузке
+    
+    @property
+    def capacity(self):
+        if self._fleet is None:
+            return self._capacity
+        return float(self._fleet.capacity[self._slot])
+    
+    @capacity.setter
+    def capacity(self, value):
+        if self._fleet is None:
+            self._capacity = value
+        else:
+            self._fleet.capacity[self._slot] = value
+    
+    @property
+    def current_load(self):
+        if self._fleet is None:
+            return self._current_load
+        return float(self._fleet.current_load[self._slot])
+    
+    @current_load.setter
+    def current_load(self, value):
+        if self._fleet is None:
+            self._current_load = value
+        else:
+            self._fleet.current_load[self._slot] = value
+    
+    def load_cargo(self, client):
+        if not isinstance(client, Client):
+            raise TypeError("Параметр должен быть объектом класса Client")
+        
+        if client.is_loaded:
+            raise ValueError(f"Груз клиента '{client.name}' уже загружен")
+        
+        if self.current_load + client.cargo_weight > self.capacity:
+            raise ValueError(
+                f"Превышена грузоподъемность! "
+                f"Требуется: {client.cargo_weight} т, "
+                f"Доступно: {self.capacity - self.current_load:.2f} т"
+            )
+        
+        if (self.current_volume + client.volume > self.max_volume
+                or self.current_pallets + client.pallets > self.max_pallets):
+            raise ValueError(
+                f"Превышена вместимость! "
+                f"Требуется: {client.volume} м³, {client.pallets} пал., "
+                f"Доступно: {self.max_volume - self.current_volume:.2f} м³, "
+                f"{self.max_pallets - self.current_pallets} пал."
+            )
+        
+        if self.cars is not None:
+            self.cars.add(client)  # Выбирает вагон или сообщает, что места нет
+        self.current_load += client.cargo_weight
+        self.current_volume += client.volume
+        self.current_pallets += client.pallets
+        self.clients_list.append(client)
+        client.is_loaded = True
+        if self._company is not None:
+            self._company._on_cargo_loaded(self, client)
+        return True
+    
+    def unload_cargo(self, client_name: str = None):
+        """Выгружает груз(ы) из транспортного средства."""
+        if not self.clients_list:
+            return []
+        
+        if client_name:
+            for i, client in enumerate(self.clients_list):
+                if client.name == client_name:
+                    self.current_load -= client.cargo_weight
+                    self.current_volume -= client.volume
+                    self.current_pallets -= client.pallets
+                    if self.cars is not None:
+                        self.cars.remove(client)
+                    removed = self.clients_list.pop(i)
+                    removed.is_loaded = False
+                    if self._company is not None:
+                        self._company._on_cargo_unloaded(self, removed)
+                    return [removed]
+            return []
+        else:
+            removed = self.clients_list.copy()
+            for client in removed:
+                client.is_loaded = False
+            self.clients_list.clear()
+            self.current_load = 0.0
+            self.current_volume = 0.0
+            self.current_pallets = 0
+            if self.cars is not None:
+                self.cars.clear()
+            if self._company is not None:
+                self._company._on_vehicle_unloaded(self, removed)
+            return removed
+    
+    def can_fit(self, weight: float, volume: float = 0.0, pallets: int = 0):
+        """Проверяет, поместится ли груз по весу, объему и числу паллет.
+        
+        У транспорта из вагонов груз должен целиком поместиться в один вагон.
+        """
+        return (self.current_load + weight <= self.capacity
+                and self.current_volume + volume <= self.max_volume
+                and self.current_pallets + pallets <= self.max_pallets
+                and (self.cars is None or self.cars.find(weight, volume, pallets) >= 0))
+    
+    def get_available_capacity(self):
+        return self.capacity - self.current_load
+    
+    def get_load_percentage(self):
+        return (self.current_load / self.capacity * 100) if self.capacity > 0 else 0
+    
+    def to_dict(self):
+        """Конвертирует объект в словарь."""
+        return {
+            'vehicle_id': self.vehicle_id,
+            'capacity': self.capacity,
+            'current_load': self.current_load,
+            'clients_list': [c.name for c in self.clients_list],
+            'type': self.__class__.__name__,
+            'max_volume': self.max_volume if self.max_volume != UNLIMITED else None,
+            'max_pallets': self.max_pallets if self.max_pallets != UNLIMITED else None
+        }
+    
+    @staticmethod
+    def from_dict(data):
+        """Создает пустой транспорт нужного типа из словаря.
+        
+        Если vehicle_id в словаре нет, транспорт получает новый ID.
+        """
+        if data['type'] == 'Train':
+            vehicle = Train(data['capacity'], data['number_of_cars'],
+                            data.get('car_volume'), data.get('car_pallets'))
+        elif data['type'] == 'Airplane':
+            vehicle = Airplane(data['capacity'], data['max_altitude'],
+                               data.get('max_volume'), data.get('max_pallets'))
+        else:
+            vehicle = Vehicle(data['capacity'], data.get('max_volume'), data.get('max_pallets'))
+        
+        if data.get('vehicle_id'):
+            vehicle.vehicle_id = VEHICLE_IDS.reserve(data['vehicle_id'])
+        return vehicle
+    
+    @staticmethod
+    def from_dicts(items):
+        """Создает пустой транспорт из списка словарей с одной проверкой на весь список.
+        
+        Как и from_dict, бросает ValueError с текстом ошибки конструктора.
+        """
+        columns = {}  # Тип -> (словари, значения для _restore без vehicle_id)
+        for data in items:
+            kind = data['type']
+            if kind == 'Train':
+                values = (data['capacity'], data['number_of_cars'],
+                          data.get('car_volume'), data.get('car_pallets'))
+            elif kind == 'Airplane':
+                values = (data['capacity'], data['max_altitude'],
+                          data.get('max_volume'), data.get('max_pallets'))
+            else:
+                values = (data['capacity'], data.get('max_volume'), data.get('max_pallets'))
+            group, rows = columns.setdefault(kind, ([], []))
+            group.append(data)
+            rows.append(values)
+        
+        for kind, (group, rows) in columns.items():
+            if not _valid_vehicle_rows(kind, rows):
+                # Конструктор найдет ошибку и сообщит о ней своим текстом
+                for data in group:
+                    Vehicle.from_dict(data)
+        
+        classes = {'Train': Train, 'Airplane': Airplane}
+        vehicle_ids = [data.get('vehicle_id') for data in items]
+        VEHICLE_IDS.reserve_many(vehicle_id for vehicle_id in vehicle_ids if vehicle_id)
+        
+        # Транспорту без ID новые номера выдаются одной пачкой на префикс
+        missing = {}
+        for data, vehicle_id in zip(items, vehicle_ids):
+            if not vehicle_id:
+                prefix = classes.get(data['type'], Vehicle).ID_PREFIX
+                missing[prefix] = missing.get(prefix, 0) + 1
+        new_ids = {prefix: iter(VEHICLE_IDS.allocate_many(prefix, count))
+                   for prefix, count in missing.items()}
+        
+        vehicles = []
+        for data, vehicle_id in zip(items, vehicle_ids):
+            cls = classes.get(data['type'], Vehicle)
+            if not vehicle_id:
+                vehicle_id = next(new_ids[cls.ID_PREFIX])
+            if cls is Train:
+                vehicle = Train._restore(vehicle_id, data['capacity'], data['number_of_cars'],
+                                         data.get('car_volume'), data.get('car_pallets'))
+            elif cls is Airplane:
+                vehicle = Airplane._restore(vehicle_id, data['capacity'], data['max_altitude'],
+                                            data.get('max_volume'), data.get('max_pallets'))
+            else:
+                vehicle = Vehicle._restore(vehicle_id, data['capacity'],
+                                           data.get('max_volume'), data.get('max_pallets'))
+            vehicles.append(vehicle)
+        return vehicles
+    
+    @classmethod
+    def _restore(cls, vehicle_id, capacity, max_volume=None, max_pallets=None):
+        """Создает пустой транспорт без проверок и без выдачи нового ID.
+        
+        Значения должны быть уже проверены; vehicle_id регистрирует
+        вызывающий (VEHICLE_IDS.reserve).
+        """
+        vehicle = cls.__new__(cls)
+        vehicle._setup(vehicle_id, capacity, max_volume, max_pallets)
+        return vehicle
+    
+    def __str__(self):
+        load_percent = self.get_load_percentage()
+        limits = ""
+        if self.max_volume != UNLIMITED:
+            limits += f"Объем: {self.current_volume:.1f}/{self.max_volume} м³ | "
+        if self.max_pallets != UNLIMITED:
+            limits += f"Паллет: {self.current_pallets}/{self.max_pallets} | "
+        return (f"[{self.vehicle_id}] "
+                f"Грузоподъемность: {self.capacity} т | "
+                f"Загружено: {self.current_load:.1f} т ({load_percent:.1f}%) | "
+                f"{limits}"
+                f"Клиентов: {len(self.clients_list)}")
+    
+    def __repr__(self):
+        return f"Vehicle('{self.vehicle_id}', {self.capacity})"
+
+
+class Train(Vehicle):
+    """Класс поезда.
+    
+    Каждый вагон - отдельное место для грузов с грузоподъемностью
+    capacity / number_of_cars; груз целиком кладется в один вагон.
+    """
+    
+    ID_PREFIX = 'TRN'
+    
+    __slots__ = ('number_of_cars', 'car_volume', 'car_pallets')
+    
+    def __init__(self, capacity: float, number_of_cars: int,
+                 car_volume: float = None, car_pallets: int = None):
+        if not isinstance(number_of_cars, int) or number_of_cars <= 0:
+            raise ValueError("Количество вагонов должно быть положительным целым числом")
+        
+        # Ограничения задаются на вагон, у поезда они суммируются
+        super().__init__(capacity,
+                         car_volume * number_of_cars if car_volume is not None else None,
+                         car_pallets * number_of_cars if car_pallets is not None else None)
+        self._setup_cars(number_of_cars, car_volume, car_pallets)
+    
+    @classmethod
+    def _restore(cls, vehicle_id, capacity, number_of_cars, car_volume=None, car_pallets=None):
+        vehicle = super()._restore(
+            vehicle_id, capacity,
+            car_volume * number_of_cars if car_volume is not None else None,
+            car_pallets * number_of_cars if car_pallets is not None else None)
+        vehicle._setup_cars(number_of_cars, car_volume, car_pallets)
+        return vehicle
+    
+    def _setup_cars(self, number_of_cars, car_volume, car_pallets):
+        self.number_of_cars = number_of_cars
+        self.car_volume = car_volume
+        self.car_pallets = car_pallets
+        # Грузоподъемность делится между вагонами поровну
+        self.cars = CarIndex(number_of_cars, self.capacity / number_of_cars,
+                             float(car_volume) if car_volume is not None else UNLIMITED,
+                             car_pallets if car_pallets is not None else UNLIMITED)
+    
+    def to_dict(self):
+        data = super().to_dict()
+        data['number_of_cars'] = self.number_of_cars
+        data['car_volume'] = self.car_volume
+        data['car_pallets'] = self.car_pallets
+        data['cars'] = [self.cars.car_of(c) for c in self.clients_list]  # Вагон каждого груза
+        return data
+    
+    def __str__(self):
+        base = super().__str__()
+        return f"🚂 Поезд ({self.number_of_cars} вагонов) | " + base
+
+
+class Airplane(Vehicle):
+    """Класс самолета."""
+    
+    ID_PREFIX = 'AIR'
+    
+    __slots__ = ('max_altitude',)
+    
+    def __init__(self, capacity: float, max_altitude: float,
+                 max_volume: float = None, max_pallets: int = None):
+        super().__init__(capacity, max_volume, max_pallets)
+        if not isinstance(max_altitude, (int, float)) or max_altitude <= 0:
+            raise ValueError("Максимальная высота должна быть положительным числом")
+        
+        self.max_altitude = float(max_altitude)
+    
+    @classmethod
+    def _restore(cls, vehicle_id, capacity, max_altitude, max_volume=None, max_pallets=None):
+        vehicle = super()._restore(vehicle_id, capacity, max_volume, max_pallets)
+        vehicle.max_altitude = float(max_altitude)
+        return vehicle
+    
+    def to_dict(self):
+        data = super().to_dict()
+        data['max_altitude'] = self.max_altitude
+        return data
+    
+    def __str__(self):
+        base = super().__str__()
+        return f"✈️ Самолет (до {self.max_altitude} м) | " + base
+
+
+def _valid_limits(values, types):
+    """Необязательные ограничения: None или положительные числа типов types."""
+    present = [value for value in values if value is not None]
+    return not present or (set(map(type, present)) <= types and min(present) > 0)
+
+
+def _valid_vehicle_rows(kind, rows):
+    """Проверяет по колонкам значения транспорта одного типа для _restore.
+    
+    True, если конструктор принял бы все строки; иначе проверку нужно
+    повторить конструктором, чтобы получить текст ошибки.
+    """
+    if kind == 'Train':
+        capacities, cars, car_volumes, car_pallets = zip(*rows)
+        return (None not in cars and _valid_limits(cars, _COUNT_TYPES)
+                and None not in capacities and _valid_limits(capacities, _NUMBER_TYPES)
+                and _valid_limits(car_volumes, _NUMBER_TYPES)
+                and _valid_limits(car_pallets, _COUNT_TYPES))
+    if kind == 'Airplane':
+        capacities, altitudes, max_volumes, max_pallets = zip(*rows)
+        if None in altitudes or not _valid_limits(altitudes, _NUMBER_TYPES):
+            return False
+    else:
+        capacities, max_volumes, max_pallets = zip(*rows)
+    return (None not in capacities and _valid_limits(capacities, _NUMBER_TYPES)
+            and _valid_limits(max_volumes, _NUMBER_TYPES)
+            and _valid_limits(max_pallets, _COUNT_TYPES))
+
+
+def _compacted(items):
+    """Список без мест удаленных объектов (None); места объектов пересчитываются."""
+    alive = [item for item in items if item is not None]
+    for position, item in enumerate(alive):
+        item._position = position
+    return alive
+
+
+class TransportCompany:
+    """Класс транспортной компании."""
+    
+    def __init__(self, name: str = "Моя транспортная компания"):
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Название компании должно быть непустой строкой")
+        
+        self.name = name.strip()
+        # Удаленный объект оставляет в списке None на своем месте (_position);
+        # списки уплотняются при следующем обращении к clients/vehicles,
+        # поэтому удаление стоит O(1) и порядок добавления сохраняется
+        self._vehicles = []
+        self._clients = []
+        self._removed_vehicles = 0
+        self._removed_clients = 0
+        
+        # Индексы для быстрого поиска, поддерживаются синхронно со списками
+        self._clients_by_name = {}   # имя -> Client
+        self._vehicles_by_id = {}    # vehicle_id -> Vehicle
+        self._client_vehicle = {}    # Client -> Vehicle, в котором лежит его груз
+        
+        # Грузоподъемность и загрузка транспорта в параллельных массивах
+        self.fleet = FleetStore()
+        
+        # Накопительные итоги для get_statistics, обновляются при каждом изменении
+        self._reset_statistics()
+        self.self_check = False  # Сверять итоги с полным пересчетом при каждом запросе
+        
+        self.last_packing = None  # Отчет о последнем распределении
+        self.load_issues = []     # Расхождения, найденные при последней загрузке из файла
+        
+        self.journal = None       # Journal, если изменения записываются в журнал
+        self._journal_muted = 0
+    
+    @property
+    def vehicles(self):
+        """Транспорт в порядке добавления (в том же порядке, что слоты FleetStore)."""
+        if self._removed_vehicles:
+            self._vehicles = _compacted(self._vehicles)
+            self._removed_vehicles = 0
+        return self._vehicles
+    
+    @vehicles.setter
+    def vehicles(self, vehicles):
+        self._vehicles = _compacted(vehicles)
+        self._removed_vehicles = 0
+    
+    @property
+    def clients(self):
+        """Клиенты в порядке добавления."""
+        if self._removed_clients:
+            self._clients = _compacted(self._clients)
+            self._removed_clients = 0
+        return self._clients
+    
+    @clients.setter
+    def clients(self, clients):
+        self._clients = _compacted(clients)
+        self._removed_clients = 0
+    
+    def _check_vehicle(self, vehicle):
+        if not isinstance(vehicle, (Vehicle, Train, Airplane)):
+            raise TypeError("Параметр должен быть объектом класса Vehicle или его наследника")
+    
+    def _check_client(self, client):
+        if not isinstance(client, Client):
+            raise TypeError("Параметр должен быть объектом класса Client")
+    
+    def _register_vehicle(self, vehicle):
+        vehicle._position = len(self._vehicles)
+        self._vehicles.append(vehicle)
+        self._vehicles_by_id[vehicle.vehicle_id] = vehicle
+        self.fleet.attach(vehicle)
+        vehicle._company = self
+        for client in vehicle.clients_list:
+            self._client_vehicle[client] = vehicle
+        
+        self._total_capacity += vehicle.capacity
+        self._total_load += vehicle.current_load
+        self._cargo_count += len(vehicle.clients_list)
+    
+    def _register_client(self, client):
+        client._position = len(self._clients)
+        self._clients.append(client)
+        self._clients_by_name[client.name] = client
+        
+        if client.is_vip:
+            self._vip_count += 1
+        if client.is_loaded:
+            self._loaded_clients += 1
+    
+    def _journaling(self):
+        """Записываются ли сейчас операции в журнал."""
+        return self.journal is not None and not self._journal_muted
+    
+    def _log(self, op, **data):
+        """Записывает операцию в журнал, если он подключен.
+        
+        Вызывается после того, как операция полностью применена: запись
+        может запустить сжатие журнала, которое снимает копию состояния.
+        """
+        if self.journal is not None and not self._journal_muted:
+            self.journal.append(op, data)
+    
+    @contextmanager
+    def _journal_batch(self):
+        """Группирует записи журнала; вложенные операции не журналируются."""
+        if self.journal is None:
+            yield
+            return
+        with self.journal.batch():
+            yield
+    
+    @contextmanager
+    def _journal_mute(self):
+        """Отключает журналирование операций, из которых состоит составная."""
+        self._journal_muted += 1
+        try:
+            yield
+        finally:
+            self._journal_muted -= 1
+    
+    def _on_cargo_loaded(self, vehicle, client):
+        """Вызывается транспортом после загрузки груза клиента."""
+        self._client_vehicle[client] = vehicle
+        
+        self._total_load += client.cargo_weight
+        self._cargo_count += 1
+        if self._clients_by_name.get(client.name) is client:
+            self._loaded_clients += 1
+        self._log('load', vehicle_id=vehicle.vehicle_id, client=client.name)
+    
+    def _on_cargo_unloaded(self, vehicle, client):
+        """Вызывается транспортом после выгрузки груза клиента."""
+        if self._client_vehicle.get(client) is vehicle:
+            del self._client_vehicle[client]
+        
+        self._total_load -= client.cargo_weight
+        self._cargo_count -= 1
+        if self._clients_by_name.get(client.name) is client:
+            self._loaded_clients -= 1
+        self._log('unload', vehicle_id=vehicle.vehicle_id, client=client.name)
+    
+    def _on_vehicle_unloaded(self, vehicle, clients):
+        """Вызывается транспортом после выгрузки всех грузов."""
+        with self._journal_mute():
+            for client in clients:
+                self._on_cargo_unloaded(vehicle, client)
+        self._log('unload', vehicle_id=vehicle.vehicle_id, client=None)
+    
+    def _compute_statistics(self):
+        """Считает итоги полным проходом по транспорту и клиентам."""
+        # Грузоподъемность и загрузка транспорта лежат в массивах FleetStore
+        return {
+            'total_capacity': self.fleet.total_capacity(),
+            'total_load': self.fleet.total_load(),
+            'clients_loaded': sum(len(v.clients_list) for v in self.vehicles),
+            'vip_clients': sum(1 for c in self.clients if c.is_vip),
+            'loaded_clients': sum(1 for c in self.clients if c.is_loaded),
+        }
+    
+    def _reset_statistics(self):
+        """Пересчитывает накопительные итоги с нуля."""
+        totals = self._compute_statistics()
+        self._total_capacity = totals['total_capacity']
+        self._total_load = totals['total_load']
+        self._cargo_count = totals['clients_loaded']
+        self._vip_count = totals['vip_clients']
+        self._loaded_clients = totals['loaded_clients']
+    
+    def check_statistics(self):
+        """Сверяет накопительные итоги с полным пересчетом.
+        
+        При расхождении выбрасывает RuntimeError.
+        """
+        totals = self._compute_statistics()
+        running = {
+            'total_capacity': self._total_capacity,
+            'total_load': self._total_load,
+            'clients_loaded': self._cargo_count,
+            'vip_clients': self._vip_count,
+            'loaded_clients': self._loaded_clients,
+        }
+        
+        for key, expected in totals.items():
+            actual = running[key]
+            # Суммы весов накапливают ошибку округления, счетчики должны совпадать точно
+            tolerance = 1e-6 * max(1.0, abs(expected)) if key.startswith('total_') else 0
+            if abs(actual - expected) > tolerance:
+                raise RuntimeError(
+                    f"Расхождение статистики '{key}': накоплено {actual}, пересчитано {expected}"
+                )
+        return True
+    
+    def add_vehicle(self, vehicle):
+        self._check_vehicle(vehicle)
+        
+        if vehicle.vehicle_id in self._vehicles_by_id:
+            raise ValueError(f"Транспорт с ID {vehicle.vehicle_id} уже существует")
+        
+        self._register_vehicle(vehicle)
+        self._log('add_vehicle', vehicle=vehicle.to_dict())
+        return True
+    
+    def add_vehicles(self, vehicles):
+        """Добавляет несколько транспортных средств за линейное время.
+        
+        Все объекты проверяются до добавления: при ошибке компания не меняется.
+        """
+        vehicles = list(vehicles)
+        new_ids = set()
+        for vehicle in vehicles:
+            self._check_vehicle(vehicle)
+            if vehicle.vehicle_id in self._vehicles_by_id or vehicle.vehicle_id in new_ids:
+                raise ValueError(f"Транспорт с ID {vehicle.vehicle_id} уже существует")
+            new_ids.add(vehicle.vehicle_id)
+        
+        journaling = self._journaling()  # Без журнала to_dict не нужен
+        with self._journal_batch():
+            for vehicle in vehicles:
+                self._register_vehicle(vehicle)
+                if journaling:
+                    self._log('add_vehicle', vehicle=vehicle.to_dict())
+        return len(vehicles)
+    
+    def remove_vehicle(self, vehicle_id: str):
+        vehicle = self._vehicles_by_id.get(vehicle_id)
+        if vehicle is None:
+            raise ValueError(f"Транспорт с ID {vehicle_id} не найден")
+        
+        with self._journal_mute():
+            vehicle.unload_cargo()  # Выгружаем все грузы перед удалением
+        self._total_capacity -= vehicle.capacity
+        self._total_load -= vehicle.current_load
+        self._vehicles[vehicle._position] = None
+        self._removed_vehicles += 1
+        del self._vehicles_by_id[vehicle_id]
+        self.fleet.detach(vehicle)
+        vehicle._company = None
+        self._log('remove_vehicle', vehicle_id=vehicle_id)
+        return vehicle
+    
+    def add_client(self, client):
+        self._check_client(client)
+        
+        if client.name in self._clients_by_name:
+            raise ValueError(f"Клиент с именем '{client.name}' уже существует")
+        
+        self._register_client(client)
+        self._log('add_client', client=client.to_dict())
+        return True
+    
+    def add_clients(self, clients):
+        """Добавляет нескольких клиентов за линейное время.
+        
+        Все объекты проверяются до добавления: при ошибке компания не меняется.
+        """
+        clients = list(clients)
+        new_names = set()
+        for client in clients:
+            self._check_client(client)
+            if client.name in self._clients_by_name or client.name in new_names:
+                raise ValueError(f"Клиент с именем '{client.name}' уже существует")
+            new_names.add(client.name)
+        
+        journaling = self._journaling()  # Без журнала to_dict не нужен
+        with self._journal_batch():
+            for client in clients:
+                self._register_client(client)
+                if journaling:
+                    self._log('add_client', client=client.to_dict())
+        return len(clients)
+    
+    def add_client_rows(self, rows):
+        """Добавляет клиентов из проверенных строк (имя, вес, VIP, объем, паллеты).
+        
+        Значения должны быть уже проверены (см. importer.py и
+        Client._check_columns), поэтому конструктор Client не вызывается.
+        Строки с занятыми именами не добавляются; возвращается список их
+        номеров в rows.
+        """
+        index = self._clients_by_name
+        clients = self._clients
+        journaling = self._journaling()
+        skipped = []
+        vip_count = 0
+        with self._journal_batch():
+            for i, row in enumerate(rows):
+                if row[0] in index:
+                    skipped.append(i)
+                    continue
+                # То же, что Client._from_trusted, без вызова функции на строку
+                client = Client.__new__(Client)
+                client.name, client.cargo_weight, client.is_vip, client.volume, client.pallets = row
+                client.is_loaded = False
+                client._position = len(clients)
+                clients.append(client)
+                index[client.name] = client
+                vip_count += client.is_vip
+                if journaling:
+                    self._log('add_client', client=client.to_dict())
+        self._vip_count += vip_count
+        return skipped
+    
+    def remove_client(self, client_name: str):
+        client = self._clients_by_name.get(client_name)
+        if client is None:
+            raise ValueError(f"Клиент с именем '{client_name}' не найден")
+        
+        if client.is_loaded:
+            vehicle = self._client_vehicle.get(client)
+            if vehicle is not None:
+                with self._journal_mute():
+                    vehicle.unload_cargo(client_name)
+        
+        if client.is_vip:
+            self._vip_count -= 1
+        if client.is_loaded:
+            self._loaded_clients -= 1
+        
+        self._clients[client._position] = None
+        self._removed_clients += 1
+        del self._clients_by_name[client_name]
+        self._log('remove_client', name=client_name)
+        return client
+    
+    def update_client(self, client, name: str, cargo_weight: float, is_vip: bool,
+                      volume: float = None, pallets: int = None):
+        """Изменяет данные клиента, сохраняя индексы в актуальном состоянии.
+        
+        volume и pallets, равные None, не изменяются.
+        """
+        name = name.strip()
+        if name != client.name and name in self._clients_by_name:
+            raise ValueError(f"Клиент с именем '{name}' уже существует")
+        
+        volume = client.volume if volume is None else float(volume)
+        pallets = client.pallets if pallets is None else pallets
+        old_name = client.name
+        if client.is_loaded and (cargo_weight, volume, pallets) != (client.cargo_weight, client.volume, client.pallets):
+            # Новый груз может не поместиться в прежний транспорт
+            vehicle = self._client_vehicle.get(client)
+            if vehicle is not None:
+                with self._journal_mute():
+                    vehicle.unload_cargo(client.name)
+        
+        if name != client.name:
+            del self._clients_by_name[client.name]
+            self._clients_by_name[name] = client
+        
+        self._vip_count += int(is_vip) - int(client.is_vip)
+        client.name = name
+        client.cargo_weight = float(cargo_weight)
+        client.is_vip = is_vip
+        client.volume = volume
+        client.pallets = pallets
+        self._log('update_client', old_name=old_name, name=name,
+                  cargo_weight=client.cargo_weight, is_vip=is_vip,
+                  volume=volume, pallets=pallets)
+    
+    def clear(self):
+        """Удаляет всех клиентов и весь транспорт."""
+        for vehicle in self.vehicles:
+            vehicle._company = None
+        self.fleet.clear()
+        self.vehicles = []
+        self.clients = []
+        self._clients_by_name = {}
+        self._vehicles_by_id = {}
+        self._client_vehicle = {}
+        self._reset_statistics()
+    
+    def get_client(self, client_name: str):
+        """Возвращает клиента по имени или None."""
+        return self._clients_by_name.get(client_name)
+    
+    def get_vehicle(self, vehicle_id: str):
+        """Возвращает транспорт по ID или None."""
+        return self._vehicles_by_id.get(vehicle_id)
+    
+    def get_client_vehicle(self, client):
+        """Возвращает транспорт, в который загружен груз клиента, или None."""
+        return self._client_vehicle.get(client)
+    
+    def list_vehicles(self):
+        return self.vehicles.copy()
+    
+    def list_clients(self):
+        return self.clients.copy()
+    
+    def get_unloaded_clients(self):
+        return [client for client in self.clients if not client.is_loaded]
+    
+    def get_available_vehicles(self):
+        """Транспорт со свободной грузоподъемностью в порядке self.vehicles.
+        
+        Слоты FleetStore идут в том же порядке добавления, что и self.vehicles.
+        """
+        return self.fleet.available_vehicles()
+    
+    def get_load_percentages(self):
+        """Проценты загрузки транспорта в порядке self.vehicles."""
+        return self.fleet.load_percentages_of(self.vehicles)
+    
+    def optimize_cargo_distribution(self, strategy: str = DEFAULT_STRATEGY, workers: int = 1,
+                                    partition: str = DEFAULT_PARTITION, improve: float = 0.0):
+        """Оптимизирует распределение грузов выбранной стратегией.
+        
+        При workers > 1 большой парк считается по частям в пуле процессов,
+        при improve > 0 результат улучшается локальным поиском в течение
+        improve секунд (см. packing.PackingPlan). Отчет о решении (время,
+        загрузка, улучшение) сохраняется в self.last_packing.
+        """
+        # Параметры и размер задачи проверяются до сброса загрузок: после
+        # него распределяются все клиенты
+        if workers > 1 or improve > 0:
+            plan = self.plan_cargo_distribution(strategy, workers, partition, improve)
+        else:
+            check_strategy(strategy, len(self.clients))
+        
+        with self._journal_mute():
+            for vehicle in self.vehicles:
+                vehicle.unload_cargo()
+            
+            if workers > 1 or improve > 0:
+                self.last_packing = plan.solve().apply()
+            else:
+                self.last_packing = pack(self.vehicles, self.clients, strategy)
+        # Полный пересчет все равно O(V), заодно сбрасываем ошибку округления
+        self._total_load = self.fleet.total_load()
+        self._log('optimize', strategy=strategy, workers=workers, partition=partition)
+        self._apply_improvement(self.last_packing)
+        return self.last_packing.used_vehicles
+    
+    def plan_cargo_distribution(self, strategy: str = DEFAULT_STRATEGY, workers: int = 1,
+                                partition: str = DEFAULT_PARTITION, improve: float = 0.0):
+        """Готовит план распределения для расчета вне главного потока.
+        
+        План считается так, будто весь транспорт разгружен; компания не
+        меняется. После plan.solve() план применяется apply_cargo_plan.
+        Пока план считается, данные компании менять нельзя.
+        """
+        return PackingPlan(self.vehicles, self.clients, strategy, reset=True,
+                           workers=workers, partition=partition, improve=improve)
+    
+    def apply_cargo_plan(self, plan):
+        """Применяет рассчитанный план: результат тот же, что у optimize_cargo_distribution."""
+        with self._journal_mute():
+            for vehicle in self.vehicles:
+                vehicle.unload_cargo()
+            
+            self.last_packing = plan.apply()
+        self._total_load = self.fleet.total_load()
+        self._log('optimize', strategy=plan.strategy, workers=plan.workers,
+                  partition=plan.partition)
+        self._apply_improvement(self.last_packing)
+        return self.last_packing.used_vehicles
+    
+    def _apply_moves(self, moves):
+        """Выполняет перемещения (packing.Move) по порядку."""
+        for move in moves:
+            if move.source is not None:
+                move.source.unload_cargo(move.client.name)
+            if move.target is not None:
+                move.target.load_cargo(move.client)
+    
+    def _apply_improvement(self, result):
+        """Применяет перемещения локального поиска из отчета о распределении.
+        
+        Время поиска ограничено, поэтому его результат не воспроизводим:
+        в журнал попадают сами перемещения, а не параметр improve.
+        """
+        if result.improvement is not None:
+            self._apply_moves(result.improvement.moves)
+            result.refresh_usage()
+    
+    def replan_cargo_distribution(self):
+        """Дораспределяет незагруженные грузы, сохраняя текущий план.
+        
+        Используется после добавления клиентов или удаления транспорта:
+        уже загруженные грузы переносятся, только если без этого новый груз
+        не помещается. Возвращает список выполненных перемещений (packing.Move).
+        """
+        moves, _ = plan_moves(self.vehicles, self.get_unloaded_clients())
+        self._apply_moves(moves)
+        
+        return moves
+    
+    def get_statistics(self):
+        """Возвращает статистику компании за O(1) по накопительным итогам."""
+        if self.self_check:
+            self.check_statistics()
+        
+        total_capacity = self._total_capacity
+        total_load = self._total_load
+        
+        return {
+            'company_name': self.name,
+            'vehicles_count': len(self._vehicles_by_id),
+            'clients_count': len(self._clients_by_name),
+            'vip_clients': self._vip_count,
+            'total_capacity': total_capacity,
+            'total_load': total_load,
+            'load_percentage': (total_load / total_capacity * 100) if total_capacity > 0 else 0,
+            'clients_loaded': self._cargo_count,
+            'clients_unloaded': len(self._clients_by_name) - self._loaded_clients
+        }
+    
+    def iter_records(self):
+        """Генератор записей снимка: сначала клиенты, затем транспорт."""
+        for client in self.clients:
+            yield 'client', client.to_dict()
+        for vehicle in self.vehicles:
+            yield 'vehicle', vehicle.to_dict()
+    
+    def save_to_file(self, filename):
+        """Сохраняет данные компании в файл.
+        
+        Файлы с расширением .jsonl пишутся потоково в формате JSON Lines,
+        .bin - в двоичном формате, остальные - одним JSON-документом.
+        """
+        import json
+        from datetime import datetime
+        from snapshot import BINARY_EXTENSION, JSONL_EXTENSION, write_binary, write_jsonl
+        
+        header = {'company_name': self.name, 'timestamp': datetime.now().isoformat()}
+        if filename.lower().endswith(JSONL_EXTENSION):
+            write_jsonl(filename, header, self.iter_records())
+            return
+        if filename.lower().endswith(BINARY_EXTENSION):
+            write_binary(filename, header, self.iter_records())
+            return
+        
+        data = {
+            'company_name': self.name,
+            'clients': [c.to_dict() for c in self.clients],
+            'vehicles': [v.to_dict() for v in self.vehicles],
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    
+    def load_from_file(self, filename):
+        """Загружает данные компании из файла.
+        
+        Формат (двоичный, JSON Lines или JSON) определяется по содержимому файла.
+        Загрузка транспорта и флаги is_loaded пересчитываются по спискам
+        клиентов в транспорте. Расхождения с сохраненными значениями
+        возвращаются списком строк и сохраняются в self.load_issues.
+        """
+        from snapshot import open_snapshot
+        
+        clients = []
+        clients_by_name = {}
+        issues = []
+        owners = {}  # Client -> vehicle_id
+        vehicles = []
+        vehicle_ids = set()
+        
+        def add_client_batch(batch):
+            for client in Client.from_dicts(batch):
+                if client.name in clients_by_name:
+                    raise ValueError(f"Клиент с именем '{client.name}' встречается в файле дважды")
+                clients_by_name[client.name] = client
+                clients.append(client)
+        
+        def add_vehicle_batch(batch):
+            for vehicle, v_data in zip(Vehicle.from_dicts(batch), batch):
+                if vehicle.vehicle_id in vehicle_ids:
+                    raise ValueError(f"Транспорт с ID {vehicle.vehicle_id} встречается в файле дважды")
+                vehicle_ids.add(vehicle.vehicle_id)
+                
+                load = 0.0
+                volume = 0.0
+                pallets = 0
+                stored_cars = v_data.get('cars') or []
+                cars = []  # Сохраненные вагоны принятых грузов
+                for k, client_name in enumerate(v_data['clients_list']):
+                    client = clients_by_name.get(client_name)
+                    if client is None:
+                        issues.append(f"{vehicle.vehicle_id}: клиент '{client_name}' не найден")
+                        continue
+                    if client in owners:
+                        issues.append(f"{vehicle.vehicle_id}: груз клиента '{client_name}' "
+                                      f"уже загружен в {owners[client]}")
+                        continue
+                    owners[client] = vehicle.vehicle_id
+                    vehicle.clients_list.append(client)
+                    cars.append(stored_cars[k] if k < len(stored_cars) else -1)
+                    load += client.cargo_weight
+                    volume += client.volume
+                    pallets += client.pallets
+                
+                stored_load = v_data.get('current_load', load)
+                if abs(stored_load - load) > 1e-6 * max(1.0, load):
+                    issues.append(f"{vehicle.vehicle_id}: сохраненная загрузка {stored_load} т, "
+                                  f"по списку клиентов {load} т")
+                if load > vehicle.capacity:
+                    issues.append(f"{vehicle.vehicle_id}: загрузка {load} т превышает "
+                                  f"грузоподъемность {vehicle.capacity} т")
+                if volume > vehicle.max_volume:
+                    issues.append(f"{vehicle.vehicle_id}: объем {volume} м³ превышает "
+                                  f"вместимость {vehicle.max_volume} м³")
+                if pallets > vehicle.max_pallets:
+                    issues.append(f"{vehicle.vehicle_id}: {pallets} паллет превышает "
+                                  f"вместимость {vehicle.max_pallets} паллет")
+                
+                vehicle.current_load = load
+                vehicle.current_volume = volume
+                vehicle.current_pallets = pallets
+                if vehicle.cars is not None:
+                    for client in vehicle.cars.rebuild(vehicle.clients_list, cars):
+                        issues.append(f"{vehicle.vehicle_id}: груз клиента '{client.name}' "
+                                      f"не помещается ни в один вагон")
+                vehicles.append(vehicle)
+        
+        # Записи проверяются пачками одного вида (Client.from_dicts,
+        # Vehicle.from_dicts); порядок записей сохраняется
+        add_batch = {'client': add_client_batch, 'vehicle': add_vehicle_batch}
+        batch_kind = None
+        batch = []
+        with _gc_paused():
+            header, records = open_snapshot(filename)
+            for kind, data in records:
+                if kind not in add_batch:
+                    issues.append(f"Пропущена запись неизвестного вида: {kind}")
+                    continue
+                if kind != batch_kind or len(batch) == LOAD_BATCH_SIZE:
+                    if batch:
+                        add_batch[batch_kind](batch)
+                    batch_kind = kind
+                    batch = []
+                batch.append(data)
+            if batch:
+                add_batch[batch_kind](batch)
+        
+        for client in clients:
+            is_loaded = client in owners
+            if client.is_loaded != is_loaded:
+                state = "загружен" if client.is_loaded else "не загружен"
+                issues.append(f"Клиент '{client.name}' отмечен как {state}, "
+                              f"но его груз {'найден' if is_loaded else 'не найден'} в транспорте")
+            client.is_loaded = is_loaded
+        
+        self.name = header['company_name']
+        # Клиенты уже проверены и собраны в индекс: они ставятся в компанию
+        # целиком, без add_clients и проверки каждого объекта
+        self.clear()
+        self.clients = clients
+        self._clients_by_name = clients_by_name
+        self._vip_count = sum(map(attrgetter('is_vip'), clients))
+        self._loaded_clients = len(owners)
+        for vehicle in vehicles:
+            self._register_vehicle(vehicle)
+        
+        if self.journal is not None:
+            # Замену всех данных журнал не выражает - сразу пишем снимок
+            self.journal.compact(background=False)
+        
+        self.load_issues = issues
+        return issues
+    
+    def apply_journal_record(self, op, data):
+        """Повторяет операцию из журнала (см. journal.Journal)."""
+        if op == 'add_client':
+            self.add_client(Client.from_dict(data['client']))
+        elif op == 'remove_client':
+            self.remove_client(data['name'])
+        elif op == 'update_client':
+            self.update_client(self.get_client(data['old_name']), data['name'],
+                               data['cargo_weight'], data['is_vip'],
+                               data.get('volume'), data.get('pallets'))
+        elif op == 'add_vehicle':
+            self.add_vehicle(Vehicle.from_dict(data['vehicle']))
+        elif op == 'remove_vehicle':
+            self.remove_vehicle(data['vehicle_id'])
+        elif op == 'load':
+            self.get_vehicle(data['vehicle_id']).load_cargo(self.get_client(data['client']))
+        elif op == 'unload':
+            self.get_vehicle(data['vehicle_id']).unload_cargo(data['client'])
+        elif op == 'optimize':
+            self.optimize_cargo_distribution(data['strategy'], data.get('workers', 1),
+                                             data.get('partition', DEFAULT_PARTITION))
+        else:
+            raise ValueError(f"Неизвестная операция журнала: {op}")
+    
+    def __str__(self):
+        stats = self.get_statistics()
+        return (f"🏢 {self.name}\n"
+                f"   Транспорт: {stats['vehicles_count']} | "
+                f"Клиенты: {stats['clients_count']} (VIP: {stats['vip_clients']})\n"
+                f"   Загружено: {stats['clients_loaded']} грузов")
@@ -0,0 +1,156 @@
+"""Экспорт результатов распределения в CSV и JSON.
+
+Общий для окна результатов (main_gui.py) и пакетного режима (main.py).
+statistics - словарь TransportCompany.get_statistics(), packing -
+необязательный отчет packing.PackingResult: с ним в файл попадают
+стратегия, время решения и список не поместившихся грузов.
+
+Файлы пишутся потоково, по строке на транспорт, поэтому расход памяти не
+зависит от размера плана. Запись идет во временный файл, который заменяет
+старый только после успешного завершения. progress(сделано, всего)
+вызывается каждые PROGRESS_STEP транспортных средств; исключение из него
+(например, ExportCancelled) прерывает экспорт, и файл не меняется.
+"""
+
+import csv
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+
+CSV_EXTENSION = '.csv'
+PROGRESS_STEP = 1000  # Транспорта между вызовами progress
+
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+class ExportCancelled(Exception):
+    """Экспорт прерван обработчиком прогресса."""
+
+
+@contextmanager
+def _replacing(filename, newline=None):
+    """Открывает временный файл, который при успешной записи заменяет filename."""
+    tmp_name = filename + '.tmp'
+    # Открываем до try: если файл не создался, удалять нечего, и наружу
+    # уходит исходная ошибка
+    f = open(tmp_name, 'w', newline=newline, encoding='utf-8')
+    try:
+        with f:
+            yield f
+    except BaseException:
+        os.remove(tmp_name)
+        raise
+    os.replace(tmp_name, filename)
+
+
+def _vehicles(used_vehicles, progress):
+    """Перебирает транспорт и сообщает о прогрессе."""
+    total = len(used_vehicles)
+    for done, vehicle in enumerate(used_vehicles):
+        if progress is not None and done % PROGRESS_STEP == 0:
+            progress(done, total)
+        yield vehicle
+    if progress is not None:
+        progress(total, total)
+
+
+def _distribution_row(vehicle):
+    return {
+        'vehicle_id': vehicle.vehicle_id,
+        'capacity': vehicle.capacity,
+        'current_load': vehicle.current_load,
+        'load_percentage': vehicle.get_load_percentage(),
+        'clients': [c.name for c in vehicle.clients_list]
+    }
+
+
+def _unplaced(packing):
+    return (c for c in packing.unplaced if not c.is_loaded)
+
+
+def _indented(value):
+    """Значение поля верхнего уровня JSON с отступами, как у json.dump(indent=2)."""
+    return json.dumps(value, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+
+
+def _write_list(f, values):
+    """Пишет значение-список поля верхнего уровня JSON по элементу на строку."""
+    f.write('[')
+    empty = True
+    for value in values:
+        f.write('\n    ' if empty else ',\n    ')
+        f.write(_encode(value))
+        empty = False
+    f.write(']' if empty else '\n  ]')
+
+
+def write_plan_json(filename, statistics, used_vehicles, packing=None, progress=None):
+    """Записывает распределение в JSON: строка на каждый транспорт."""
+    with _replacing(filename) as f:
+        f.write('{\n')
+        f.write(f'  "timestamp": {_encode(datetime.now().isoformat())},\n')
+        f.write(f'  "statistics": {_indented(statistics)},\n')
+        f.write('  "distribution": ')
+        _write_list(f, map(_distribution_row, _vehicles(used_vehicles, progress)))
+
+        if packing is not None:
+            f.write(',\n  "packing": ' + _indented({
+                'strategy': packing.strategy,
+                'elapsed': packing.elapsed,
+                'used_fill_percentage': packing.get_used_fill(),
+                'fleet_fill_percentage': packing.get_fleet_fill(),
+            }))
+            f.write(',\n  "unplaced": ')
+            _write_list(f, (client.name for client in _unplaced(packing)))
+        f.write('\n}\n')
+
+
+def write_plan_csv(filename, statistics, used_vehicles, packing=None, progress=None):
+    """Записывает распределение в CSV: статистика, затем строка на каждый транспорт."""
+    with _replacing(filename, newline='') as f:
+        writer = csv.writer(f)
+
+        # Записываем статистику
+        writer.writerow(["Статистика распределения грузов"])
+        writer.writerow(["Параметр", "Значение"])
+        writer.writerow(["Всего клиентов", statistics['clients_count']])
+        writer.writerow(["VIP клиентов", statistics['vip_clients']])
+        writer.writerow(["Использовано транспорта", len(used_vehicles)])
+        writer.writerow(["Общая грузоподъемность", f"{statistics['total_capacity']:.1f} т"])
+        writer.writerow(["Загружено всего", f"{statistics['total_load']:.1f} т"])
+        writer.writerow(["Эффективность загрузки", f"{statistics['load_percentage']:.1f}%"])
+        writer.writerow(["Загружено грузов", statistics['clients_loaded']])
+        writer.writerow(["Незагруженных грузов", statistics['clients_unloaded']])
+        writer.writerow([])
+
+        # Записываем распределение по транспорту
+        writer.writerow(["Распределение по транспортным средствам"])
+        writer.writerow(["Транспорт", "Грузоподъемность", "Загружено", "Процент", "Клиенты"])
+
+        for vehicle in _vehicles(used_vehicles, progress):
+            clients_list = ", ".join([c.name for c in vehicle.clients_list])
+            writer.writerow([
+                vehicle.vehicle_id,
+                f"{vehicle.capacity} т",
+                f"{vehicle.current_load:.1f} т",
+                f"{vehicle.get_load_percentage():.1f}%",
+                clients_list
+            ])
+
+        if packing is not None:
+            header_written = False
+            for client in _unplaced(packing):
+                if not header_written:
+                    writer.writerow([])
+                    writer.writerow(["Не поместились"])
+                    header_written = True
+                writer.writerow([client.name, f"{client.cargo_weight} т"])
+
+
+def write_plan(filename, statistics, used_vehicles, packing=None, progress=None):
+    """Записывает распределение в CSV или JSON в зависимости от расширения файла."""
+    if filename.lower().endswith(CSV_EXTENSION):
+        write_plan_csv(filename, statistics, used_vehicles, packing, progress)
+    else:
+        write_plan_json(filename, statistics, used_vehicles, packing, progress)
@@ -0,0 +1,166 @@
+"""Хранилище состояния парка в параллельных массивах.
+
+Грузоподъемность, текущая загрузка и код типа каждого транспорта лежат
+в отдельных массивах, а объекты Vehicle, добавленные в компанию, читают
+и пишут свои значения прямо в них. Поэтому итоги по парку, проценты
+загрузки и фильтры считаются одной векторной операцией.
+
+Если NumPy не установлен, используются массивы модуля array.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен
+    np = None
+
+# Код типа транспорта по имени класса; -1 - удаленный слот
+TYPE_CODES = {'Vehicle': 0, 'Train': 1, 'Airplane': 2}
+_DEAD = -1
+
+_INITIAL_SIZE = 16
+
+
+class FleetStore:
+    """Параллельные массивы capacity, current_load и type_code.
+
+    Слоты выдаются по порядку добавления. Удаленный слот помечается кодом
+    типа -1 и обнуляется; когда таких слотов больше половины, массивы
+    уплотняются с сохранением порядка.
+    """
+
+    def __init__(self):
+        self.owners = []  # Транспорт в каждом слоте (None для удаленных)
+        self._size = 0
+        self._dead = 0
+
+        if np is not None:
+            self.capacity = np.zeros(_INITIAL_SIZE)
+            self.current_load = np.zeros(_INITIAL_SIZE)
+            self.type_code = np.full(_INITIAL_SIZE, _DEAD, dtype=np.int8)
+        else:
+            self.capacity = array('d')
+            self.current_load = array('d')
+            self.type_code = array('b')
+
+    def __len__(self):
+        return self._size - self._dead
+
+    def _grow(self):
+        """Удваивает NumPy-массивы, когда в них не осталось места."""
+        new_size = len(self.capacity) * 2
+        for name, fill in (('capacity', 0.0), ('current_load', 0.0), ('type_code', _DEAD)):
+            old = getattr(self, name)
+            new = np.full(new_size, fill, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def attach(self, vehicle):
+        """Переносит значения транспорта в массивы и делает его представлением слота."""
+        slot = self._size
+        type_code = TYPE_CODES.get(vehicle.__class__.__name__, 0)
+
+        if np is not None:
+            if slot == len(self.capacity):
+                self._grow()
+            self.capacity[slot] = vehicle._capacity
+            self.current_load[slot] = vehicle._current_load
+            self.type_code[slot] = type_code
+        else:
+            self.capacity.append(vehicle._capacity)
+            self.current_load.append(vehicle._current_load)
+            self.type_code.append(type_code)
+
+        self.owners.append(vehicle)
+        self._size += 1
+        vehicle._fleet = self
+        vehicle._slot = slot
+
+    def detach(self, vehicle, compact: bool = True):
+        """Возвращает значения в сам объект транспорта и освобождает слот."""
+        slot = vehicle._slot
+        vehicle._capacity = float(self.capacity[slot])
+        vehicle._current_load = float(self.current_load[slot])
+        vehicle._fleet = None
+        vehicle._slot = -1
+
+        self.capacity[slot] = 0.0
+        self.current_load[slot] = 0.0
+        self.type_code[slot] = _DEAD
+        self.owners[slot] = None
+        self._dead += 1
+
+        if compact and self._dead > _INITIAL_SIZE and self._dead * 2 > self._size:
+            self._compact()
+
+    def _compact(self):
+        """Убирает удаленные слоты, сохраняя порядок транспорта."""
+        alive = [v for v in self.owners if v is not None]
+        capacity = [self.capacity[v._slot] for v in alive]
+        current_load = [self.current_load[v._slot] for v in alive]
+        type_code = [self.type_code[v._slot] for v in alive]
+
+        if np is not None:
+            size = max(_INITIAL_SIZE, len(alive) * 2)
+            self.capacity = np.zeros(size)
+            self.current_load = np.zeros(size)
+            self.type_code = np.full(size, _DEAD, dtype=np.int8)
+            self.capacity[:len(alive)] = capacity
+            self.current_load[:len(alive)] = current_load
+            self.type_code[:len(alive)] = type_code
+        else:
+            self.capacity = array('d', capacity)
+            self.current_load = array('d', current_load)
+            self.type_code = array('b', type_code)
+
+        for slot, vehicle in enumerate(alive):
+            vehicle._slot = slot
+        self.owners = alive
+        self._size = len(alive)
+        self._dead = 0
+
+    def clear(self):
+        """Отсоединяет весь транспорт."""
+        for vehicle in self.owners:
+            if vehicle is not None:
+                self.detach(vehicle, compact=False)
+        self.__init__()
+
+    # ---------- векторные операции по всему парку ----------
+
+    def total_capacity(self):
+        if np is not None:
+            return float(self.capacity[:self._size].sum())
+        return sum(self.capacity)
+
+    def total_load(self):
+        if np is not None:
+            return float(self.current_load[:self._size].sum())
+        return sum(self.current_load)
+
+    def load_percentages_of(self, vehicles):
+        """Проценты загрузки указанного транспорта этого парка в порядке vehicles."""
+        vehicles = list(vehicles)
+        if any(v._fleet is not self for v in vehicles):
+            return [v.get_load_percentage() for v in vehicles]
+        slots = [v._slot for v in vehicles]
+        if np is not None:
+            slots = np.array(slots, dtype=np.intp)
+            return (self.current_load[slots] / self.capacity[slots] * 100).tolist()
+        return [self.current_load[s] / self.capacity[s] * 100 for s in slots]
+
+    def available_vehicles(self):
+        """Транспорт со свободной грузоподъемностью в порядке слотов.
+
+        Слоты идут в порядке добавления транспорта, уплотнение этот порядок
+        сохраняет.
+        """
+        if np is not None:
+            n = self._size
+            mask = (self.type_code[:n] != _DEAD) & (self.capacity[:n] - self.current_load[:n] > 0)
+            owners = self.owners
+            return [owners[i] for i in np.flatnonzero(mask)]
+        return [vehicle for vehicle, capacity, load, code
+                in zip(self.owners, self.capacity, self.current_load, self.type_code)
+                if code != _DEAD and capacity - load > 0]
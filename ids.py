@@ -0,0 +1,99 @@
+"""Выдача уникальных ID транспорта.
+
+ID имеет вид ПРЕФИКС-XXXXXXXX, где XXXXXXXX - номер из общего счетчика
+в 36-ричной записи (цифры и заглавные латинские буквы). Счетчик
+начинается с текущего времени в миллисекундах, поэтому ID разных сеансов
+не пересекаются, и только растет, поэтому выданные ID не запоминаются.
+
+ID, пришедшие извне (загруженные из файла), регистрируются через
+reserve() (или пачкой через reserve_many()). Они тоже не запоминаются:
+если номер такого ID еще может быть выдан, счетчик переносится за него.
+ID другого вида со счетчиком совпасть не могут и пропускаются. Поэтому
+память не растет с числом загрузок, а регистрация и выдача стоят O(1).
+
+Номера берутся из счетчика пачками по batch_size; allocate_many выдает
+сразу много ID для массового добавления транспорта.
+"""
+
+import threading
+import time
+
+_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_DIGITS = 8
+_LIMIT = len(_ALPHABET) ** _DIGITS
+_ALPHABET_SET = frozenset(_ALPHABET)
+
+
+def _encode(number):
+    chars = []
+    for _ in range(_DIGITS):
+        number, digit = divmod(number, len(_ALPHABET))
+        chars.append(_ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def _decode(vehicle_id):
+    """Номер счетчика в ID вида ПРЕФИКС-XXXXXXXX или None для ID другого вида."""
+    _, dash, digits = vehicle_id.rpartition('-')
+    if not dash or len(digits) != _DIGITS or not _ALPHABET_SET.issuperset(digits):
+        return None
+    return int(digits, len(_ALPHABET))
+
+
+class IdAllocator:
+    """Счетчик ID, который перескакивает через номера, зарегистрированные извне."""
+
+    def __init__(self, batch_size: int = 1024, start: int = None):
+        if batch_size <= 0:
+            raise ValueError("Размер пачки должен быть положительным")
+        self.batch_size = batch_size
+        self._counter = int(time.time() * 1000) if start is None else start
+        self._next = 0   # Следующий номер текущей пачки
+        self._end = 0    # Конец текущей пачки (не включая)
+        self._lock = threading.Lock()
+
+    def _take(self):
+        """Следующий номер; новая пачка берется, когда текущая кончилась."""
+        if self._next == self._end:
+            self._next = self._counter % _LIMIT
+            self._end = self._next + self.batch_size
+            self._counter += self.batch_size
+        number = self._next
+        self._next += 1
+        return number % _LIMIT
+
+    def _skip(self, number):
+        """Переносит счетчик за number, если этот номер еще может быть выдан."""
+        upcoming = self._next if self._next < self._end else self._counter
+        if number >= upcoming % _LIMIT:
+            self._counter = number + 1
+            self._next = self._end = 0  # Остаток пачки не годится, берем новую
+
+    def allocate(self, prefix: str) -> str:
+        """Выдает новый ID с указанным префиксом."""
+        with self._lock:
+            return f"{prefix}-{_encode(self._take())}"
+
+    def allocate_many(self, prefix: str, count: int):
+        """Выдает count новых ID с указанным префиксом."""
+        with self._lock:
+            return [f"{prefix}-{_encode(self._take())}" for _ in range(count)]
+
+    def reserve(self, vehicle_id: str) -> str:
+        """Регистрирует ID, полученный извне, чтобы он больше не выдавался."""
+        number = _decode(vehicle_id)
+        if number is not None:
+            with self._lock:
+                self._skip(number)
+        return vehicle_id
+
+    def reserve_many(self, vehicle_ids):
+        """Регистрирует сразу много ID, полученных извне."""
+        numbers = [number for number in map(_decode, vehicle_ids) if number is not None]
+        if numbers:
+            with self._lock:
+                self._skip(max(numbers))
+
+
+# Общий счетчик ID транспорта программы
+VEHICLE_IDS = IdAllocator()
@@ -0,0 +1,514 @@
+"""Чтение клиентов и транспорта из файлов CSV и JSON Lines.
+
+Формат определяется по расширению: .jsonl - JSON Lines (один объект на
+строку), остальные файлы - CSV с заголовком. Имена колонок совпадают с
+ключами Client.to_dict и Vehicle.to_dict:
+
+клиенты   - name, cargo_weight, is_vip, volume, pallets
+            (is_vip, volume и pallets необязательны);
+транспорт - type (Vehicle, Train или Airplane), capacity, max_volume,
+            max_pallets, для поезда number_of_cars, car_volume, car_pallets,
+            для самолета max_altitude; vehicle_id необязателен.
+
+Пустая ячейка CSV равна отсутствующему значению.
+
+Заказы import_clients читает потоково: строки собираются в пачки по
+batch_size, пачка проверяется по колонкам (без проверок Client.__init__
+на каждый объект) и целиком передается в TransportCompany.add_client_rows.
+Строки с ошибками и повторами имен не прерывают импорт, а записываются
+в файл отказов (JSON Lines: file, line, error, row). В памяти в каждый
+момент не больше нескольких пачек, сколько бы строк ни было в файлах.
+import_clients - это parse_clients (разбор) и ClientImport (добавление
+в компанию), которые можно вызывать и по отдельности.
+
+Несколько файлов при workers > 1 разбираются параллельно в процессах
+(spawn, как в packing.PackingPlan). Пачки передаются через очередь
+ограниченного размера: если вставка не успевает, разбор ждет, а не копит
+пачки в памяти. Порядок клиентов из разных файлов при этом не определен.
+Запуск процессов стоит доли секунды, поэтому файлы общим размером меньше
+PARALLEL_MIN_BYTES всегда разбираются в одном процессе.
+"""
+
+import math
+import os
+import time
+from operator import itemgetter
+
+from core import Vehicle
+from snapshot import JSONL_EXTENSION
+
+VEHICLE_TYPES = ('Vehicle', 'Train', 'Airplane')
+CLIENT_COLUMNS = ('name', 'cargo_weight', 'is_vip', 'volume', 'pallets')
+IMPORT_BATCH_SIZE = 10000
+QUEUE_BATCHES = 4  # Пачек в очереди на каждый процесс разбора
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024  # Меньше - разбор в одном процессе быстрее
+
+_FLAGS = {'': False, '0': False, 'false': False, 'no': False, 'нет': False,
+          '1': True, 'true': True, 'yes': True, 'да': True, 'vip': True}
+
+
+def read_records(filename):
+    """Генератор пар (номер строки, словарь) из файла CSV или JSON Lines."""
+    if filename.lower().endswith(JSONL_EXTENSION):
+        import json
+        with open(filename, encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{filename}, строка {line_no}: некорректный JSON ({e})")
+                if not isinstance(data, dict):
+                    raise ValueError(f"{filename}, строка {line_no}: ожидается объект JSON")
+                yield line_no, data
+        return
+
+    import csv
+    with open(filename, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            # Пустые ячейки считаются отсутствующими значениями
+            yield reader.line_num, {key: value for key, value in row.items()
+                                    if key is not None and value not in (None, '')}
+
+
+def _number(data, key, convert=float, required=False):
+    value = data.get(key)
+    if value is None:
+        if required:
+            raise ValueError(f"нет значения '{key}'")
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"'{key}' должно быть числом")
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' должно быть числом, получено {value!r}")
+
+
+def vehicle_from_record(data):
+    """Создает пустой транспорт из записи файла."""
+    kind = data.get('type', 'Vehicle')
+    if kind not in VEHICLE_TYPES:
+        raise ValueError(f"неизвестный тип транспорта {kind!r}")
+    return Vehicle.from_dict({
+        'type': kind,
+        'vehicle_id': data.get('vehicle_id'),
+        'capacity': _number(data, 'capacity', required=True),
+        'max_volume': _number(data, 'max_volume'),
+        'max_pallets': _number(data, 'max_pallets', int),
+        'number_of_cars': _number(data, 'number_of_cars', int, required=kind == 'Train'),
+        'car_volume': _number(data, 'car_volume'),
+        'car_pallets': _number(data, 'car_pallets', int),
+        'max_altitude': _number(data, 'max_altitude', required=kind == 'Airplane'),
+    })
+
+
+def read_fleet(filename):
+    """Читает список транспорта из файла."""
+    vehicles = []
+    for line_no, data in read_records(filename):
+        try:
+            vehicles.append(vehicle_from_record(data))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{filename}, строка {line_no}: {e}")
+    return vehicles
+
+
+# ==================== ПОТОКОВЫЙ ИМПОРТ ЗАКАЗОВ ====================
+
+_NAME_ERROR = "Имя клиента должно быть непустой строкой"
+_WEIGHT_ERROR = "Вес груза должен быть положительным числом"
+_VIP_ERROR = "is_vip должно быть да/нет"
+_VOLUME_ERROR = "Объем груза должен быть неотрицательным числом"
+_PALLETS_ERROR = "Количество паллет должно быть неотрицательным целым числом"
+
+
+def _client_batches(filename, batch_size):
+    """Генератор пачек файла заказов: (колонки, номера строк, строки, отказы).
+
+    колонки - имена из CLIENT_COLUMNS, которые есть в файле; строки -
+    кортежи значений этих колонок; отказы - строки, которые не удалось
+    разобрать, в виде (номер строки, ошибка, {'raw': текст строки}).
+    """
+    lines = []
+    rows = []
+    rejects = []
+
+    if filename.lower().endswith(JSONL_EXTENSION):
+        import json
+        columns = CLIENT_COLUMNS
+        with open(filename, encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    if not isinstance(data, dict):
+                        raise ValueError("ожидается объект JSON")
+                except ValueError as e:
+                    rejects.append((line_no, f"некорректная строка JSON ({e})",
+                                    {'raw': line.rstrip('\n')}))
+                else:
+                    lines.append(line_no)
+                    rows.append((data.get('name'), data.get('cargo_weight'), data.get('is_vip'),
+                                 data.get('volume'), data.get('pallets')))
+                if len(rows) + len(rejects) == batch_size:
+                    yield columns, lines, rows, rejects
+                    lines, rows, rejects = [], [], []
+        if rows or rejects:
+            yield columns, lines, rows, rejects
+        return
+
+    # Строки CSV отклоняет только проверка пачки (_check_batch), она же
+    # дописывает отказы в список - поэтому у каждой пачки он новый
+    import csv
+    with open(filename, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [column.strip() for column in next(reader, [])]
+        for column in CLIENT_COLUMNS[:2]:
+            if column not in header:
+                raise ValueError(f"{filename}: нет колонки '{column}'")
+        columns = tuple(column for column in CLIENT_COLUMNS if column in header)
+        positions = [header.index(column) for column in columns]
+        width = max(positions) + 1
+        take = itemgetter(*positions)
+        for row in reader:
+            if len(row) < width:
+                if not row:
+                    continue
+                row += [''] * (width - len(row))
+            lines.append(reader.line_num)
+            rows.append(take(row))
+            if len(rows) == batch_size:
+                yield columns, lines, rows, []
+                lines, rows = [], []
+        if rows:
+            yield columns, lines, rows, []
+
+
+def _to_float(value, default):
+    """Число из значения колонки; None, если это не конечное число."""
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _to_count(value):
+    """Целое число из значения колонки; None, если это не целое число."""
+    if value is None or value == '':
+        return 0
+    if isinstance(value, (bool, float)):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _mark(errors, values, bad, message):
+    """Отмечает ошибкой строки, значения которых не прошли проверку bad."""
+    for i, value in enumerate(values):
+        if bad(value):
+            errors.setdefault(i, message)
+
+
+def _check_names(values, errors):
+    try:
+        names = [value.strip() for value in values]
+    except AttributeError:  # В JSON имя может быть не строкой
+        names = [value.strip() if isinstance(value, str) else '' for value in values]
+    if '' in names:
+        _mark(errors, names, lambda name: not name, _NAME_ERROR)
+    return names
+
+
+def _check_numbers(values, errors, message, default, positive, strings):
+    """Колонка чисел с плавающей точкой; неверные значения отмечаются в errors.
+
+    Обычный случай - колонка CSV без ошибок - проверяется целиком:
+    map(float), затем min и сумма (сумма конечна, только если конечны все).
+    """
+    numbers = None
+    if strings:
+        if default is not None:
+            values = [value or default for value in values]
+        try:
+            numbers = list(map(float, values))
+        except ValueError:
+            pass
+    if numbers is None:
+        numbers = [_to_float(value, default) for value in values]
+
+    if None not in numbers and math.isfinite(sum(numbers)):
+        lowest = min(numbers)
+        if lowest > 0 or (lowest >= 0 and not positive):
+            return numbers
+    _mark(errors, numbers, lambda number: number is None or not math.isfinite(number)
+          or number < 0 or (positive and number == 0), message)
+    return numbers
+
+
+def _check_flags(values, errors):
+    try:
+        return [_FLAGS[value] for value in values]
+    except (KeyError, TypeError):
+        pass
+    flags = []
+    for value in values:
+        if isinstance(value, bool) or value is None:
+            flags.append(bool(value))
+        else:
+            flags.append(_FLAGS.get(str(value).strip().lower()))
+    _mark(errors, flags, lambda flag: flag is None, _VIP_ERROR)
+    return flags
+
+
+def _check_counts(values, errors, strings):
+    counts = None
+    if strings:
+        try:
+            counts = list(map(int, [value or 0 for value in values]))
+        except ValueError:
+            pass
+    if counts is None:
+        counts = [_to_count(value) for value in values]
+    if None in counts or min(counts) < 0:
+        _mark(errors, counts, lambda count: count is None or count < 0, _PALLETS_ERROR)
+    return counts
+
+
+def _check_batch(columns, lines, rows, rejects, strings):
+    """Проверяет пачку строк по колонкам.
+
+    Возвращает (номера строк, записи, отказы): записи - кортежи (имя, вес,
+    VIP, объем, паллеты), отказы - (номер строки, ошибка, значения строки).
+    """
+    if not rows:
+        return [], [], rejects
+
+    count = len(rows)
+    data = dict(zip(columns, zip(*rows)))
+    errors = {}  # Номер в пачке -> первая найденная ошибка
+    names = _check_names(data['name'], errors)
+    weights = _check_numbers(data['cargo_weight'], errors, _WEIGHT_ERROR, None, True, strings)
+    vips = _check_flags(data['is_vip'], errors) if 'is_vip' in data else [False] * count
+    volumes = (_check_numbers(data['volume'], errors, _VOLUME_ERROR, 0.0, False, strings)
+               if 'volume' in data else [0.0] * count)
+    pallets = _check_counts(data['pallets'], errors, strings) if 'pallets' in data else [0] * count
+
+    records = list(zip(names, weights, vips, volumes, pallets))
+    if not errors:
+        return lines, records, rejects
+
+    valid_lines = []
+    valid = []
+    for i, record in enumerate(records):
+        if i in errors:
+            row = {column: value for column, value in zip(columns, rows[i])
+                   if value is not None and value != ''}
+            rejects.append((lines[i], errors[i], row))
+        else:
+            valid_lines.append(lines[i])
+            valid.append(record)
+    return valid_lines, valid, rejects
+
+
+def _parse_file(filename, batch_size):
+    """Генератор проверенных пачек (номера строк, записи, отказы) из файла заказов."""
+    strings = not filename.lower().endswith(JSONL_EXTENSION)  # В CSV все значения - строки
+    for columns, lines, rows, rejects in _client_batches(filename, batch_size):
+        yield _check_batch(columns, lines, rows, rejects, strings)
+
+
+def _parse_worker(filenames, batch_size, queue):
+    """Процесс разбора: отправляет в очередь пачки своих файлов."""
+    for filename in filenames:
+        try:
+            for lines, records, rejects in _parse_file(filename, batch_size):
+                queue.put(('batch', filename, lines, records, rejects))
+        except (OSError, ValueError) as e:
+            queue.put(('error', str(e)))
+            break
+    queue.put(('done',))
+
+
+def _parallel_batches(filenames, batch_size, workers):
+    """Генератор (файл, номера строк, записи, отказы) из процессов разбора."""
+    import multiprocessing
+    from queue import Empty
+
+    context = multiprocessing.get_context('spawn')
+    workers = min(workers, len(filenames))
+    queue = context.Queue(maxsize=workers * QUEUE_BATCHES)
+    processes = [context.Process(target=_parse_worker,
+                                 args=(filenames[k::workers], batch_size, queue),
+                                 daemon=True)
+                 for k in range(workers)]
+    for process in processes:
+        process.start()
+
+    running = len(processes)
+    try:
+        while running:
+            try:
+                message = queue.get(timeout=0.5)
+            except Empty:
+                if any(process.is_alive() for process in processes):
+                    continue
+                try:
+                    # Последние сообщения могли прийти, пока проверялись процессы
+                    message = queue.get(timeout=1)
+                except Empty:
+                    raise RuntimeError("Процесс разбора файлов завершился аварийно")
+            if message[0] == 'done':
+                running -= 1
+            elif message[0] == 'error':
+                raise ValueError(message[1])
+            else:
+                yield message[1:]
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+
+class _Rejects:
+    """Файл отказов; открывается при первой отклоненной строке.
+
+    Файл прошлого импорта удаляется сразу: если новый импорт прошел без
+    отказов, файла отказов нет.
+    """
+
+    EXAMPLES = 10
+
+    def __init__(self, filename):
+        if filename is not None:
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+        self.filename = filename
+        self.count = 0
+        self.examples = []  # Первые отказы для сообщения пользователю
+        self._file = None
+
+    def add(self, source, line_no, error, row):
+        self.count += 1
+        if len(self.examples) < self.EXAMPLES:
+            self.examples.append(f"{source}, строка {line_no}: {error}")
+        if self.filename is None:
+            return
+        import json
+        if self._file is None:
+            self._file = open(self.filename, 'w', encoding='utf-8')
+        self._file.write(json.dumps({'file': source, 'line': line_no, 'error': error, 'row': row},
+                                    ensure_ascii=False) + '\n')
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _total_size(filenames):
+    """Общий размер файлов в байтах; 0, если какого-то файла нет."""
+    try:
+        return sum(os.path.getsize(filename) for filename in filenames)
+    except OSError:
+        # Ошибку о файле сообщит разбор в этом процессе
+        return 0
+
+
+def parse_clients(filenames, workers=1, batch_size=IMPORT_BATCH_SIZE):
+    """Разбирает файлы заказов, не трогая компанию.
+
+    Возвращает генератор проверенных пачек (файл, номера строк, записи,
+    отказы) для ClientImport.add. При workers > 1 файлы общим размером от
+    PARALLEL_MIN_BYTES разбираются параллельно; закрытие генератора
+    останавливает процессы разбора.
+    """
+    if isinstance(filenames, str):
+        filenames = [filenames]
+    if batch_size <= 0:
+        raise ValueError("Размер пачки должен быть положительным")
+
+    if workers > 1 and len(filenames) > 1 and _total_size(filenames) >= PARALLEL_MIN_BYTES:
+        return _parallel_batches(list(filenames), batch_size, workers)
+    return ((filename, *batch)
+            for filename in filenames
+            for batch in _parse_file(filename, batch_size))
+
+
+class ClientImport:
+    """Добавление в компанию пачек из parse_clients.
+
+    Разбор и добавление разделены, как расчет и применение в
+    packing.PackingPlan: разбор может идти в рабочем потоке, а компанию
+    меняет только поток, которому она принадлежит (см. main_gui.py).
+    """
+
+    def __init__(self, company, rejects=None):
+        self.company = company
+        self.rows = 0
+        self.imported = 0
+        self._log = _Rejects(rejects)
+        self._started = time.perf_counter()
+
+    @property
+    def rejected(self):
+        return self._log.count
+
+    def add(self, filename, lines, records, rejected):
+        """Добавляет пачку; повторы имен записываются в отказы."""
+        self.rows += len(records) + len(rejected)
+        for line_no, error, row in rejected:
+            self._log.add(filename, line_no, error, row)
+
+        skipped = self.company.add_client_rows(records)
+        for i in skipped:
+            record = records[i]
+            self._log.add(filename, lines[i], f"Клиент с именем '{record[0]}' уже существует",
+                          dict(zip(CLIENT_COLUMNS, record)))
+        self.imported += len(records) - len(skipped)
+
+    def close(self):
+        """Закрывает файл отказов и возвращает итог, как import_clients."""
+        self._log.close()
+        return {
+            'rows': self.rows,
+            'imported': self.imported,
+            'rejected': self._log.count,
+            'examples': self._log.examples,
+            'elapsed': time.perf_counter() - self._started,
+        }
+
+
+def import_clients(company, filenames, rejects=None, workers=1,
+                   batch_size=IMPORT_BATCH_SIZE):
+    """Потоково добавляет в компанию клиентов из файлов заказов.
+
+    rejects - имя файла отказов (JSON Lines); без него отклоненные строки
+    только подсчитываются. При workers > 1 файлы общим размером от
+    PARALLEL_MIN_BYTES разбираются параллельно.
+    Ошибка всего файла (нет файла, нет обязательной колонки) прерывает
+    импорт; уже добавленные пачки остаются в компании.
+
+    Возвращает словарь: rows, imported, rejected, examples (первые отказы),
+    elapsed (секунды).
+    """
+    batches = parse_clients(filenames, workers, batch_size)
+    session = ClientImport(company, rejects)
+    try:
+        for batch in batches:
+            session.add(*batch)
+    finally:
+        summary = session.close()
+    return summary
@@ -0,0 +1,163 @@
+"""Журнал изменений транспортной компании.
+
+Каждая операция (добавление и удаление клиентов и транспорта, загрузка,
+выгрузка, оптимизация) дописывается одной строкой JSON в файл журнала и
+сразу сбрасывается на диск, поэтому сохранение стоит пропорционально
+числу изменений, а при сбое теряется не больше последней операции.
+
+Рядом с журналом хранится полный снимок в формате JSON Lines. Когда
+журнал вырастает до compact_every операций, он сжимается: текущий
+сегмент журнала закрывается, а снимок переписывается в фоновом потоке.
+Каждая операция имеет номер; номер последней вошедшей в снимок операции
+записывается в его заголовок, поэтому при восстановлении уже учтенные
+операции пропускаются.
+"""
+
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from snapshot import read_header, write_jsonl
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def _read_log(filename):
+    """Генератор записей журнала. Недописанная последняя строка пропускается."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break  # Запись оборвалась при сбое
+            if line.strip():
+                yield json.loads(line)
+
+
+class Journal:
+    """Журнал операций компании со сжатием в снимок."""
+
+    def __init__(self, path: str, compact_every: int = 10000, sync: bool = False):
+        self.path = path                        # Файл снимка (JSON Lines)
+        self.log_path = path + '.log'           # Текущий сегмент журнала
+        self.old_log_path = path + '.log.old'   # Сегмент, который сжимается в снимок
+        self.compact_every = compact_every
+        self.sync = sync  # os.fsync после каждой операции (защита и от сбоя питания)
+
+        self.company = None
+        self.seq = 0       # Номер последней записанной операции
+        self.pending = 0   # Операций в журнале с последнего сжатия
+        self._file = None
+        self._batch = 0
+        self._compactor = None
+
+    def open(self, company):
+        """Восстанавливает компанию из снимка и журнала и начинает запись.
+
+        Возвращает число воспроизведенных операций.
+        """
+        seq = 0
+        if os.path.exists(self.path):
+            company.load_from_file(self.path)
+            seq = read_header(self.path).get('journal_seq', 0)
+
+        replayed = 0
+        for log_path in (self.old_log_path, self.log_path):
+            if not os.path.exists(log_path):
+                continue
+            for record in _read_log(log_path):
+                if record['seq'] <= seq:
+                    continue
+                company.apply_journal_record(record['op'], record)
+                seq = record['seq']
+                replayed += 1
+
+        self.seq = seq
+        self.pending = replayed
+        self.company = company
+        self._file = open(self.log_path, 'a', encoding='utf-8')
+        company.journal = self
+
+        if not os.path.exists(self.path):
+            self.compact(background=False)
+        return replayed
+
+    def close(self):
+        """Дожидается сжатия и закрывает журнал."""
+        if self._compactor is not None:
+            self._compactor.join()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.company is not None:
+            self.company.journal = None
+            self.company = None
+
+    def append(self, op: str, data: dict):
+        """Дописывает операцию в журнал."""
+        self.seq += 1
+        self._file.write(_encode({'seq': self.seq, 'op': op, **data}) + '\n')
+        self.pending += 1
+        if not self._batch:
+            self._commit()
+
+    @contextmanager
+    def batch(self):
+        """Сбрасывает на диск группу операций один раз в конце."""
+        self._batch += 1
+        try:
+            yield
+        finally:
+            self._batch -= 1
+            if not self._batch:
+                self._commit()
+
+    def _commit(self):
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+        if self.pending >= self.compact_every:
+            self.compact()
+
+    def compact(self, background: bool = True):
+        """Сжимает журнал в полный снимок.
+
+        Состояние копируется в вызывающем потоке, а запись снимка на диск
+        в фоновом режиме идет в отдельном потоке. Если предыдущее сжатие
+        еще не закончилось, фоновое сжатие пропускается и возвращает
+        False, а синхронное дожидается его и сжимает журнал.
+        """
+        if self._compactor is not None and self._compactor.is_alive():
+            if background:
+                return False
+            self._compactor.join()
+
+        records = list(self.company.iter_records())
+        header = {'company_name': self.company.name,
+                  'timestamp': datetime.now().isoformat(),
+                  'journal_seq': self.seq}
+
+        # Закрываем текущий сегмент; новые операции пойдут в новый файл
+        self._file.close()
+        if os.path.exists(self.old_log_path):
+            # Прошлое сжатие не завершилось - сегменты объединяются
+            with open(self.old_log_path, 'a', encoding='utf-8') as old, \
+                    open(self.log_path, 'r', encoding='utf-8') as current:
+                shutil.copyfileobj(current, old)
+            os.remove(self.log_path)
+        else:
+            os.replace(self.log_path, self.old_log_path)
+        self._file = open(self.log_path, 'a', encoding='utf-8')
+        self.pending = 0
+
+        def write_snapshot():
+            write_jsonl(self.path, header, records)
+            os.remove(self.old_log_path)
+
+        if background:
+            self._compactor = threading.Thread(target=write_snapshot, daemon=True)
+            self._compactor.start()
+        else:
+            write_snapshot()
+        return True
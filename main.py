@@ -1,279 +1,9 @@
-import random
-import string
-
-# ==================== КЛАССЫ (как в предыдущем задании) ====================
-
-class Client:
-    """Класс для представления клиента компании."""
-    
-    def __init__(self, name: str, cargo_weight: float, is_vip: bool = False):
-        if not isinstance(name, str) or not name.strip():
-            raise ValueError("Имя клиента должно быть непустой строкой")
-        
-        if not isinstance(cargo_weight, (int, float)) or cargo_weight <= 0:
-            raise ValueError("Вес груза должен быть положительным числом")
-        
-        if not isinstance(is_vip, bool):
-            raise ValueError("is_vip должен быть булевым значением")
-        
-        self.name = name.strip()
-        self.cargo_weight = float(cargo_weight)
-        self.is_vip = is_vip
-        self.is_loaded = False  # Новый атрибут для отслеживания загрузки
-    
-    def __str__(self):
-        vip_status = "VIP" if self.is_vip else "Обычный"
-        status = "✓ Загружен" if self.is_loaded else "✗ Не загружен"
-        return f"{self.name} | Груз: {self.cargo_weight} т | {vip_status} | {status}"
-    
-    def __repr__(self):
-        return f"Client('{self.name}', {self.cargo_weight}, {self.is_vip})"
-
-
-class Vehicle:
-    """Базовый класс для транспортного средства."""
-    
-    def __init__(self, capacity: float):
-        if not isinstance(capacity, (int, float)) or capacity <= 0:
-            raise ValueError("Грузоподъемность должна быть положительным числом")
-        
-        self.vehicle_id = self._generate_id()
-        self.capacity = float(capacity)
-        self.current_load = 0.0
-        self.clients_list = []
-    
-    def _generate_id(self):
-        return 'VHC-' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-    
-    def load_cargo(self, client):
-        if not isinstance(client, Client):
-            raise TypeError("Параметр должен быть объектом класса Client")
-        
-        if client.is_loaded:
-            raise ValueError(f"Груз клиента '{client.name}' уже загружен")
-        
-        new_load = self.current_load + client.cargo_weight
-        
-        if new_load > self.capacity:
-            raise ValueError(
-                f"Превышена грузоподъемность! "
-                f"Требуется: {client.cargo_weight} т, "
-                f"Доступно: {self.capacity - self.current_load:.2f} т"
-            )
-        
-        self.current_load = new_load
-        self.clients_list.append(client)
-        client.is_loaded = True
-        return True
-    
-    def unload_cargo(self, client_name: str = None):
-        """Выгружает груз(ы) из транспортного средства."""
-        if not self.clients_list:
-            return []
-        
-        if client_name:
-            for i, client in enumerate(self.clients_list):
-                if client.name == client_name:
-                    self.current_load -= client.cargo_weight
-                    removed = self.clients_list.pop(i)
-                    removed.is_loaded = False
-                    return [removed]
-            return []
-        else:
-            removed = self.clients_list.copy()
-            for client in removed:
-                client.is_loaded = False
-            self.clients_list.clear()
-            self.current_load = 0.0
-            return removed
-    
-    def get_available_capacity(self):
-        return self.capacity - self.current_load
-    
-    def get_load_percentage(self):
-        return (self.current_load / self.capacity * 100) if self.capacity > 0 else 0
-    
-    def __str__(self):
-        load_percent = self.get_load_percentage()
-        return (f"[{self.vehicle_id}] "
-                f"Грузоподъемность: {self.capacity} т | "
-                f"Загружено: {self.current_load:.1f} т ({load_percent:.1f}%) | "
-                f"Клиентов: {len(self.clients_list)}")
-    
-    def __repr__(self):
-        return f"Vehicle('{self.vehicle_id}', {self.capacity})"
-
-
-class Train(Vehicle):
-    """Класс поезда."""
-    
-    def __init__(self, capacity: float, number_of_cars: int):
-        super().__init__(capacity)
-        if not isinstance(number_of_cars, int) or number_of_cars <= 0:
-            raise ValueError("Количество вагонов должно быть положительным целым числом")
-        
-        self.number_of_cars = number_of_cars
-        self.vehicle_id = 'TRN-' + self.vehicle_id.split('-')[1]
-    
-    def __str__(self):
-        base = super().__str__()
-        return f"🚂 Поезд ({self.number_of_cars} вагонов) | " + base
-
-
-class Airplane(Vehicle):
-    """Класс самолета."""
-    
-    def __init__(self, capacity: float, max_altitude: float):
-        super().__init__(capacity)
-        if not isinstance(max_altitude, (int, float)) or max_altitude <= 0:
-            raise ValueError("Максимальная высота должна быть положительным числом")
-        
-        self.max_altitude = float(max_altitude)
-        self.vehicle_id = 'AIR-' + self.vehicle_id.split('-')[1]
-    
-    def __str__(self):
-        base = super().__str__()
-        return f"✈️ Самолет (до {self.max_altitude} м) | " + base
-
-
-class TransportCompany:
-    """Класс транспортной компании."""
-    
-    def __init__(self, name: str):
-        if not isinstance(name, str) or not name.strip():
-            raise ValueError("Название компании должно быть непустой строкой")
-        
-        self.name = name.strip()
-        self.vehicles = []
-        self.clients = []
-    
-    def add_vehicle(self, vehicle):
-        if not isinstance(vehicle, (Vehicle, Train, Airplane)):
-            raise TypeError("Параметр должен быть объектом класса Vehicle или его наследника")
-        
-        for v in self.vehicles:
-            if v.vehicle_id == vehicle.vehicle_id:
-                raise ValueError(f"Транспорт с ID {vehicle.vehicle_id} уже существует")
-        
-        self.vehicles.append(vehicle)
-        return True
-    
-    def remove_vehicle(self, vehicle_id: str):
-        for i, vehicle in enumerate(self.vehicles):
-            if vehicle.vehicle_id == vehicle_id:
-                vehicle.unload_cargo()  # Выгружаем все грузы перед удалением
-                return self.vehicles.pop(i)
-        raise ValueError(f"Транспорт с ID {vehicle_id} не найден")
-    
-    def add_client(self, client):
-        if not isinstance(client, Client):
-            raise TypeError("Параметр должен быть объектом класса Client")
-        
-        for c in self.clients:
-            if c.name == client.name:
-                raise ValueError(f"Клиент с именем '{client.name}' уже существует")
-        
-        self.clients.append(client)
-        return True
-    
-    def remove_client(self, client_name: str):
-        for i, client in enumerate(self.clients):
-            if client.name == client_name:
-                if client.is_loaded:
-                    for vehicle in self.vehicles:
-                        if client in vehicle.clients_list:
-                            vehicle.unload_cargo(client_name)
-                            break
-                return self.clients.pop(i)
-        raise ValueError(f"Клиент с именем '{client_name}' не найден")
-    
-    def list_vehicles(self):
-        return self.vehicles.copy()
-    
-    def list_clients(self):
-        return self.clients.copy()
-    
-    def get_unloaded_clients(self):
-        return [client for client in self.clients if not client.is_loaded]
-    
-    def get_available_vehicles(self):
-        return [vehicle for vehicle in self.vehicles if vehicle.get_available_capacity() > 0]
-    
-    def optimize_cargo_distribution(self):
-        """Оптимизирует распределение грузов."""
-        # Сбрасываем все загрузки
-        for vehicle in self.vehicles:
-            vehicle.unload_cargo()
-        
-        # Сортируем клиентов: сначала VIP
-        vip_clients = sorted(
-            [c for c in self.clients if c.is_vip],
-            key=lambda x: x.cargo_weight,
-            reverse=True
-        )
-        regular_clients = sorted(
-            [c for c in self.clients if not c.is_vip],
-            key=lambda x: x.cargo_weight,
-            reverse=True
-        )
-        
-        all_clients = vip_clients + regular_clients
-        used_vehicles = []
-        
-        for client in all_clients:
-            loaded = False
-            
-            # Пытаемся загрузить в уже используемые транспортные средства
-            for vehicle in used_vehicles:
-                try:
-                    vehicle.load_cargo(client)
-                    loaded = True
-                    break
-                except ValueError:
-                    continue
-            
-            # Если не поместилось, ищем новый транспорт
-            if not loaded:
-                for vehicle in self.vehicles:
-                    if vehicle not in used_vehicles:
-                        try:
-                            vehicle.load_cargo(client)
-                            used_vehicles.append(vehicle)
-                            loaded = True
-                            break
-                        except ValueError:
-                            continue
-            
-            if not loaded:
-                print(f"⚠ Груз клиента '{client.name}' ({client.cargo_weight} т) не поместился")
-        
-        return used_vehicles
-    
-    def get_statistics(self):
-        total_capacity = sum(v.capacity for v in self.vehicles)
-        total_load = sum(v.current_load for v in self.vehicles)
-        total_clients_loaded = sum(len(v.clients_list) for v in self.vehicles)
-        total_vip = sum(1 for c in self.clients if c.is_vip)
-        
-        return {
-            'company_name': self.name,
-            'vehicles_count': len(self.vehicles),
-            'clients_count': len(self.clients),
-            'vip_clients': total_vip,
-            'total_capacity': total_capacity,
-            'total_load': total_load,
-            'load_percentage': (total_load / total_capacity * 100) if total_capacity > 0 else 0,
-            'clients_loaded': total_clients_loaded,
-            'clients_unloaded': len(self.get_unloaded_clients())
-        }
-    
-    def __str__(self):
-        stats = self.get_statistics()
-        return (f"🏢 {self.name}\n"
-                f"   Транспорт: {stats['vehicles_count']} | "
-                f"Клиенты: {stats['clients_count']} (VIP: {stats['vip_clients']})\n"
-                f"   Загружено: {stats['clients_loaded']} грузов")
+import argparse
+import os
+import sys
 
+from core import Airplane, Client, TransportCompany, Train, Vehicle
+from packing import DEFAULT_STRATEGY, IMPROVE_TIME_BUDGET, PARALLEL_MIN_VEHICLES, STRATEGIES
 
 # ==================== ФУНКЦИИ ДЛЯ МЕНЮ ====================
 
@@ -313,6 +43,29 @@ def input_int(prompt, min_val=1):
         except ValueError:
             print("Ошибка! Введите целое число.")
 
+def input_optional(prompt, convert=float, default=None):
+    """Ввод необязательного неотрицательного числа; пустой ввод - default."""
+    while True:
+        value = input(prompt).strip()
+        if not value:
+            return default
+        try:
+            value = convert(value)
+        except ValueError:
+            print("Ошибка! Введите целое число." if convert is int else "Ошибка! Введите число.")
+            continue
+        if value < 0:
+            print("Ошибка! Значение не может быть отрицательным")
+            continue
+        return value
+
+def input_limits(per_car=False):
+    """Ввод ограничений по объему и паллетам; Enter - без ограничения."""
+    suffix = " на вагон" if per_car else ""
+    volume = input_optional(f"Объем{suffix} (м³, Enter - без ограничения): ")
+    pallets = input_optional(f"Паллет{suffix} (Enter - без ограничения): ", int)
+    return volume, pallets
+
 def input_bool(prompt):
     """Ввод булевого значения с проверкой."""
     while True:
@@ -356,8 +109,9 @@ def add_vehicle_menu(company):
     elif choice == '1':
         print_subheader("Создание обычного транспорта")
         capacity = input_float("Введите грузоподъемность (тонны): ", 0.1)
+        volume, pallets = input_limits()
         try:
-            vehicle = Vehicle(capacity)
+            vehicle = Vehicle(capacity, volume, pallets)
             company.add_vehicle(vehicle)
             print(f"✅ Транспорт {vehicle.vehicle_id} успешно добавлен!")
         except Exception as e:
@@ -367,8 +121,9 @@ def add_vehicle_menu(company):
         print_subheader("Создание поезда")
         capacity = input_float("Введите грузоподъемность (тонны): ", 0.1)
         cars = input_int("Введите количество вагонов: ")
+        volume, pallets = input_limits(per_car=True)
         try:
-            vehicle = Train(capacity, cars)
+            vehicle = Train(capacity, cars, volume, pallets)
             company.add_vehicle(vehicle)
             print(f"✅ Поезд {vehicle.vehicle_id} успешно добавлен!")
         except Exception as e:
@@ -378,8 +133,9 @@ def add_vehicle_menu(company):
         print_subheader("Создание самолета")
         capacity = input_float("Введите грузоподъемность (тонны): ", 0.1)
         altitude = input_float("Введите максимальную высоту полета (метры): ", 1)
+        volume, pallets = input_limits()
         try:
-            vehicle = Airplane(capacity, altitude)
+            vehicle = Airplane(capacity, altitude, volume, pallets)
             company.add_vehicle(vehicle)
             print(f"✅ Самолет {vehicle.vehicle_id} успешно добавлен!")
         except Exception as e:
@@ -398,10 +154,12 @@ def add_client_menu(company):
         name = input("Введите имя клиента: ").strip()
     
     weight = input_float("Введите вес груза (тонны): ", 0.1)
+    volume = input_optional("Введите объем груза (м³, Enter - 0): ", default=0.0)
+    pallets = input_optional("Введите количество паллет (Enter - 0): ", int, default=0)
     is_vip = input_bool("Это VIP клиент?")
     
     try:
-        client = Client(name, weight, is_vip)
+        client = Client(name, weight, is_vip, volume, pallets)
         company.add_client(client)
         print(f"✅ Клиент '{name}' успешно добавлен!")
     except Exception as e:
@@ -524,13 +282,46 @@ def optimize_distribution_menu(company):
         print("🚫 Нет транспортных средств")
         return
     
-    print("Начинаем оптимизацию распределения...")
+    print("Выберите стратегию распределения:")
+    codes = list(STRATEGIES)
+    for i, code in enumerate(codes, 1):
+        default = " (по умолчанию)" if code == DEFAULT_STRATEGY else ""
+        print(f"{i}. {STRATEGIES[code][0]}{default}")
+    
+    choice = input("Ваш выбор (Enter - по умолчанию): ").strip()
+    if not choice:
+        strategy = DEFAULT_STRATEGY
+    elif choice.isdigit() and 1 <= int(choice) <= len(codes):
+        strategy = codes[int(choice) - 1]
+    else:
+        print("Неверный выбор!")
+        return
+    
+    choice = input(f"Число процессов (Enter - 1, ядер: {os.cpu_count()}): ").strip()
+    if not choice:
+        workers = 1
+    elif choice.isdigit() and int(choice) >= 1:
+        workers = int(choice)
+    else:
+        print("Неверный выбор!")
+        return
+    
+    improve = IMPROVE_TIME_BUDGET if input_bool("Улучшить результат локальным поиском?") else 0.0
+    
+    print("\nНачинаем оптимизацию распределения...")
     print(f"• Клиентов: {len(company.clients)}")
     print(f"• Транспортных средств: {len(company.vehicles)}")
+    print(f"• Стратегия: {STRATEGIES[strategy][0]}")
+    if workers > 1:
+        print(f"• Процессов: {workers}")
     
     input("\nНажмите Enter для продолжения...")
     
-    used_vehicles = company.optimize_cargo_distribution()
+    try:
+        used_vehicles = company.optimize_cargo_distribution(strategy, workers, improve=improve)
+    except ValueError as e:
+        print(f"❌ Ошибка: {e}")
+        return
     
     print_header("РЕЗУЛЬТАТЫ РАСПРЕДЕЛЕНИЯ")
     
@@ -538,13 +329,13 @@ def optimize_distribution_menu(company):
         print("🚫 Ни один груз не был загружен")
         return
     
+    packing = company.last_packing
     print(f"✅ Использовано транспортных средств: {len(used_vehicles)}")
-    
-    total_load = sum(v.current_load for v in used_vehicles)
-    total_capacity = sum(v.capacity for v in used_vehicles)
-    efficiency = (total_load / total_capacity * 100) if total_capacity > 0 else 0
-    
-    print(f"📊 Эффективность использования транспорта: {efficiency:.1f}%")
+    print(f"📊 Эффективность использования транспорта: {packing.get_used_fill():.1f}%")
+    print(f"🚚 Загрузка всего парка: {packing.get_fleet_fill():.1f}%")
+    print(f"⏱ Время решения: {packing.elapsed * 1000:.1f} мс")
+    if packing.improvement is not None:
+        print(f"🔧 Улучшение: {packing.improvement}")
     
     print_subheader("Детализация по транспорту")
     
@@ -565,6 +356,27 @@ def optimize_distribution_menu(company):
         for client in unloaded:
             print(f"  • {client.name}: {client.cargo_weight} т")
 
+def replan_distribution_menu(company):
+    """Меню дораспределения грузов без полного пересчета."""
+    print_header("ДОРАСПРЕДЕЛЕНИЕ ГРУЗОВ")
+    
+    if not company.get_unloaded_clients():
+        print("✅ Все грузы уже загружены")
+        return
+    
+    moves = company.replan_cargo_distribution()
+    if not moves:
+        print("🚫 Ни один груз не был загружен")
+        return
+    
+    print(f"Выполнено перемещений: {len(moves)}")
+    for move in moves:
+        print(f"• {move}")
+    
+    for client in company.get_unloaded_clients():
+        print(f"⚠ Груз клиента '{client.name}' ({client.cargo_weight} т) не поместился")
+
+
 def show_statistics_menu(company):
     """Меню показа статистики."""
     print_header("СТАТИСТИКА КОМПАНИИ")
@@ -583,8 +395,8 @@ def show_statistics_menu(company):
     # Детализация по транспорту
     if company.vehicles:
         print_subheader("ДЕТАЛИЗАЦИЯ ПО ТРАНСПОРТУ")
-        for i, vehicle in enumerate(company.vehicles, 1):
-            load_percent = vehicle.get_load_percentage()
+        percentages = company.get_load_percentages()
+        for i, (vehicle, load_percent) in enumerate(zip(company.vehicles, percentages), 1):
             status = "📦 Загружен" if vehicle.current_load > 0 else "📭 Пуст"
             print(f"{i}. {vehicle.vehicle_id}: {vehicle.current_load:.1f}/{vehicle.capacity:.1f} т "
                   f"({load_percent:.1f}%) - {status}")
@@ -774,11 +586,8 @@ def load_demo_data(company):
         ]
         
         try:
-            for vehicle in demo_vehicles:
-                company.add_vehicle(vehicle)
-            
-            for client in demo_clients:
-                company.add_client(client)
+            company.add_vehicles(demo_vehicles)
+            company.add_clients(demo_clients)
             
             print("✅ Демонстрационные данные успешно загружены!")
             print(f"   Добавлено: {len(demo_vehicles)} транспортных средств")
@@ -787,6 +596,135 @@ def load_demo_data(company):
         except Exception as e:
             print(f"❌ Ошибка загрузки демо-данных: {e}")
 
+# ==================== ПАКЕТНЫЙ РЕЖИМ ====================
+
+# Коды завершения пакетного режима
+EXIT_OK = 0          # Все грузы распределены
+EXIT_UNPLACED = 1    # План построен, но часть грузов не поместилась или отклонена при импорте
+EXIT_USAGE = 2       # Неверные аргументы командной строки (так завершается argparse)
+EXIT_INPUT = 3       # Ошибка во входных файлах
+EXIT_OUTPUT = 4      # Не удалось записать результат
+
+BATCH_EPILOG = """коды завершения:
+  0  все грузы распределены
+  1  план построен, но часть грузов не поместилась или отклонена при импорте
+  2  неверные аргументы
+  3  ошибка во входных файлах
+  4  не удалось записать результат"""
+
+def plan_command(args):
+    """Загрузка данных, распределение и экспорт без вопросов пользователю."""
+    # Импорт и экспорт нужны только этой команде и не замедляют запуск меню
+    from export import write_plan
+    from importer import import_clients, read_fleet
+    
+    if args.company is None and (args.clients is None or args.fleet is None):
+        print("Ошибка: нужны --clients и --fleet или --company", file=sys.stderr)
+        return EXIT_USAGE
+    
+    company = TransportCompany(args.name)
+    try:
+        if args.company is not None:
+            for issue in company.load_from_file(args.company):
+                print(f"⚠ {issue}", file=sys.stderr)
+        if args.fleet is not None:
+            company.add_vehicles(read_fleet(args.fleet))
+        imported = {'rejected': 0}
+        if args.clients is not None:
+            imported = import_clients(company, args.clients, args.rejects, args.workers)
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        print(f"Ошибка входных данных: {e}", file=sys.stderr)
+        return EXIT_INPUT
+    
+    try:
+        used_vehicles = company.optimize_cargo_distribution(args.strategy, args.workers,
+                                                            improve=args.improve)
+    except ValueError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    
+    packing = company.last_packing
+    try:
+        write_plan(args.out, company.get_statistics(), used_vehicles, packing)
+        if args.snapshot is not None:
+            company.save_to_file(args.snapshot)
+    except OSError as e:
+        print(f"Ошибка записи: {e}", file=sys.stderr)
+        return EXIT_OUTPUT
+    
+    unloaded = company.get_unloaded_clients()
+    if not args.quiet:
+        if args.clients is not None:
+            print(f"Импорт: строк {imported['rows']}, добавлено {imported['imported']}, "
+                  f"отклонено {imported['rejected']}, время {imported['elapsed']:.1f} с")
+            if imported['rejected'] and args.rejects is None:
+                for example in imported['examples']:
+                    print(f"⚠ {example}", file=sys.stderr)
+        print(packing)
+        if packing.improvement is not None:
+            print(f"Улучшение: {packing.improvement}")
+        print(f"Не поместилось грузов: {len(unloaded)}")
+    return EXIT_UNPLACED if unloaded or imported['rejected'] else EXIT_OK
+
+def positive_int(text):
+    """Тип argparse: целое число больше нуля."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается целое число, получено {text!r}")
+    if value <= 0:
+        raise argparse.ArgumentTypeError("значение должно быть больше нуля")
+    return value
+
+def non_negative_float(text):
+    """Тип argparse: число не меньше нуля."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается число, получено {text!r}")
+    if not value >= 0 or value == float('inf'):
+        raise argparse.ArgumentTypeError("значение должно быть конечным и не меньше нуля")
+    return value
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Система управления транспортной компанией. "
+                    "Без аргументов запускается интерактивное меню.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    plan = commands.add_parser(
+        'plan', help="распределить грузы и сохранить план",
+        description="Читает клиентов и парк, распределяет грузы и сохраняет план "
+                    "(CSV или JSON по расширению --out).",
+        epilog=BATCH_EPILOG, formatter_class=argparse.RawDescriptionHelpFormatter)
+    plan.add_argument('--clients', nargs='+', metavar='FILE',
+                      help="файлы заказов: CSV или JSON Lines (см. importer.py)")
+    plan.add_argument('--fleet', help="транспорт: CSV или JSON Lines (см. importer.py)")
+    plan.add_argument('--company', help="сохраненная компания (JSON, JSON Lines или .bin); "
+                                        "--clients и --fleet добавляются к ней")
+    plan.add_argument('--name', default="Пакетный расчет", help="название компании")
+    plan.add_argument('--strategy', default=DEFAULT_STRATEGY, choices=list(STRATEGIES))
+    plan.add_argument('--rejects', metavar='FILE',
+                      help="записать отклоненные строки заказов в этот файл (JSON Lines)")
+    plan.add_argument('--workers', type=positive_int, default=1,
+                      help="процессов для разбора файлов заказов и для расчета. Заказы "
+                           "разбираются параллельно, если файлов несколько и они достаточно "
+                           "велики (см. importer.py), расчет - если "
+                           f"транспорта не меньше {PARALLEL_MIN_VEHICLES}; иначе процесс один")
+    plan.add_argument('--improve', type=non_negative_float, default=0.0, metavar='СЕКУНД',
+                      help="время локального поиска после распределения")
+    plan.add_argument('--out', required=True, help="файл плана (.csv или .json)")
+    plan.add_argument('--snapshot', help="сохранить компанию с распределением в этот файл")
+    plan.add_argument('--quiet', action='store_true', help="не печатать итог")
+    plan.set_defaults(handler=plan_command)
+    return parser
+
+def run_batch(argv):
+    """Выполняет команду пакетного режима и возвращает код завершения."""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
 # ==================== ОСНОВНОЕ МЕНЮ ====================
 
 def main():
@@ -814,6 +752,7 @@ def main():
         print("10. 🗑️ Удалить клиента")
         print("11. 💾 Сохранить данные в файл")
         print("12. 🎮 Загрузить демо-данные")
+        print("13. 🔧 Дораспределить грузы (без перестановки)")
         print("0.  🚪 Выход")
         
         choice = input("\n📝 Ваш выбор: ")
@@ -842,6 +781,8 @@ def main():
             save_to_file_menu(company)
         elif choice == '12':
             load_demo_data(company)
+        elif choice == '13':
+            replan_distribution_menu(company)
         elif choice == '0':
             print_header("ВЫХОД ИЗ ПРОГРАММЫ")
             if input_bool("Сохранить данные перед выходом?"):
@@ -856,6 +797,9 @@ def main():
 # ==================== ЗАПУСК ПРОГРАММЫ ====================
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_batch(sys.argv[1:]))
+    
     try:
         main()
     except KeyboardInterrupt:
@@ -1,342 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import json
-import random
-import string
-from datetime import datetime
+import os
 from tkinter import scrolledtext
-import csv
-
-# ==================== КЛАССЫ (как в предыдущем задании) ====================
-
-class Client:
-    """Класс для представления клиента компании."""
-    
-    def __init__(self, name: str, cargo_weight: float, is_vip: bool = False):
-        if not isinstance(name, str) or not name.strip():
-            raise ValueError("Имя клиента должно быть непустой строкой")
-        
-        if not isinstance(cargo_weight, (int, float)) or cargo_weight <= 0:
-            raise ValueError("Вес груза должен быть положительным числом")
-        
-        if not isinstance(is_vip, bool):
-            raise ValueError("is_vip должен быть булевым значением")
-        
-        self.name = name.strip()
-        self.cargo_weight = float(cargo_weight)
-        self.is_vip = is_vip
-        self.is_loaded = False
-    
-    def to_dict(self):
-        """Конвертирует объект в словарь."""
-        return {
-            'name': self.name,
-            'cargo_weight': self.cargo_weight,
-            'is_vip': self.is_vip,
-            'is_loaded': self.is_loaded
-        }
-    
-    @classmethod
-    def from_dict(cls, data):
-        """Создает объект из словаря."""
-        client = cls(data['name'], data['cargo_weight'], data['is_vip'])
-        client.is_loaded = data.get('is_loaded', False)
-        return client
-    
-    def __str__(self):
-        vip_status = "VIP" if self.is_vip else "Обычный"
-        status = "✓ Загружен" if self.is_loaded else "✗ Не загружен"
-        return f"{self.name} | Груз: {self.cargo_weight} т | {vip_status} | {status}"
-
-
-class Vehicle:
-    """Базовый класс для транспортного средства."""
-    
-    def __init__(self, capacity: float):
-        if not isinstance(capacity, (int, float)) or capacity <= 0:
-            raise ValueError("Грузоподъемность должна быть положительным числом")
-        
-        self.vehicle_id = self._generate_id()
-        self.capacity = float(capacity)
-        self.current_load = 0.0
-        self.clients_list = []
-    
-    def _generate_id(self):
-        return 'VHC-' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-    
-    def load_cargo(self, client):
-        if not isinstance(client, Client):
-            raise TypeError("Параметр должен быть объектом класса Client")
-        
-        if client.is_loaded:
-            raise ValueError(f"Груз клиента '{client.name}' уже загружен")
-        
-        new_load = self.current_load + client.cargo_weight
-        
-        if new_load > self.capacity:
-            raise ValueError(
-                f"Превышена грузоподъемность! "
-                f"Требуется: {client.cargo_weight} т, "
-                f"Доступно: {self.capacity - self.current_load:.2f} т"
-            )
-        
-        self.current_load = new_load
-        self.clients_list.append(client)
-        client.is_loaded = True
-        return True
-    
-    def unload_cargo(self, client_name: str = None):
-        if not self.clients_list:
-            return []
-        
-        if client_name:
-            for i, client in enumerate(self.clients_list):
-                if client.name == client_name:
-                    self.current_load -= client.cargo_weight
-                    removed = self.clients_list.pop(i)
-                    removed.is_loaded = False
-                    return [removed]
-            return []
-        else:
-            removed = self.clients_list.copy()
-            for client in removed:
-                client.is_loaded = False
-            self.clients_list.clear()
-            self.current_load = 0.0
-            return removed
-    
-    def get_available_capacity(self):
-        return self.capacity - self.current_load
-    
-    def get_load_percentage(self):
-        return (self.current_load / self.capacity * 100) if self.capacity > 0 else 0
-    
-    def to_dict(self):
-        """Конвертирует объект в словарь."""
-        return {
-            'vehicle_id': self.vehicle_id,
-            'capacity': self.capacity,
-            'current_load': self.current_load,
-            'clients_list': [c.name for c in self.clients_list],
-            'type': self.__class__.__name__
-        }
-    
-    def __str__(self):
-        load_percent = self.get_load_percentage()
-        return (f"[{self.vehicle_id}] "
-                f"Грузоподъемность: {self.capacity} т | "
-                f"Загружено: {self.current_load:.1f} т ({load_percent:.1f}%) | "
-                f"Клиентов: {len(self.clients_list)}")
-
-
-class Train(Vehicle):
-    """Класс поезда."""
-    
-    def __init__(self, capacity: float, number_of_cars: int):
-        super().__init__(capacity)
-        if not isinstance(number_of_cars, int) or number_of_cars <= 0:
-            raise ValueError("Количество вагонов должно быть положительным целым числом")
-        
-        self.number_of_cars = number_of_cars
-        self.vehicle_id = 'TRN-' + self.vehicle_id.split('-')[1]
-    
-    def to_dict(self):
-        data = super().to_dict()
-        data['number_of_cars'] = self.number_of_cars
-        return data
-    
-    def __str__(self):
-        base = super().__str__()
-        return f"Поезд ({self.number_of_cars} вагонов) | " + base
-
-
-class Airplane(Vehicle):
-    """Класс самолета."""
-    
-    def __init__(self, capacity: float, max_altitude: float):
-        super().__init__(capacity)
-        if not isinstance(max_altitude, (int, float)) or max_altitude <= 0:
-            raise ValueError("Максимальная высота должна быть положительным числом")
-        
-        self.max_altitude = float(max_altitude)
-        self.vehicle_id = 'AIR-' + self.vehicle_id.split('-')[1]
-    
-    def to_dict(self):
-        data = super().to_dict()
-        data['max_altitude'] = self.max_altitude
-        return data
-    
-    def __str__(self):
-        base = super().__str__()
-        return f"Самолет (до {self.max_altitude} м) | " + base
-
-
-class TransportCompany:
-    """Класс транспортной компании."""
-    
-    def __init__(self, name: str = "Моя транспортная компания"):
-        if not isinstance(name, str) or not name.strip():
-            raise ValueError("Название компании должно быть непустой строкой")
-        
-        self.name = name.strip()
-        self.vehicles = []
-        self.clients = []
-    
-    def add_vehicle(self, vehicle):
-        if not isinstance(vehicle, (Vehicle, Train, Airplane)):
-            raise TypeError("Параметр должен быть объектом класса Vehicle или его наследника")
-        
-        for v in self.vehicles:
-            if v.vehicle_id == vehicle.vehicle_id:
-                raise ValueError(f"Транспорт с ID {vehicle.vehicle_id} уже существует")
-        
-        self.vehicles.append(vehicle)
-        return True
-    
-    def remove_vehicle(self, vehicle_id: str):
-        for i, vehicle in enumerate(self.vehicles):
-            if vehicle.vehicle_id == vehicle_id:
-                vehicle.unload_cargo()
-                return self.vehicles.pop(i)
-        raise ValueError(f"Транспорт с ID {vehicle_id} не найден")
-    
-    def add_client(self, client):
-        if not isinstance(client, Client):
-            raise TypeError("Параметр должен быть объектом класса Client")
-        
-        for c in self.clients:
-            if c.name == client.name:
-                raise ValueError(f"Клиент с именем '{client.name}' уже существует")
-        
-        self.clients.append(client)
-        return True
-    
-    def remove_client(self, client_name: str):
-        for i, client in enumerate(self.clients):
-            if client.name == client_name:
-                if client.is_loaded:
-                    for vehicle in self.vehicles:
-                        if client in vehicle.clients_list:
-                            vehicle.unload_cargo(client_name)
-                            break
-                return self.clients.pop(i)
-        raise ValueError(f"Клиент с именем '{client_name}' не найден")
-    
-    def get_unloaded_clients(self):
-        return [client for client in self.clients if not client.is_loaded]
-    
-    def get_available_vehicles(self):
-        return [vehicle for vehicle in self.vehicles if vehicle.get_available_capacity() > 0]
-    
-    def optimize_cargo_distribution(self):
-        """Оптимизирует распределение грузов."""
-        for vehicle in self.vehicles:
-            vehicle.unload_cargo()
-        
-        vip_clients = sorted(
-            [c for c in self.clients if c.is_vip],
-            key=lambda x: x.cargo_weight,
-            reverse=True
-        )
-        regular_clients = sorted(
-            [c for c in self.clients if not c.is_vip],
-            key=lambda x: x.cargo_weight,
-            reverse=True
-        )
-        
-        all_clients = vip_clients + regular_clients
-        used_vehicles = []
-        
-        for client in all_clients:
-            loaded = False
-            
-            for vehicle in used_vehicles:
-                try:
-                    vehicle.load_cargo(client)
-                    loaded = True
-                    break
-                except ValueError:
-                    continue
-            
-            if not loaded:
-                for vehicle in self.vehicles:
-                    if vehicle not in used_vehicles:
-                        try:
-                            vehicle.load_cargo(client)
-                            used_vehicles.append(vehicle)
-                            loaded = True
-                            break
-                        except ValueError:
-                            continue
-        
-        return used_vehicles
-    
-    def get_statistics(self):
-        total_capacity = sum(v.capacity for v in self.vehicles)
-        total_load = sum(v.current_load for v in self.vehicles)
-        total_clients_loaded = sum(len(v.clients_list) for v in self.vehicles)
-        total_vip = sum(1 for c in self.clients if c.is_vip)
-        
-        return {
-            'company_name': self.name,
-            'vehicles_count': len(self.vehicles),
-            'clients_count': len(self.clients),
-            'vip_clients': total_vip,
-            'total_capacity': total_capacity,
-            'total_load': total_load,
-            'load_percentage': (total_load / total_capacity * 100) if total_capacity > 0 else 0,
-            'clients_loaded': total_clients_loaded,
-            'clients_unloaded': len(self.get_unloaded_clients())
-        }
-    
-    def save_to_file(self, filename):
-        """Сохраняет данные компании в файл."""
-        data = {
-            'company_name': self.name,
-            'clients': [c.to_dict() for c in self.clients],
-            'vehicles': [v.to_dict() for v in self.vehicles],
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    def load_from_file(self, filename):
-        """Загружает данные компании из файла."""
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        self.name = data['company_name']
-        self.clients = [Client.from_dict(c) for c in data['clients']]
-        
-        self.vehicles = []
-        for v_data in data['vehicles']:
-            if v_data['type'] == 'Train':
-                vehicle = Train(v_data['capacity'], v_data['number_of_cars'])
-            elif v_data['type'] == 'Airplane':
-                vehicle = Airplane(v_data['capacity'], v_data['max_altitude'])
-            else:
-                vehicle = Vehicle(v_data['capacity'])
-            
-            vehicle.vehicle_id = v_data['vehicle_id']
-            vehicle.current_load = v_data['current_load']
-            
-            for client_name in v_data['clients_list']:
-                for client in self.clients:
-                    if client.name == client_name:
-                        vehicle.clients_list.append(client)
-                        client.is_loaded = True
-                        break
-            
-            self.vehicles.append(vehicle)
-    
-    def __str__(self):
-        stats = self.get_statistics()
-        return (f"{self.name}\n"
-                f"Транспорт: {stats['vehicles_count']} | "
-                f"Клиенты: {stats['clients_count']} (VIP: {stats['vip_clients']})\n"
-                f"Загружено: {stats['clients_loaded']} грузов")
+import queue
+import threading
 
+from core import Airplane, Client, TransportCompany, Train, Vehicle
+from export import ExportCancelled, write_plan_csv, write_plan_json
+from importer import ClientImport, parse_clients
+from journal import Journal
+from packing import DEFAULT_STRATEGY, IMPROVE_TIME_BUDGET, STRATEGIES, PackingCancelled
 
 # ==================== ГРАФИЧЕСКИЙ ИНТЕРФЕЙС ====================
 
@@ -354,7 +27,7 @@ class AddClientWindow(tk.Toplevel):
         else:
             self.title("Добавление клиента")
         
-        self.geometry("400x250")
+        self.geometry("400x320")
         self.resizable(False, False)
         
         # Центрирование окна
@@ -392,15 +65,28 @@ class AddClientWindow(tk.Toplevel):
         self.weight_entry = ttk.Entry(input_frame, textvariable=self.weight_var, width=30)
         self.weight_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), pady=5, padx=(10, 0))
         
+        # Поля для объема и количества паллет (необязательные)
+        ttk.Label(input_frame, text="Объем груза (м³):").grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.volume_var = tk.StringVar()
+        self.volume_entry = ttk.Entry(input_frame, textvariable=self.volume_var, width=30)
+        self.volume_entry.grid(row=2, column=1, sticky=(tk.W, tk.E), pady=5, padx=(10, 0))
+        
+        ttk.Label(input_frame, text="Паллет:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        self.pallets_var = tk.StringVar()
+        self.pallets_entry = ttk.Entry(input_frame, textvariable=self.pallets_var, width=30)
+        self.pallets_entry.grid(row=3, column=1, sticky=(tk.W, tk.E), pady=5, padx=(10, 0))
+        
         # Чекбокс для VIP статуса
         self.vip_var = tk.BooleanVar(value=False)
         self.vip_check = ttk.Checkbutton(input_frame, text="VIP клиент", variable=self.vip_var)
-        self.vip_check.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=10)
+        self.vip_check.grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=10)
         
         # Если редактируем существующего клиента, заполняем поля
         if self.client:
             self.name_var.set(self.client.name)
             self.weight_var.set(str(self.client.cargo_weight))
+            self.volume_var.set(str(self.client.volume) if self.client.volume else "")
+            self.pallets_var.set(str(self.client.pallets) if self.client.pallets else "")
             self.vip_var.set(self.client.is_vip)
         
         # Фрейм для кнопок
@@ -455,6 +141,23 @@ class AddClientWindow(tk.Toplevel):
             self.weight_entry.focus()
             return False
         
+        # Проверка объема и паллет (пустое поле - 0)
+        try:
+            if float(self.volume_var.get().strip() or 0) < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Ошибка", "Объем груза должен быть неотрицательным числом!")
+            self.volume_entry.focus()
+            return False
+        
+        try:
+            if int(self.pallets_var.get().strip() or 0) < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Ошибка", "Количество паллет должно быть неотрицательным целым числом!")
+            self.pallets_entry.focus()
+            return False
+        
         return True
     
     def save(self):
@@ -464,17 +167,17 @@ class AddClientWindow(tk.Toplevel):
         
         name = self.name_var.get().strip()
         weight = float(self.weight_var.get().strip())
+        volume = float(self.volume_var.get().strip() or 0)
+        pallets = int(self.pallets_var.get().strip() or 0)
         is_vip = self.vip_var.get()
         
         try:
             if self.client:
                 # Обновляем существующего клиента
-                self.client.name = name
-                self.client.cargo_weight = weight
-                self.client.is_vip = is_vip
+                self.company.update_client(self.client, name, weight, is_vip, volume, pallets)
             else:
                 # Создаем нового клиента
-                client = Client(name, weight, is_vip)
+                client = Client(name, weight, is_vip, volume, pallets)
                 self.company.add_client(client)
             
             self.parent.update_clients_table()
@@ -494,7 +197,7 @@ class AddVehicleWindow(tk.Toplevel):
         self.company = company
         
         self.title("Добавление транспортного средства")
-        self.geometry("450x300")
+        self.geometry("450x380")
         self.resizable(False, False)
         
         self.transient(parent)
@@ -545,6 +248,19 @@ class AddVehicleWindow(tk.Toplevel):
         self.extra_entry = ttk.Entry(param_frame, textvariable=self.extra_var, width=25)
         self.extra_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), pady=5, padx=(10, 0))
         
+        # Ограничения по объему и паллетам (пустое поле - без ограничения)
+        self.volume_label = ttk.Label(param_frame, text="Объем (м³):")
+        self.volume_label.grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.volume_var = tk.StringVar()
+        self.volume_entry = ttk.Entry(param_frame, textvariable=self.volume_var, width=25)
+        self.volume_entry.grid(row=2, column=1, sticky=(tk.W, tk.E), pady=5, padx=(10, 0))
+        
+        self.pallets_label = ttk.Label(param_frame, text="Паллет:")
+        self.pallets_label.grid(row=3, column=0, sticky=tk.W, pady=5)
+        self.pallets_var = tk.StringVar()
+        self.pallets_entry = ttk.Entry(param_frame, textvariable=self.pallets_var, width=25)
+        self.pallets_entry.grid(row=3, column=1, sticky=(tk.W, tk.E), pady=5, padx=(10, 0))
+        
         # Фрейм для кнопок
         button_frame = ttk.Frame(self, padding="10")
         button_frame.grid(row=2, column=0, sticky=(tk.E, tk.W))
@@ -553,6 +269,8 @@ class AddVehicleWindow(tk.Toplevel):
         ttk.Button(button_frame, text="Отмена", command=self.destroy).pack(side=tk.RIGHT, padx=5)
         
         # Подсказки
+        self.volume_entry.bind("<FocusIn>", lambda e: self.parent.show_tooltip("Оставьте пустым, если объем не ограничен"))
+        self.pallets_entry.bind("<FocusIn>", lambda e: self.parent.show_tooltip("Оставьте пустым, если число паллет не ограничено"))
         self.capacity_entry.bind("<FocusIn>", lambda e: self.parent.show_tooltip("Введите грузоподъемность (положительное число)"))
         
         # Настройка сетки
@@ -581,6 +299,11 @@ class AddVehicleWindow(tk.Toplevel):
         else:
             self.extra_label.config(text="Дополнительный параметр:")
             self.extra_var.set("")
+        
+        # У поезда объем и паллеты задаются на один вагон
+        per_car = " на вагон" if vehicle_type == "Поезд" else ""
+        self.volume_label.config(text=f"Объем{per_car} (м³):")
+        self.pallets_label.config(text=f"Паллет{per_car}:")
     
     def validate_input(self):
         """Проверяет корректность введенных данных."""
@@ -625,6 +348,23 @@ class AddVehicleWindow(tk.Toplevel):
                 self.extra_entry.focus()
                 return False
         
+        # Проверка ограничений по объему и паллетам
+        try:
+            if float(self.volume_var.get().strip() or 1) <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Ошибка", "Объем должен быть положительным числом!")
+            self.volume_entry.focus()
+            return False
+        
+        try:
+            if int(self.pallets_var.get().strip() or 1) <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Ошибка", "Количество паллет должно быть положительным целым числом!")
+            self.pallets_entry.focus()
+            return False
+        
         return True
     
     def save(self):
@@ -634,16 +374,20 @@ class AddVehicleWindow(tk.Toplevel):
         
         capacity = float(self.capacity_var.get().strip())
         vehicle_type = self.vehicle_type.get()
+        volume = self.volume_var.get().strip()
+        volume = float(volume) if volume else None
+        pallets = self.pallets_var.get().strip()
+        pallets = int(pallets) if pallets else None
         
         try:
             if vehicle_type == "Обычный транспорт":
-                vehicle = Vehicle(capacity)
+                vehicle = Vehicle(capacity, volume, pallets)
             elif vehicle_type == "Поезд":
                 cars = int(self.extra_var.get().strip())
-                vehicle = Train(capacity, cars)
+                vehicle = Train(capacity, cars, volume, pallets)
             else:  # Самолет
                 altitude = float(self.extra_var.get().strip())
-                vehicle = Airplane(capacity, altitude)
+                vehicle = Airplane(capacity, altitude, volume, pallets)
             
             self.company.add_vehicle(vehicle)
             self.parent.update_vehicles_table()
@@ -655,9 +399,16 @@ class AddVehicleWindow(tk.Toplevel):
 
 
 class ResultsWindow(tk.Toplevel):
-    """Окно отображения результатов распределения."""
+    """Окно отображения результатов распределения.
+    
+    Экспорт идет в рабочем потоке, как расчет в OptimizeProgressWindow:
+    прогресс передается через очередь, которую окно опрашивает через
+    after(). Окно модальное, поэтому план во время экспорта не меняется.
+    """
     
-    def __init__(self, parent, used_vehicles, statistics):
+    POLL_INTERVAL = 50  # мс
+    
+    def __init__(self, parent, used_vehicles, statistics, packing=None):
         super().__init__(parent)
         self.parent = parent
         
@@ -669,6 +420,10 @@ class ResultsWindow(tk.Toplevel):
         
         self.used_vehicles = used_vehicles
         self.statistics = statistics
+        self.packing = packing
+        self.export_messages = queue.Queue()
+        self.export_cancel = None  # threading.Event, пока идет экспорт
+        self.export_poll = None    # ID опроса after()
         
         self.create_widgets()
         self.center_window()
@@ -698,6 +453,15 @@ class ResultsWindow(tk.Toplevel):
         Незагруженных грузов: {self.statistics['clients_unloaded']}
         """
         
+        if self.packing is not None:
+            stats_text += f"""Стратегия: {self.packing.strategy_title}
+        Загрузка использованного транспорта: {self.packing.get_used_fill():.1f}%
+        Время решения: {self.packing.elapsed * 1000:.1f} мс
+        """
+            if self.packing.improvement is not None:
+                stats_text += f"""Улучшение: {self.packing.improvement}
+        """
+        
         ttk.Label(stats_frame, text=stats_text, justify=tk.LEFT).grid(row=0, column=0, sticky=tk.W)
         
         # Таблица с результатами
@@ -714,13 +478,14 @@ class ResultsWindow(tk.Toplevel):
             self.tree.column(col, width=150)
         
         # Добавляем данные
-        for vehicle in self.used_vehicles:
+        percentages = self.parent.company.fleet.load_percentages_of(self.used_vehicles)
+        for vehicle, load_percent in zip(self.used_vehicles, percentages):
             clients_list = ", ".join([c.name for c in vehicle.clients_list])
             values = (
                 vehicle.vehicle_id,
                 f"{vehicle.capacity} т",
                 f"{vehicle.current_load:.1f} т",
-                f"{vehicle.get_load_percentage():.1f}%",
+                f"{load_percent:.1f}%",
                 clients_list
             )
             self.tree.insert("", tk.END, values=values)
@@ -737,10 +502,24 @@ class ResultsWindow(tk.Toplevel):
         button_frame = ttk.Frame(self, padding="10")
         button_frame.grid(row=2, column=0, sticky=(tk.E, tk.W))
         
-        ttk.Button(button_frame, text="Экспорт в CSV", command=self.export_csv).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Экспорт в JSON", command=self.export_json).pack(side=tk.LEFT, padx=5)
+        self.export_buttons = [
+            ttk.Button(button_frame, text="Экспорт в CSV", command=self.export_csv),
+            ttk.Button(button_frame, text="Экспорт в JSON", command=self.export_json),
+        ]
+        for button in self.export_buttons:
+            button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Закрыть", command=self.destroy).pack(side=tk.RIGHT, padx=5)
         
+        # Прогресс экспорта
+        self.export_cancel_button = ttk.Button(button_frame, text="Отмена", state=tk.DISABLED,
+                                               command=self.cancel_export)
+        self.export_cancel_button.pack(side=tk.RIGHT, padx=5)
+        self.export_progress = ttk.Progressbar(button_frame, length=150, mode="determinate",
+                                               maximum=100)
+        self.export_progress.pack(side=tk.RIGHT, padx=5)
+        self.export_status = tk.StringVar()
+        ttk.Label(button_frame, textvariable=self.export_status).pack(side=tk.RIGHT, padx=5)
+        
         # Настройка сетки
         table_frame.rowconfigure(0, weight=1)
         table_frame.columnconfigure(0, weight=1)
@@ -755,41 +534,7 @@ class ResultsWindow(tk.Toplevel):
         )
         
         if filename:
-            try:
-                with open(filename, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    
-                    # Записываем статистику
-                    writer.writerow(["Статистика распределения грузов"])
-                    writer.writerow(["Параметр", "Значение"])
-                    writer.writerow(["Всего клиентов", self.statistics['clients_count']])
-                    writer.writerow(["VIP клиентов", self.statistics['vip_clients']])
-                    writer.writerow(["Использовано транспорта", len(self.used_vehicles)])
-                    writer.writerow(["Общая грузоподъемность", f"{self.statistics['total_capacity']:.1f} т"])
-                    writer.writerow(["Загружено всего", f"{self.statistics['total_load']:.1f} т"])
-                    writer.writerow(["Эффективность загрузки", f"{self.statistics['load_percentage']:.1f}%"])
-                    writer.writerow(["Загружено грузов", self.statistics['clients_loaded']])
-                    writer.writerow(["Незагруженных грузов", self.statistics['clients_unloaded']])
-                    writer.writerow([])
-                    
-                    # Записываем распределение по транспорту
-                    writer.writerow(["Распределение по транспортным средствам"])
-                    writer.writerow(["Транспорт", "Грузоподъемность", "Загружено", "Процент", "Клиенты"])
-                    
-                    for vehicle in self.used_vehicles:
-                        clients_list = ", ".join([c.name for c in vehicle.clients_list])
-                        writer.writerow([
-                            vehicle.vehicle_id,
-                            f"{vehicle.capacity} т",
-                            f"{vehicle.current_load:.1f} т",
-                            f"{vehicle.get_load_percentage():.1f}%",
-                            clients_list
-                        ])
-                
-                messagebox.showinfo("Успех", f"Результаты успешно экспортированы в {filename}")
-                
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Ошибка при экспорте: {e}")
+            self.start_export(write_plan_csv, filename)
     
     def export_json(self):
         """Экспортирует результаты в JSON файл."""
@@ -799,30 +544,442 @@ class ResultsWindow(tk.Toplevel):
         )
         
         if filename:
+            self.start_export(write_plan_json, filename)
+    
+    def start_export(self, write, filename):
+        """Запускает запись файла функцией write в рабочем потоке."""
+        self.export_cancel = threading.Event()
+        for button in self.export_buttons:
+            button.config(state=tk.DISABLED)
+        self.export_cancel_button.config(state=tk.NORMAL)
+        self.export_progress['value'] = 0
+        self.export_status.set("Экспорт...")
+        
+        threading.Thread(target=self.run_export, args=(write, filename, self.export_cancel),
+                         daemon=True).start()
+        self.export_poll = self.after(self.POLL_INTERVAL, self.poll_export)
+    
+    def run_export(self, write, filename, cancel_event):
+        """Выполняется в рабочем потоке."""
+        def progress(done, total):
+            if cancel_event.is_set():
+                raise ExportCancelled()
+            self.export_messages.put(('progress', done, total))
+        
+        try:
+            write(filename, self.statistics, self.used_vehicles, self.packing, progress)
+            self.export_messages.put(('done', filename))
+        except ExportCancelled:
+            self.export_messages.put(('cancelled', filename))
+        except Exception as e:
+            self.export_messages.put(('error', e))
+    
+    def poll_export(self):
+        """Забирает сообщения рабочего потока экспорта."""
+        try:
+            while True:
+                message = self.export_messages.get_nowait()
+                if message[0] == 'progress':
+                    _, done, total = message
+                    self.export_progress['value'] = done / total * 100 if total else 100
+                    self.export_status.set(f"Экспорт: {done} из {total}")
+                else:
+                    self.finish_export(*message)
+                    return
+        except queue.Empty:
+            pass
+        self.export_poll = self.after(self.POLL_INTERVAL, self.poll_export)
+    
+    def cancel_export(self):
+        """Просит рабочий поток остановить экспорт."""
+        self.export_cancel.set()
+        self.export_status.set("Отмена...")
+        self.export_cancel_button.config(state=tk.DISABLED)
+    
+    def finish_export(self, outcome, detail):
+        self.export_cancel = None
+        self.export_poll = None
+        for button in self.export_buttons:
+            button.config(state=tk.NORMAL)
+        self.export_cancel_button.config(state=tk.DISABLED)
+        self.export_progress['value'] = 0
+        
+        if outcome == 'done':
+            self.export_status.set("")
+            messagebox.showinfo("Успех", f"Результаты успешно экспортированы в {detail}")
+        elif outcome == 'cancelled':
+            self.export_status.set("Экспорт отменен")
+        else:
+            self.export_status.set("")
+            messagebox.showerror("Ошибка", f"Ошибка при экспорте: {detail}")
+    
+    def destroy(self):
+        """Закрывает окно; незаконченный экспорт отменяется."""
+        if self.export_cancel is not None:
+            self.export_cancel.set()
+        if self.export_poll is not None:
+            self.after_cancel(self.export_poll)
+            self.export_poll = None
+        super().destroy()
+
+
+class OptimizeProgressWindow(tk.Toplevel):
+    """Окно расчета распределения в рабочем потоке.
+    
+    Рабочий поток считает PackingPlan и не обращается к Tk: прогресс и
+    итог передаются через очередь, которую окно опрашивает через after().
+    Окно модальное, поэтому данные компании во время расчета не меняются.
+    """
+    
+    POLL_INTERVAL = 50  # мс
+    
+    def __init__(self, parent, plan):
+        super().__init__(parent)
+        self.parent = parent
+        self.plan = plan
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        
+        self.title("Распределение грузов")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        self.create_widgets()
+        self.center_window()
+        
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+        self.after(self.POLL_INTERVAL, self.poll)
+    
+    def center_window(self):
+        """Центрирует окно на экране."""
+        self.update_idletasks()
+        width = self.winfo_width()
+        height = self.winfo_height()
+        x = (self.winfo_screenwidth() // 2) - (width // 2)
+        y = (self.winfo_screenheight() // 2) - (height // 2)
+        self.geometry(f'{width}x{height}+{x}+{y}')
+    
+    def create_widgets(self):
+        """Создает виджеты окна."""
+        frame = ttk.Frame(self, padding="20")
+        frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        title = STRATEGIES[self.plan.strategy][0]
+        ttk.Label(frame, text=f"Стратегия: {title}").grid(row=0, column=0, sticky=tk.W)
+        
+        self.progress = ttk.Progressbar(frame, length=300, mode="determinate", maximum=100)
+        self.progress.grid(row=1, column=0, pady=10)
+        
+        self.status_var = tk.StringVar(value="Подготовка...")
+        ttk.Label(frame, textvariable=self.status_var).grid(row=2, column=0, sticky=tk.W)
+        
+        self.cancel_button = ttk.Button(frame, text="Отмена", command=self.cancel)
+        self.cancel_button.grid(row=3, column=0, pady=(10, 0))
+    
+    def run(self):
+        """Выполняется в рабочем потоке."""
+        def progress(done, total):
+            if self.cancel_event.is_set():
+                raise PackingCancelled()
+            self.messages.put(('progress', done, total))
+        
+        try:
+            self.plan.solve(progress)
+            self.messages.put(('done', None))
+        except PackingCancelled:
+            self.messages.put(('cancelled', None))
+        except Exception as e:
+            self.messages.put(('error', e))
+    
+    def poll(self):
+        """Забирает сообщения рабочего потока."""
+        try:
+            while True:
+                message = self.messages.get_nowait()
+                if message[0] == 'progress':
+                    _, done, total = message
+                    self.progress['value'] = done / total * 100 if total else 0
+                    self.status_var.set(f"Обработано: {done} из {total}")
+                else:
+                    self.finish(*message)
+                    return
+        except queue.Empty:
+            pass
+        self.after(self.POLL_INTERVAL, self.poll)
+    
+    def cancel(self):
+        """Просит рабочий поток остановиться."""
+        self.cancel_event.set()
+        self.status_var.set("Отмена...")
+        self.cancel_button.config(state=tk.DISABLED)
+    
+    def finish(self, outcome, error):
+        self.grab_release()
+        self.destroy()
+        self.parent.on_optimization_finished(self.plan, outcome, error)
+
+
+class ImportProgressWindow(tk.Toplevel):
+    """Окно импорта заказов.
+    
+    Рабочий поток разбирает файлы (parse_clients) и передает пачки через
+    очередь; окно забирает их через after() и добавляет в компанию
+    (ClientImport), так что компанию меняет только поток Tk. Очередь
+    ограничена, поэтому разбор не копит пачки в памяти. Окно модальное.
+    """
+    
+    POLL_INTERVAL = 50  # мс
+    QUEUE_BATCHES = 4   # Пачек в очереди
+    
+    def __init__(self, parent, filenames, rejects, workers):
+        super().__init__(parent)
+        self.parent = parent
+        self.filenames = filenames
+        self.rejects = rejects
+        self.workers = workers
+        self.session = ClientImport(parent.company, rejects)
+        self.messages = queue.Queue(maxsize=self.QUEUE_BATCHES)
+        self.cancel_event = threading.Event()
+        
+        self.title("Импорт заказов")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        self.create_widgets()
+        self.center_window()
+        
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+        self.after(self.POLL_INTERVAL, self.poll)
+    
+    def center_window(self):
+        """Центрирует окно на экране."""
+        self.update_idletasks()
+        width = self.winfo_width()
+        height = self.winfo_height()
+        x = (self.winfo_screenwidth() // 2) - (width // 2)
+        y = (self.winfo_screenheight() // 2) - (height // 2)
+        self.geometry(f'{width}x{height}+{x}+{y}')
+    
+    def create_widgets(self):
+        """Создает виджеты окна."""
+        frame = ttk.Frame(self, padding="20")
+        frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        ttk.Label(frame, text=f"Файлов: {len(self.filenames)}").grid(row=0, column=0, sticky=tk.W)
+        
+        # Общее число строк заранее неизвестно
+        self.progress = ttk.Progressbar(frame, length=300, mode="indeterminate")
+        self.progress.grid(row=1, column=0, pady=10)
+        self.progress.start()
+        
+        self.status_var = tk.StringVar(value="Чтение файлов...")
+        ttk.Label(frame, textvariable=self.status_var).grid(row=2, column=0, sticky=tk.W)
+        
+        self.cancel_button = ttk.Button(frame, text="Отмена", command=self.cancel)
+        self.cancel_button.grid(row=3, column=0, pady=(10, 0))
+    
+    def run(self):
+        """Выполняется в рабочем потоке."""
+        try:
+            batches = parse_clients(self.filenames, self.workers)
             try:
-                data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'statistics': self.statistics,
-                    'distribution': []
-                }
-                
-                for vehicle in self.used_vehicles:
-                    vehicle_data = {
-                        'vehicle_id': vehicle.vehicle_id,
-                        'capacity': vehicle.capacity,
-                        'current_load': vehicle.current_load,
-                        'load_percentage': vehicle.get_load_percentage(),
-                        'clients': [c.name for c in vehicle.clients_list]
-                    }
-                    data['distribution'].append(vehicle_data)
-                
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-                
-                messagebox.showinfo("Успех", f"Результаты успешно экспортированы в {filename}")
-                
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Ошибка при экспорте: {e}")
+                for batch in batches:
+                    if self.cancel_event.is_set():
+                        self.messages.put(('cancelled', None))
+                        return
+                    self.messages.put(('batch', batch))
+            finally:
+                batches.close()  # Останавливает процессы разбора
+            self.messages.put(('done', None))
+        except Exception as e:
+            self.messages.put(('error', e))
+    
+    def poll(self):
+        """Забирает пачки рабочего потока и добавляет их в компанию."""
+        added = False
+        try:
+            # Не больше QUEUE_BATCHES пачек за раз, чтобы окно не замирало
+            for _ in range(self.QUEUE_BATCHES):
+                message = self.messages.get_nowait()
+                if message[0] != 'batch':
+                    self.finish(*message)
+                    return
+                try:
+                    self.session.add(*message[1])
+                except Exception as e:
+                    # Пачку не удалось добавить (например, ошибка записи журнала)
+                    self.cancel_event.set()
+                    self.drain()
+                    self.finish('error', e)
+                    return
+                added = True
+        except queue.Empty:
+            pass
+        if added:
+            self.status_var.set(f"Строк: {self.session.rows}, добавлено: "
+                                f"{self.session.imported}, отклонено: {self.session.rejected}")
+            self.parent.update_clients_table()
+        self.after(self.POLL_INTERVAL, self.poll)
+    
+    def drain(self):
+        """Выбирает очередь, чтобы рабочий поток не ждал места в ней."""
+        while self.worker.is_alive():
+            try:
+                self.messages.get(timeout=0.1)
+            except queue.Empty:
+                pass
+    
+    def cancel(self):
+        """Просит рабочий поток остановиться."""
+        self.cancel_event.set()
+        self.status_var.set("Отмена...")
+        self.cancel_button.config(state=tk.DISABLED)
+    
+    def finish(self, outcome, error):
+        summary = self.session.close()
+        self.progress.stop()
+        self.grab_release()
+        self.destroy()
+        self.parent.on_import_finished(summary, self.rejects, outcome, error)
+
+
+class VirtualTable(ttk.Frame):
+    """Таблица с прокруткой, которая хранит строки только для видимого окна.
+    
+    Treeview содержит столько строк, сколько помещается по высоте (плюс
+    одну частично видимую). При прокрутке в эти же строки подставляются
+    значения других объектов, поэтому число виджетов и расход памяти не
+    зависят от длины списка. Объекты берутся из source() по индексу в
+    момент отрисовки, row(obj) превращает объект в значения столбцов.
+    """
+    
+    def __init__(self, parent, columns, source, row, height=15):
+        super().__init__(parent)
+        self.source = source
+        self.row = row
+        self.first = 0          # Индекс объекта в первой строке окна
+        self.visible = height   # Сколько строк помещается в окно
+        self._selected = None   # Выбранный объект
+        self._slots = []        # Строки Treeview: (ID строки, показанные значения)
+        
+        self.tree = ttk.Treeview(self, columns=[col for col, _ in columns],
+                                 show="headings", height=height, selectmode="browse")
+        for col, width in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width)
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+        
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<MouseWheel>", lambda e: self._scroll(-3 if e.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda e: self._scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self.visible))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self.visible))
+    
+    def bind_row(self, sequence, func):
+        """Привязывает обработчик события к строкам таблицы."""
+        self.tree.bind(sequence, func, add="+")
+    
+    def selected(self):
+        """Возвращает выбранный объект или None."""
+        return self._selected
+    
+    def refresh(self):
+        """Перерисовывает видимое окно по текущим данным."""
+        objects = self.source()
+        total = len(objects)
+        self.first = max(0, min(self.first, total - self.visible))
+        
+        count = min(self.visible + 1, total - self.first)
+        selection = ()
+        for i in range(count):
+            obj = objects[self.first + i]
+            values = self.row(obj)
+            if i == len(self._slots):
+                self._slots.append((self.tree.insert("", tk.END, values=values), values))
+            elif self._slots[i][1] != values:
+                self.tree.item(self._slots[i][0], values=values)
+                self._slots[i] = (self._slots[i][0], values)
+            if obj is self._selected:
+                selection = (self._slots[i][0],)
+        
+        if len(self._slots) > count:
+            self.tree.delete(*[item for item, _ in self._slots[count:]])
+            del self._slots[count:]
+        self.tree.selection_set(selection)
+        
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def yview(self, *args):
+        """Обработчик полосы прокрутки (протокол команды Scrollbar)."""
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.source()))
+            self.refresh()
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self._scroll(amount * self.visible if args[2] == "pages" else amount)
+    
+    def _scroll(self, amount):
+        self.first += amount
+        self.refresh()
+        return "break"
+    
+    def _on_resize(self, event):
+        style = ttk.Style(self)
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        # Строка заголовков примерно равна по высоте обычной строке
+        visible = max(1, event.height // row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
+    
+    def _on_click(self, event):
+        item = self.tree.identify_row(event.y)
+        for i, (slot_item, _) in enumerate(self._slots):
+            if slot_item == item:
+                self._selected = self.source()[self.first + i]
+                break
+    
+    def _move_selection(self, step):
+        """Перемещает выделение, прокручивая окно вслед за ним."""
+        objects = self.source()
+        if not objects:
+            return "break"
+        
+        index = self.first
+        if self._selected is not None:
+            window = objects[self.first:self.first + self.visible + 1]
+            for i, obj in enumerate(window):
+                if obj is self._selected:
+                    index = self.first + i + step
+                    break
+        index = max(0, min(index, len(objects) - 1))
+        
+        self._selected = objects[index]
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + self.visible:
+            self.first = index - self.visible + 1
+        self.refresh()
+        return "break"
 
 
 class MainApplication(tk.Tk):
@@ -836,11 +993,15 @@ class MainApplication(tk.Tk):
         
         self.company = TransportCompany()
         
+        self._dirty_tables = set()
+        self._refresh_job = None
+        
         self.create_menu()
         self.create_widgets()
         self.create_status_bar()
         
         self.center_window()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Создаем демо-данные для тестирования
         self.create_demo_data()
@@ -861,8 +1022,10 @@ class MainApplication(tk.Tk):
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="Сохранить данные", command=self.save_data)
         file_menu.add_command(label="Загрузить данные", command=self.load_data)
+        file_menu.add_command(label="Импорт заказов...", command=self.import_orders)
+        file_menu.add_command(label="Вести журнал изменений...", command=self.open_journal)
         file_menu.add_separator()
-        file_menu.add_command(label="Выход", command=self.quit)
+        file_menu.add_command(label="Выход", command=self.on_close)
         menubar.add_cascade(label="Файл", menu=file_menu)
         
         # Меню "Экспорт"
@@ -895,53 +1058,48 @@ class MainApplication(tk.Tk):
                   width=20).pack(side=tk.LEFT, padx=5)
         ttk.Button(control_frame, text="Распределить грузы", command=self.optimize_distribution,
                   width=20, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Дораспределить", command=self.replan_distribution,
+                  width=16).pack(side=tk.LEFT, padx=5)
+        
+        # Выбор стратегии распределения
+        ttk.Label(control_frame, text="Стратегия:").pack(side=tk.LEFT, padx=(15, 5))
+        self.strategy_titles = {title: code for code, (title, _) in STRATEGIES.items()}
+        self.strategy_var = tk.StringVar(value=STRATEGIES[DEFAULT_STRATEGY][0])
+        ttk.Combobox(control_frame, textvariable=self.strategy_var, values=list(self.strategy_titles),
+                     state="readonly", width=35).pack(side=tk.LEFT, padx=5)
+        
+        # Число процессов для больших парков (см. packing.PackingPlan)
+        ttk.Label(control_frame, text="Процессов:").pack(side=tk.LEFT, padx=(15, 5))
+        self.workers_var = tk.IntVar(value=1)
+        ttk.Spinbox(control_frame, textvariable=self.workers_var, from_=1, to=os.cpu_count() or 1,
+                    state="readonly", width=4).pack(side=tk.LEFT, padx=5)
+        
+        self.improve_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Локальный поиск",
+                        variable=self.improve_var).pack(side=tk.LEFT, padx=5)
         
         # Таблица клиентов
         clients_frame = ttk.LabelFrame(self, text="Клиенты", padding="10")
         clients_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(10, 5), pady=10)
         
-        # Создаем Treeview для клиентов
-        self.clients_tree = ttk.Treeview(clients_frame, columns=("Имя", "Вес груза", "VIP статус", "Статус"), 
-                                        show="headings", height=15)
-        
-        # Настраиваем заголовки
+        # Создаем таблицу клиентов
         columns = [("Имя", 200), ("Вес груза", 100), ("VIP статус", 100), ("Статус", 100)]
-        for col, width in columns:
-            self.clients_tree.heading(col, text=col)
-            self.clients_tree.column(col, width=width)
-        
-        # Добавляем скроллбар
-        clients_scrollbar = ttk.Scrollbar(clients_frame, orient=tk.VERTICAL, command=self.clients_tree.yview)
-        self.clients_tree.configure(yscrollcommand=clients_scrollbar.set)
-        
-        # Размещаем виджеты
-        self.clients_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        clients_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.clients_table = VirtualTable(clients_frame, columns,
+                                          lambda: self.company.clients, self._client_row)
+        self.clients_table.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Бинд двойного клика для редактирования
-        self.clients_tree.bind("<Double-1>", self.edit_client)
+        self.clients_table.bind_row("<Double-1>", self.edit_client)
         
         # Таблица транспортных средств
         vehicles_frame = ttk.LabelFrame(self, text="Транспортные средства", padding="10")
         vehicles_frame.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(5, 10), pady=10)
         
-        # Создаем Treeview для транспорта
-        self.vehicles_tree = ttk.Treeview(vehicles_frame, columns=("ID", "Тип", "Грузоподъемность", "Загружено", "Процент"), 
-                                         show="headings", height=15)
-        
-        # Настраиваем заголовки
+        # Создаем таблицу транспорта
         columns = [("ID", 150), ("Тип", 100), ("Грузоподъемность", 100), ("Загружено", 100), ("Процент", 80)]
-        for col, width in columns:
-            self.vehicles_tree.heading(col, text=col)
-            self.vehicles_tree.column(col, width=width)
-        
-        # Добавляем скроллбар
-        vehicles_scrollbar = ttk.Scrollbar(vehicles_frame, orient=tk.VERTICAL, command=self.vehicles_tree.yview)
-        self.vehicles_tree.configure(yscrollcommand=vehicles_scrollbar.set)
-        
-        # Размещаем виджеты
-        self.vehicles_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        vehicles_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.vehicles_table = VirtualTable(vehicles_frame, columns,
+                                           lambda: self.company.vehicles, self._vehicle_row)
+        self.vehicles_table.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Настройка сетки
         clients_frame.rowconfigure(0, weight=1)
@@ -981,8 +1139,7 @@ class MainApplication(tk.Tk):
                 Client("Дмитрий Кузнецов", 2.7)
             ]
             
-            for client in clients:
-                self.company.add_client(client)
+            self.company.add_clients(clients)
             
             # Добавляем транспорт
             vehicles = [
@@ -991,8 +1148,7 @@ class MainApplication(tk.Tk):
                 Airplane(8.0, 10000)
             ]
             
-            for vehicle in vehicles:
-                self.company.add_vehicle(vehicle)
+            self.company.add_vehicles(vehicles)
             
             self.update_clients_table()
             self.update_vehicles_table()
@@ -1010,45 +1166,64 @@ class MainApplication(tk.Tk):
         self.status_var.set(text)
     
     def update_clients_table(self):
-        """Обновляет таблицу клиентов."""
-        # Очищаем таблицу
-        for item in self.clients_tree.get_children():
-            self.clients_tree.delete(item)
-        
-        # Добавляем клиентов
-        for client in self.company.clients:
-            vip_status = "VIP" if client.is_vip else "Нет"
-            loaded_status = "Загружен" if client.is_loaded else "Не загружен"
-            self.clients_tree.insert("", tk.END, values=(
-                client.name,
-                f"{client.cargo_weight} т",
-                vip_status,
-                loaded_status
-            ))
+        """Планирует обновление таблицы клиентов (см. _refresh_tables)."""
+        self._schedule_refresh('clients')
     
     def update_vehicles_table(self):
-        """Обновляет таблицу транспортных средств."""
-        # Очищаем таблицу
-        for item in self.vehicles_tree.get_children():
-            self.vehicles_tree.delete(item)
-        
-        # Добавляем транспорт
-        for vehicle in self.company.vehicles:
-            vehicle_type = vehicle.__class__.__name__
-            if vehicle_type == "Train":
-                vehicle_type = "Поезд"
-            elif vehicle_type == "Airplane":
-                vehicle_type = "Самолет"
-            else:
-                vehicle_type = "Транспорт"
-            
-            self.vehicles_tree.insert("", tk.END, values=(
-                vehicle.vehicle_id,
-                vehicle_type,
-                f"{vehicle.capacity} т",
-                f"{vehicle.current_load:.1f} т",
-                f"{vehicle.get_load_percentage():.1f}%"
-            ))
+        """Планирует обновление таблицы транспортных средств (см. _refresh_tables)."""
+        self._schedule_refresh('vehicles')
+    
+    def _schedule_refresh(self, table):
+        """Откладывает обновление таблицы до простоя цикла событий.
+        
+        Несколько изменений подряд приводят к одной перерисовке.
+        """
+        self._dirty_tables.add(table)
+        if self._refresh_job is None:
+            self._refresh_job = self.after_idle(self._refresh_tables)
+    
+    def _refresh_tables(self):
+        """Перерисовывает видимые строки помеченных таблиц."""
+        self._refresh_job = None
+        dirty, self._dirty_tables = self._dirty_tables, set()
+        if 'clients' in dirty:
+            self.clients_table.refresh()
+        if 'vehicles' in dirty:
+            self.vehicles_table.refresh()
+    
+    @staticmethod
+    def _client_row(client):
+        vip_status = "VIP" if client.is_vip else "Нет"
+        loaded_status = "Загружен" if client.is_loaded else "Не загружен"
+        cargo = f"{client.cargo_weight} т"
+        if client.volume:
+            cargo += f", {client.volume} м³"
+        if client.pallets:
+            cargo += f", {client.pallets} пал."
+        return (
+            client.name,
+            cargo,
+            vip_status,
+            loaded_status
+        )
+    
+    @staticmethod
+    def _vehicle_row(vehicle):
+        vehicle_type = vehicle.__class__.__name__
+        if vehicle_type == "Train":
+            vehicle_type = "Поезд"
+        elif vehicle_type == "Airplane":
+            vehicle_type = "Самолет"
+        else:
+            vehicle_type = "Транспорт"
+        
+        return (
+            vehicle.vehicle_id,
+            vehicle_type,
+            f"{vehicle.capacity} т",
+            f"{vehicle.current_load:.1f} т",
+            f"{vehicle.get_load_percentage():.1f}%"
+        )
     
     def add_client(self):
         """Открывает окно добавления клиента."""
@@ -1056,30 +1231,18 @@ class MainApplication(tk.Tk):
     
     def edit_client(self, event):
         """Редактирует выбранного клиента."""
-        selection = self.clients_tree.selection()
-        if not selection:
-            return
-        
-        item = selection[0]
-        values = self.clients_tree.item(item)['values']
-        client_name = values[0]
-        
-        # Находим клиента
-        for client in self.company.clients:
-            if client.name == client_name:
-                AddClientWindow(self, self.company, client)
-                break
+        client = self.clients_table.selected()
+        if client is not None and self.company.get_client(client.name) is client:
+            AddClientWindow(self, self.company, client)
     
     def delete_client(self):
         """Удаляет выбранного клиента."""
-        selection = self.clients_tree.selection()
-        if not selection:
+        client = self.clients_table.selected()
+        if client is None:
             messagebox.showwarning("Предупреждение", "Выберите клиента для удаления")
             return
         
-        item = selection[0]
-        values = self.clients_tree.item(item)['values']
-        client_name = values[0]
+        client_name = client.name
         
         if messagebox.askyesno("Подтверждение", f"Удалить клиента '{client_name}'?"):
             try:
@@ -1095,14 +1258,12 @@ class MainApplication(tk.Tk):
     
     def delete_vehicle(self):
         """Удаляет выбранное транспортное средство."""
-        selection = self.vehicles_tree.selection()
-        if not selection:
+        vehicle = self.vehicles_table.selected()
+        if vehicle is None:
             messagebox.showwarning("Предупреждение", "Выберите транспортное средство для удаления")
             return
         
-        item = selection[0]
-        values = self.vehicles_tree.item(item)['values']
-        vehicle_id = values[0]
+        vehicle_id = vehicle.vehicle_id
         
         if messagebox.askyesno("Подтверждение", f"Удалить транспортное средство '{vehicle_id}'?"):
             try:
@@ -1123,7 +1284,43 @@ class MainApplication(tk.Tk):
             return
         
         try:
-            used_vehicles = self.company.optimize_cargo_distribution()
+            strategy = self.strategy_titles[self.strategy_var.get()]
+            improve = IMPROVE_TIME_BUDGET if self.improve_var.get() else 0.0
+            plan = self.company.plan_cargo_distribution(strategy, self.workers_var.get(),
+                                                        improve=improve)
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка при распределении грузов: {e}")
+            return
+        
+        # Расчет идет в рабочем потоке, результат придет в on_optimization_finished
+        self.show_status("Идет распределение грузов...")
+        OptimizeProgressWindow(self, plan)
+    
+    def replan_distribution(self):
+        """Размещает незагруженные грузы, не перестраивая весь план."""
+        moves = self.company.replan_cargo_distribution()
+        unplaced = len(self.company.get_unloaded_clients())
+        
+        self.update_clients_table()
+        self.update_vehicles_table()
+        
+        if moves:
+            shown = "\n".join(str(move) for move in moves[:20])
+            if len(moves) > 20:
+                shown += f"\n... и еще {len(moves) - 20}"
+            messagebox.showinfo("Дораспределение", f"Перемещений: {len(moves)}\n{shown}")
+        self.show_status(f"Дораспределение: перемещений {len(moves)}, не поместилось {unplaced}")
+    
+    def on_optimization_finished(self, plan, outcome, error=None):
+        """Применяет результат расчета из OptimizeProgressWindow."""
+        if outcome == 'cancelled':
+            self.show_status("Распределение грузов отменено")
+            return
+        
+        try:
+            if outcome == 'error':
+                raise error
+            used_vehicles = self.company.apply_cargo_plan(plan)
             statistics = self.company.get_statistics()
             
             # Обновляем таблицы
@@ -1134,11 +1331,12 @@ class MainApplication(tk.Tk):
             self.export_menu.entryconfig(0, state=tk.NORMAL)
             
             # Показываем результаты
-            ResultsWindow(self, used_vehicles, statistics)
+            ResultsWindow(self, used_vehicles, statistics, self.company.last_packing)
             
-            self.show_status("Распределение грузов выполнено успешно")
+            self.show_status(f"Распределение грузов выполнено: {self.company.last_packing}")
             
         except Exception as e:
+            self.show_status("Готово")
             messagebox.showerror("Ошибка", f"Ошибка при распределении грузов: {e}")
     
     def export_results(self):
@@ -1154,7 +1352,8 @@ class MainApplication(tk.Tk):
         """Сохраняет данные в файл."""
         filename = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON файлы", "*.json"), ("Все файлы", "*.*")]
+            filetypes=[("JSON файлы", "*.json"), ("JSON Lines (потоковый)", "*.jsonl"),
+                       ("Двоичный снимок", "*.bin"), ("Все файлы", "*.*")]
         )
         
         if filename:
@@ -1168,19 +1367,97 @@ class MainApplication(tk.Tk):
     def load_data(self):
         """Загружает данные из файла."""
         filename = filedialog.askopenfilename(
-            filetypes=[("JSON файлы", "*.json"), ("Все файлы", "*.*")]
+            filetypes=[("Снимки компании", "*.json *.jsonl *.bin"), ("Все файлы", "*.*")]
         )
         
         if filename:
             try:
-                self.company.load_from_file(filename)
+                issues = self.company.load_from_file(filename)
                 self.update_clients_table()
                 self.update_vehicles_table()
-                messagebox.showinfo("Успех", f"Данные успешно загружены из {filename}")
+                if issues:
+                    shown = "\n".join(issues[:20])
+                    if len(issues) > 20:
+                        shown += f"\n... и еще {len(issues) - 20}"
+                    messagebox.showwarning("Предупреждение",
+                                           f"Данные загружены из {filename}, "
+                                           f"найдены расхождения ({len(issues)}):\n{shown}")
+                else:
+                    messagebox.showinfo("Успех", f"Данные успешно загружены из {filename}")
                 self.show_status(f"Данные загружены из {filename}")
             except Exception as e:
                 messagebox.showerror("Ошибка", f"Ошибка при загрузке: {e}")
     
+    def import_orders(self):
+        """Импортирует заказы из файлов CSV/JSONL.
+        
+        Отклоненные строки записываются рядом с первым файлом в
+        <имя>.rejects.jsonl. Импорт идет в ImportProgressWindow, итог
+        приходит в on_import_finished.
+        """
+        filenames = filedialog.askopenfilenames(
+            filetypes=[("Заказы", "*.csv *.jsonl"), ("Все файлы", "*.*")]
+        )
+        
+        if filenames:
+            rejects = os.path.splitext(filenames[0])[0] + ".rejects.jsonl"
+            try:
+                ImportProgressWindow(self, list(filenames), rejects, self.workers_var.get())
+            except Exception as e:
+                messagebox.showerror("Ошибка", f"Ошибка при импорте: {e}")
+                return
+            self.show_status("Идет импорт заказов...")
+    
+    def on_import_finished(self, summary, rejects, outcome, error=None):
+        """Показывает итог импорта из ImportProgressWindow."""
+        self.update_clients_table()  # Уже добавленные пачки остаются
+        message = (f"Строк: {summary['rows']}, добавлено: {summary['imported']}, "
+                   f"отклонено: {summary['rejected']}")
+        if outcome == 'error':
+            self.show_status("Готово")
+            messagebox.showerror("Ошибка", f"Ошибка при импорте: {error}\n{message}")
+            return
+        if outcome == 'cancelled':
+            self.show_status(f"Импорт заказов отменен: добавлено {summary['imported']}")
+            return
+        
+        if summary['rejected']:
+            shown = "\n".join(summary['examples'])
+            messagebox.showwarning("Импорт заказов",
+                                   f"{message}\n{shown}\n\nВсе отказы: {rejects}")
+        else:
+            messagebox.showinfo("Импорт заказов", message)
+        self.show_status(f"Импорт заказов: добавлено {summary['imported']}")
+    
+    def open_journal(self):
+        """Подключает журнал изменений.
+        
+        Если снимок журнала уже существует, данные восстанавливаются из него
+        и журнала; иначе в него записываются текущие данные.
+        """
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".jsonl",
+            confirmoverwrite=False,
+            filetypes=[("JSON Lines (журнал)", "*.jsonl"), ("Все файлы", "*.*")]
+        )
+        
+        if filename:
+            try:
+                if self.company.journal is not None:
+                    self.company.journal.close()
+                replayed = Journal(filename).open(self.company)
+                self.update_clients_table()
+                self.update_vehicles_table()
+                self.show_status(f"Журнал: {filename} (восстановлено операций: {replayed})")
+            except Exception as e:
+                messagebox.showerror("Ошибка", f"Ошибка при открытии журнала: {e}")
+    
+    def on_close(self):
+        """Закрывает журнал и завершает приложение."""
+        if self.company.journal is not None:
+            self.company.journal.close()
+        self.destroy()
+    
     def show_about(self):
         """Показывает окно 'О программе'."""
         about_text = """
@@ -0,0 +1,1511 @@
+"""Движок распределения грузов по транспортным средствам.
+
+Модуль не зависит от классов программы: транспорт должен иметь атрибуты
+capacity, current_load, max_volume, current_volume, max_pallets,
+current_pallets и методы can_fit(weight, volume, pallets)/load_cargo,
+клиент - атрибуты cargo_weight, volume, pallets, is_vip и is_loaded.
+Неограниченное измерение задается значением UNLIMITED. Транспорт из
+нескольких отсеков (поезд) имеет атрибут cars - CarIndex, у остального
+транспорта cars равен None.
+
+Если ни у одного клиента нет объема и паллет или у всего транспорта эти
+измерения не ограничены, стратегии работают только с весом. Иначе
+деревья отрезков хранят свободное место по каждому измерению
+(VectorCapacityTree) и отсекают поддеревья, максимум которых не
+покрывает груз хотя бы по одному измерению.
+
+Стратегии регистрируются в STRATEGIES и вызываются через pack().
+Каждая стратегия принимает необязательный обработчик progress(done, total),
+который вызывается каждые PROGRESS_STEP шагов; чтобы прервать расчет,
+обработчик выбрасывает PackingCancelled.
+
+PackingPlan рассчитывает распределение на копиях данных, поэтому расчет
+можно вести в рабочем потоке, не трогая объекты программы, или разбить
+на части и считать их параллельно в пуле процессов.
+"""
+
+import bisect
+import heapq
+import time
+
+_EMPTY = float('-inf')
+_EMPTY_VECTOR = (_EMPTY, _EMPTY, _EMPTY)
+
+# Значение ограничения, которого нет (объем или паллеты)
+UNLIMITED = float('inf')
+
+# Допуск для отсечения поддеревьев. Окончательная проверка всегда выполняется
+# через vehicle.can_fit, поэтому результат совпадает с Vehicle.load_cargo
+# даже при ошибках округления.
+_EPS = 1e-9
+
+PROGRESS_STEP = 1000
+
+
+class PackingCancelled(Exception):
+    """Расчет прерван обработчиком прогресса."""
+
+
+def _report(progress, done, total):
+    if progress is not None and done % PROGRESS_STEP == 0:
+        progress(done, total)
+
+
+class CapacityTree:
+    """Дерево отрезков по максимуму свободной грузоподъемности.
+
+    Находит самый левый слот, в который помещается груз, за O(log n).
+    """
+
+    def __init__(self, size: int):
+        n = 1
+        while n < size:
+            n *= 2
+        self._n = n
+        self._tree = [_EMPTY] * (2 * n)
+
+    @classmethod
+    def from_values(cls, values):
+        """Строит дерево по списку значений за O(n)."""
+        values = list(values)
+        tree = cls(len(values))
+        n = tree._n
+        tree._tree[n:n + len(values)] = values
+        for i in range(n - 1, 0, -1):
+            tree._tree[i] = max(tree._tree[2 * i], tree._tree[2 * i + 1])
+        return tree
+
+    def update(self, index: int, value: float):
+        """Устанавливает значение слота и пересчитывает путь до корня."""
+        tree = self._tree
+        i = index + self._n
+        tree[i] = value
+        i //= 2
+        while i:
+            left = tree[2 * i]
+            right = tree[2 * i + 1]
+            tree[i] = left if left >= right else right
+            i //= 2
+
+    def find_first(self, weight: float, fits):
+        """Возвращает самый левый слот, для которого fits(slot) истинно, или -1.
+
+        Поддеревья, где максимум заведомо меньше weight, не просматриваются.
+        """
+        tree = self._tree
+        bound = weight - _EPS * max(1.0, weight)
+        if tree[1] < bound:
+            return -1
+
+        n = self._n
+        stack = [1]
+        while stack:
+            node = stack.pop()
+            if tree[node] < bound:
+                continue
+            if node >= n:
+                if fits(node - n):
+                    return node - n
+                continue
+            stack.append(2 * node + 1)
+            stack.append(2 * node)
+        return -1
+
+    def max(self):
+        """Наибольшее значение среди слотов."""
+        return self._tree[1]
+
+
+class VectorCapacityTree:
+    """Дерево отрезков по покомпонентному максимуму свободного места.
+
+    Значения - тройки (вес, объем, паллеты). В узле хранится максимум
+    каждого измерения отдельно, поэтому поддерево просматривается, только
+    если этот максимум покрывает груз по всем трем измерениям.
+    """
+
+    def __init__(self, size: int):
+        n = 1
+        while n < size:
+            n *= 2
+        self._n = n
+        self._trees = ([_EMPTY] * (2 * n), [_EMPTY] * (2 * n), [_EMPTY] * (2 * n))
+
+    @classmethod
+    def from_values(cls, values):
+        """Строит дерево по списку троек за O(n)."""
+        values = list(values)
+        tree = cls(len(values))
+        n = tree._n
+        for d, part in enumerate(tree._trees):
+            part[n:n + len(values)] = [value[d] for value in values]
+            for i in range(n - 1, 0, -1):
+                part[i] = max(part[2 * i], part[2 * i + 1])
+        return tree
+
+    def update(self, index: int, value):
+        """Устанавливает тройку слота и пересчитывает путь до корня."""
+        for part, component in zip(self._trees, value):
+            i = index + self._n
+            part[i] = component
+            i //= 2
+            while i:
+                left = part[2 * i]
+                right = part[2 * i + 1]
+                part[i] = left if left >= right else right
+                i //= 2
+
+    def find_first(self, demand, fits):
+        """Возвращает самый левый слот, для которого fits(slot) истинно, или -1."""
+        weights, volumes, pallets = self._trees
+        bw, bv, bp = (x - _EPS * max(1.0, x) for x in demand)
+        n = self._n
+        stack = [1]
+        while stack:
+            node = stack.pop()
+            if weights[node] < bw or volumes[node] < bv or pallets[node] < bp:
+                continue
+            if node >= n:
+                if fits(node - n):
+                    return node - n
+                continue
+            stack.append(2 * node + 1)
+            stack.append(2 * node)
+        return -1
+
+    def max(self):
+        """Покомпонентный максимум среди слотов."""
+        return tuple(part[1] for part in self._trees)
+
+
+def is_multidimensional(vehicles, clients):
+    """Нужно ли учитывать объем и паллеты при распределении."""
+    return (any(c.volume or c.pallets for c in clients)
+            and any(v.max_volume != UNLIMITED or v.max_pallets != UNLIMITED for v in vehicles))
+
+
+def _free_space(vehicle, multi):
+    """Свободное место транспорта: вес или тройка (вес, объем, паллеты).
+
+    У поезда это место ограничено наибольшим остатком одного вагона.
+    """
+    if multi:
+        free = (vehicle.capacity - vehicle.current_load,
+                vehicle.max_volume - vehicle.current_volume,
+                vehicle.max_pallets - vehicle.current_pallets)
+        if vehicle.cars is not None:
+            free = tuple(map(min, free, vehicle.cars.largest()))
+        return free
+    free = vehicle.capacity - vehicle.current_load
+    if vehicle.cars is not None:
+        free = min(free, vehicle.cars.largest()[0])
+    return free
+
+
+def _capacity_tree(vehicles, multi):
+    tree_class = VectorCapacityTree if multi else CapacityTree
+    return tree_class.from_values(_free_space(v, multi) for v in vehicles)
+
+
+class CarIndex:
+    """Загрузка вагонов поезда.
+
+    Вагоны одинаковые: capacity, max_volume и max_pallets заданы на один
+    вагон. Груз кладется в первый вагон, где для него есть место; остатки
+    вагонов хранятся в дереве отрезков, поэтому вагон выбирается за
+    O(log n) и у поезда из сотен вагонов.
+
+    Вагон каждого груза запоминается по id(client), поэтому грузы
+    выгружаются из своих вагонов в любом порядке.
+    """
+
+    __slots__ = ('capacity', 'max_volume', 'max_pallets', 'loads', 'volumes', 'pallets',
+                 '_multi', '_tree', '_car_of')
+
+    def __init__(self, count: int, capacity: float, max_volume=UNLIMITED, max_pallets=UNLIMITED):
+        self.capacity = capacity
+        self.max_volume = max_volume
+        self.max_pallets = max_pallets
+        self.loads = [0.0] * count
+        self.volumes = [0.0] * count
+        self.pallets = [0] * count
+        self._multi = max_volume != UNLIMITED or max_pallets != UNLIMITED
+        self._build_tree()
+        self._car_of = {}
+
+    def __len__(self):
+        return len(self.loads)
+
+    def _build_tree(self):
+        tree_class = VectorCapacityTree if self._multi else CapacityTree
+        self._tree = tree_class.from_values(self._car(car) for car in range(len(self)))
+
+    def _car(self, car):
+        """Свободное место вагона в виде, который хранится в дереве."""
+        if self._multi:
+            return (self.capacity - self.loads[car],
+                    self.max_volume - self.volumes[car],
+                    self.max_pallets - self.pallets[car])
+        return self.capacity - self.loads[car]
+
+    def copy(self):
+        clone = CarIndex.__new__(CarIndex)
+        clone.capacity = self.capacity
+        clone.max_volume = self.max_volume
+        clone.max_pallets = self.max_pallets
+        clone.loads = list(self.loads)
+        clone.volumes = list(self.volumes)
+        clone.pallets = list(self.pallets)
+        clone._multi = self._multi
+        clone._build_tree()
+        clone._car_of = dict(self._car_of)
+        return clone
+
+    def empty_copy(self):
+        """Такие же вагоны без груза."""
+        return CarIndex(len(self), self.capacity, self.max_volume, self.max_pallets)
+
+    def fits(self, car, weight, volume=0.0, pallets=0):
+        return (self.loads[car] + weight <= self.capacity
+                and self.volumes[car] + volume <= self.max_volume
+                and self.pallets[car] + pallets <= self.max_pallets)
+
+    def find(self, weight, volume=0.0, pallets=0):
+        """Номер первого вагона, где поместится груз, или -1."""
+        demand = (weight, volume, pallets) if self._multi else weight
+        return self._tree.find_first(demand, lambda car: self.fits(car, weight, volume, pallets))
+
+    def fits_after_removing(self, removed, weight, volume=0.0, pallets=0):
+        """Поместится ли груз, если выгрузить груз removed (без изменений)."""
+        car = self._car_of[id(removed)]
+        if ((self.loads[car] - removed.cargo_weight) + weight <= self.capacity
+                and (self.volumes[car] - removed.volume) + volume <= self.max_volume
+                and (self.pallets[car] - removed.pallets) + pallets <= self.max_pallets):
+            return True
+        return self.find(weight, volume, pallets) >= 0
+
+    def largest(self):
+        """Наибольший остаток вагона по каждому измерению: (вес, объем, паллеты)."""
+        if self._multi:
+            return self._tree.max()
+        return self._tree.max(), self.max_volume, self.max_pallets
+
+    def state(self, car):
+        return self.loads[car], self.volumes[car], self.pallets[car]
+
+    def car_of(self, client):
+        return self._car_of[id(client)]
+
+    def put(self, client, car):
+        """Кладет груз в указанный вагон без проверки места."""
+        self.loads[car] += client.cargo_weight
+        self.volumes[car] += client.volume
+        self.pallets[car] += client.pallets
+        self._car_of[id(client)] = car
+        self._tree.update(car, self._car(car))
+
+    def add(self, client):
+        """Кладет груз в первый подходящий вагон и возвращает его номер."""
+        car = self.find(client.cargo_weight, client.volume, client.pallets)
+        if car < 0:
+            raise ValueError(
+                f"Ни в одном вагоне нет места! "
+                f"Требуется: {client.cargo_weight} т, "
+                f"наибольший остаток вагона: {self.largest()[0]:.2f} т"
+            )
+        self.put(client, car)
+        return car
+
+    def remove(self, client, state=None):
+        """Выгружает груз из его вагона.
+
+        state - значения вагона до загрузки (см. state()); если задано,
+        вагон восстанавливается точно, без ошибок округления.
+        """
+        car = self._car_of.pop(id(client))
+        if state is not None:
+            self.loads[car], self.volumes[car], self.pallets[car] = state
+        else:
+            self.loads[car] -= client.cargo_weight
+            self.volumes[car] -= client.volume
+            self.pallets[car] -= client.pallets
+        self._tree.update(car, self._car(car))
+        return car
+
+    def clear(self):
+        count = len(self)
+        self.loads = [0.0] * count
+        self.volumes = [0.0] * count
+        self.pallets = [0] * count
+        self._build_tree()
+        self._car_of = {}
+
+    def rebuild(self, clients, cars=None):
+        """Раскладывает грузы по вагонам заново.
+
+        cars - сохраненные номера вагонов в порядке clients; без них или
+        при неверном номере груз кладется в первый подходящий вагон.
+        Груз, которому нигде нет места, кладется в вагон с наибольшим
+        остатком. Возвращает список таких грузов.
+        """
+        self.clear()
+        overflow = []
+        for k, client in enumerate(clients):
+            car = cars[k] if cars is not None and k < len(cars) else -1
+            if not 0 <= car < len(self) or not self.fits(car, client.cargo_weight,
+                                                        client.volume, client.pallets):
+                car = self.find(client.cargo_weight, client.volume, client.pallets)
+            if car < 0:
+                car = max(range(len(self)), key=lambda c: self.capacity - self.loads[c])
+                overflow.append(client)
+            self.put(client, car)
+        return overflow
+
+    def key(self):
+        """Состояние вагонов для сравнения поездов."""
+        return tuple(self.loads), tuple(self.volumes), tuple(self.pallets)
+
+
+def order_clients(clients):
+    """Порядок загрузки: сначала VIP, внутри группы - по убыванию веса."""
+    return sorted(clients, key=lambda c: (not c.is_vip, -c.cargo_weight))
+
+
+def first_fit_decreasing(vehicles, clients, progress=None):
+    """Распределяет грузы алгоритмом First Fit Decreasing.
+
+    Груз кладется в первый подходящий из уже использованных транспортов
+    (в порядке начала их использования), иначе - в первый подходящий
+    свободный транспорт из списка vehicles. Оба поиска выполняются по
+    деревьям отрезков, поэтому алгоритм работает за O(C log V).
+
+    Возвращает кортеж (использованный транспорт, не поместившиеся клиенты).
+    """
+    vehicles = list(vehicles)
+    used = []
+    unplaced = []
+
+    multi = is_multidimensional(vehicles, clients)
+    empty = _EMPTY_VECTOR if multi else _EMPTY
+    used_tree = (VectorCapacityTree if multi else CapacityTree)(len(vehicles))
+    free_tree = _capacity_tree(vehicles, multi)
+
+    ordered = order_clients(clients)
+    for done, client in enumerate(ordered):
+        _report(progress, done, len(ordered))
+        if client.is_loaded:
+            unplaced.append(client)
+            continue
+
+        weight, volume, pallets = client.cargo_weight, client.volume, client.pallets
+        demand = (weight, volume, pallets) if multi else weight
+        slot = used_tree.find_first(demand, lambda i: used[i].can_fit(weight, volume, pallets))
+
+        if slot >= 0:
+            vehicle = used[slot]
+        else:
+            index = free_tree.find_first(demand, lambda i: vehicles[i].can_fit(weight, volume, pallets))
+            if index < 0:
+                unplaced.append(client)
+                continue
+            vehicle = vehicles[index]
+            free_tree.update(index, empty)
+            slot = len(used)
+            used.append(vehicle)
+
+        vehicle.load_cargo(client)
+        used_tree.update(slot, _free_space(vehicle, multi))
+
+    return used, unplaced
+
+
+def _find_fitting(keys, weight, fits):
+    """Ищет в отсортированном списке пар (остаток, номер) первую подходящую."""
+    pos = bisect.bisect_left(keys, (weight - _EPS * max(1.0, weight),))
+    while pos < len(keys):
+        if fits(keys[pos][1]):
+            return pos
+        pos += 1
+    return -1
+
+
+def best_fit_decreasing(vehicles, clients, progress=None):
+    """Распределяет грузы алгоритмом Best Fit Decreasing.
+
+    Груз кладется в использованный транспорт с наименьшим подходящим
+    остатком, иначе открывается самый маленький подходящий свободный
+    транспорт. Остатки по весу хранятся в отсортированных списках; при
+    учете объема и паллет просматриваются следующие по весу остатки.
+    """
+    vehicles = list(vehicles)
+    used = []
+    unplaced = []
+
+    open_keys = []
+    free_keys = sorted((_free_space(v, False), i) for i, v in enumerate(vehicles))
+
+    ordered = order_clients(clients)
+    for done, client in enumerate(ordered):
+        _report(progress, done, len(ordered))
+        if client.is_loaded:
+            unplaced.append(client)
+            continue
+
+        weight, volume, pallets = client.cargo_weight, client.volume, client.pallets
+        pos = _find_fitting(open_keys, weight, lambda slot: used[slot].can_fit(weight, volume, pallets))
+
+        if pos >= 0:
+            _, slot = open_keys.pop(pos)
+            vehicle = used[slot]
+        else:
+            pos = _find_fitting(free_keys, weight, lambda i: vehicles[i].can_fit(weight, volume, pallets))
+            if pos < 0:
+                unplaced.append(client)
+                continue
+            _, index = free_keys.pop(pos)
+            vehicle = vehicles[index]
+            slot = len(used)
+            used.append(vehicle)
+
+        vehicle.load_cargo(client)
+        bisect.insort(open_keys, (_free_space(vehicle, False), slot))
+
+    return used, unplaced
+
+
+def _worst_fit_scan(vehicles, ordered, progress=None):
+    """Worst Fit Decreasing с учетом объема, паллет или вагонов.
+
+    Остатки по весу хранятся в отсортированном списке пар (остаток, -номер),
+    самый свободный транспорт - в конце списка. Груз проверяется в
+    транспорте от самого свободного к менее свободным, пока остаток по
+    весу его покрывает.
+    """
+    used = []
+    unplaced = []
+    is_used = [False] * len(vehicles)
+    keys = sorted((_free_space(v, False), -i) for i, v in enumerate(vehicles))
+
+    for done, client in enumerate(ordered):
+        _report(progress, done, len(ordered))
+        if client.is_loaded:
+            unplaced.append(client)
+            continue
+
+        weight, volume, pallets = client.cargo_weight, client.volume, client.pallets
+        lowest = bisect.bisect_left(keys, (weight - _EPS * max(1.0, weight),))
+        pos = len(keys) - 1
+        while pos >= lowest and not vehicles[-keys[pos][1]].can_fit(weight, volume, pallets):
+            pos -= 1
+        if pos < lowest:
+            unplaced.append(client)
+            continue
+
+        index = -keys.pop(pos)[1]
+        vehicle = vehicles[index]
+        vehicle.load_cargo(client)
+        bisect.insort(keys, (_free_space(vehicle, False), -index))
+        if not is_used[index]:
+            is_used[index] = True
+            used.append(vehicle)
+
+    return used, unplaced
+
+
+def worst_fit_decreasing(vehicles, clients, progress=None):
+    """Распределяет грузы алгоритмом Worst Fit Decreasing.
+
+    Каждый груз кладется в транспорт с наибольшим остатком, поэтому
+    нагрузка распределяется по всему парку равномерно. Если при учете
+    объема и паллет или вагонов груз не помещается в транспорт с
+    наибольшим остатком по весу, берется следующий по остатку подходящий.
+    """
+    vehicles = list(vehicles)
+    ordered = order_clients(clients)
+    if is_multidimensional(vehicles, clients) or any(v.cars is not None for v in vehicles):
+        return _worst_fit_scan(vehicles, ordered, progress)
+
+    used = []
+    unplaced = []
+    is_used = [False] * len(vehicles)
+    heap = [(-_free_space(v, False), i) for i, v in enumerate(vehicles)]
+    heapq.heapify(heap)
+
+    for done, client in enumerate(ordered):
+        _report(progress, done, len(ordered))
+        if client.is_loaded or not heap:
+            unplaced.append(client)
+            continue
+
+        # Учитывается только вес: если груз не помещается в самый
+        # свободный транспорт, он не поместится никуда
+        index = heap[0][1]
+        vehicle = vehicles[index]
+        if not vehicle.can_fit(client.cargo_weight, client.volume, client.pallets):
+            unplaced.append(client)
+            continue
+
+        vehicle.load_cargo(client)
+        heapq.heapreplace(heap, (-_free_space(vehicle, False), index))
+        if not is_used[index]:
+            is_used[index] = True
+            used.append(vehicle)
+
+    return used, unplaced
+
+
+def next_fit(vehicles, clients, progress=None):
+    """Распределяет грузы алгоритмом Next Fit.
+
+    Грузы обрабатываются в порядке поступления (VIP первыми), загружается
+    только текущий транспорт. Если груз не помещается, текущий транспорт
+    закрывается и берется следующий подходящий из списка.
+    """
+    vehicles = list(vehicles)
+    used = []
+    unplaced = []
+
+    multi = is_multidimensional(vehicles, clients)
+    empty = _EMPTY_VECTOR if multi else _EMPTY
+    free_tree = _capacity_tree(vehicles, multi)
+    current = None
+    closed_up_to = 0  # все транспорты левее этого номера уже закрыты
+
+    ordered = sorted(clients, key=lambda c: not c.is_vip)
+    for done, client in enumerate(ordered):
+        _report(progress, done, len(ordered))
+        if client.is_loaded:
+            unplaced.append(client)
+            continue
+
+        weight, volume, pallets = client.cargo_weight, client.volume, client.pallets
+        if current is None or not current.can_fit(weight, volume, pallets):
+            demand = (weight, volume, pallets) if multi else weight
+            index = free_tree.find_first(demand, lambda i: vehicles[i].can_fit(weight, volume, pallets))
+            if index < 0:
+                unplaced.append(client)
+                continue
+            for skipped in range(closed_up_to, index + 1):
+                free_tree.update(skipped, empty)
+            closed_up_to = index + 1
+            current = vehicles[index]
+            used.append(current)
+
+        current.load_cargo(client)
+
+    return used, unplaced
+
+
+EXACT_MAX_CLIENTS = 20
+EXACT_MAX_NODES = 200000
+
+
+def branch_and_bound(vehicles, clients, progress=None):
+    """Точное распределение методом ветвей и границ для небольших задач.
+
+    Минимизирует лексикографически: число незагруженных VIP, число
+    незагруженных клиентов, число использованного транспорта и
+    неиспользованную грузоподъемность в нем. Перебор ограничен
+    EXACT_MAX_NODES узлами; первым находится решение First Fit Decreasing.
+    """
+    vehicles = list(vehicles)
+    items = [c for c in order_clients(clients) if not c.is_loaded]
+    unplaced = [c for c in order_clients(clients) if c.is_loaded]
+
+    check_strategy('exact', len(items))
+
+    n = len(items)
+    weights = [c.cargo_weight for c in items]
+    vips = [c.is_vip for c in items]
+    volumes = [c.volume for c in items]
+    pallets = [c.pallets for c in items]
+    caps = [v.capacity for v in vehicles]
+    loads = [v.current_load for v in vehicles]
+    max_vols = [v.max_volume for v in vehicles]
+    vols = [v.current_volume for v in vehicles]
+    max_pals = [v.max_pallets for v in vehicles]
+    pals = [v.current_pallets for v in vehicles]
+    cars = [v.cars.copy() if v.cars is not None else None for v in vehicles]
+
+    def state_of(j):
+        state = (caps[j], loads[j], max_vols[j], vols[j], max_pals[j], pals[j])
+        return state if cars[j] is None else (state, cars[j].key())
+
+    def place_of(j, i):
+        """Вагон для груза i в транспорте j (0 без вагонов) или -1, если места нет."""
+        if (loads[j] + weights[i] > caps[j] or vols[j] + volumes[i] > max_vols[j]
+                or pals[j] + pallets[i] > max_pals[j]):
+            return -1
+        return 0 if cars[j] is None else cars[j].find(weights[i], volumes[i], pallets[i])
+
+    def put(j, i, car):
+        """Кладет груз i в транспорт j и возвращает прежнее состояние."""
+        old = (loads[j], vols[j], pals[j])
+        loads[j] += weights[i]
+        vols[j] += volumes[i]
+        pals[j] += pallets[i]
+        if cars[j] is not None:
+            old += (cars[j].state(car),)
+            cars[j].put(items[i], car)
+        return old
+
+    def restore(j, i, old):
+        loads[j], vols[j], pals[j] = old[:3]
+        if cars[j] is not None:
+            cars[j].remove(items[i], old[3])
+
+    # Одинаковые свободные транспорты взаимозаменяемы - перебираем классы,
+    # упорядоченные по первому вхождению в парк
+    classes = {}
+    for i in range(len(vehicles)):
+        classes.setdefault(state_of(i), []).append(i)
+    class_list = list(classes.values())
+    class_next = [0] * len(class_list)
+
+    assignment = [-1] * n
+    open_order = []
+    best = {'cost': (n + 1,), 'assignment': None, 'open_order': None}
+    nodes = [0]
+
+    def search(i, unplaced_vip, unplaced_count):
+        nodes[0] += 1
+        if nodes[0] > EXACT_MAX_NODES:
+            return
+        _report(progress, nodes[0], EXACT_MAX_NODES)
+        if (unplaced_vip, unplaced_count, len(open_order)) > best['cost'][:3]:
+            return
+
+        if i == n:
+            wasted = sum(caps[j] - loads[j] for j in open_order)
+            cost = (unplaced_vip, unplaced_count, len(open_order), wasted)
+            if cost < best['cost']:
+                best['cost'] = cost
+                best['assignment'] = assignment.copy()
+                best['open_order'] = open_order.copy()
+            return
+
+        tried = set()
+        for j in open_order.copy():
+            state = state_of(j)
+            if state in tried:
+                continue
+            car = place_of(j, i)
+            if car < 0:
+                continue
+            tried.add(state)
+            old = put(j, i, car)
+            assignment[i] = j
+            search(i + 1, unplaced_vip, unplaced_count)
+            restore(j, i, old)
+
+        for k, members in enumerate(class_list):
+            if class_next[k] >= len(members):
+                continue
+            j = members[class_next[k]]
+            car = place_of(j, i)
+            if car < 0:
+                continue
+            class_next[k] += 1
+            open_order.append(j)
+            old = put(j, i, car)
+            assignment[i] = j
+            search(i + 1, unplaced_vip, unplaced_count)
+            restore(j, i, old)
+            open_order.pop()
+            class_next[k] -= 1
+
+        assignment[i] = -1
+        search(i + 1, unplaced_vip + vips[i], unplaced_count + 1)
+
+    search(0, 0, 0)
+
+    for i, client in enumerate(items):
+        j = best['assignment'][i]
+        if j < 0:
+            unplaced.append(client)
+        else:
+            vehicles[j].load_cargo(client)
+
+    return [vehicles[j] for j in best['open_order']], unplaced
+
+
+# Реестр стратегий: код -> (название, функция)
+STRATEGIES = {
+    'ffd': ("Первый подходящий (FFD)", first_fit_decreasing),
+    'bfd': ("Наилучший подходящий (BFD)", best_fit_decreasing),
+    'wfd': ("Наименее загруженный (балансировка)", worst_fit_decreasing),
+    'nf': ("Следующий подходящий (поток)", next_fit),
+    'exact': ("Точный (метод ветвей и границ)", branch_and_bound),
+}
+
+DEFAULT_STRATEGY = 'ffd'
+
+
+def get_strategy(code: str):
+    """Возвращает функцию стратегии по коду."""
+    if code not in STRATEGIES:
+        raise ValueError(
+            f"Неизвестная стратегия '{code}'. Доступны: {', '.join(STRATEGIES)}"
+        )
+    return STRATEGIES[code][1]
+
+
+def check_strategy(code: str, clients_count: int):
+    """Проверяет стратегию и размер задачи до того, как данные будут изменены.
+
+    clients_count - число грузов, которые стратегия будет распределять.
+    """
+    get_strategy(code)
+    if code == 'exact' and clients_count > EXACT_MAX_CLIENTS:
+        raise ValueError(
+            f"Точный метод рассчитан не более чем на {EXACT_MAX_CLIENTS} клиентов, "
+            f"получено {clients_count}"
+        )
+
+
+class PackingResult:
+    """Результат работы стратегии распределения."""
+
+    def __init__(self, strategy, vehicles, used_vehicles, unplaced, elapsed):
+        self.strategy = strategy
+        self.used_vehicles = used_vehicles
+        self.unplaced = unplaced
+        self.elapsed = elapsed  # Время решения в секундах
+        self.improvement = None  # ImprovementResult, если было улучшение
+
+        self.fleet_capacity = sum(v.capacity for v in vehicles)
+        self.used_capacity = sum(v.capacity for v in used_vehicles)
+        self.total_load = sum(v.current_load for v in used_vehicles)
+
+    @property
+    def strategy_title(self):
+        return STRATEGIES[self.strategy][0]
+
+    def get_fleet_fill(self):
+        """Процент загрузки всего парка."""
+        return (self.total_load / self.fleet_capacity * 100) if self.fleet_capacity > 0 else 0
+
+    def get_used_fill(self):
+        """Процент загрузки использованного транспорта."""
+        return (self.total_load / self.used_capacity * 100) if self.used_capacity > 0 else 0
+
+    def refresh_usage(self):
+        """Пересчитывает использованный транспорт после перемещений улучшения."""
+        used = [v for v in self.used_vehicles if v.clients_list]
+        seen = {id(v) for v in used}
+        for move in self.improvement.moves if self.improvement is not None else ():
+            target = move.target
+            if target is not None and id(target) not in seen and target.clients_list:
+                seen.add(id(target))
+                used.append(target)
+
+        self.used_vehicles = used
+        self.used_capacity = sum(v.capacity for v in used)
+        self.total_load = sum(v.current_load for v in used)
+
+    def __str__(self):
+        return (f"{self.strategy_title}: "
+                f"транспорта {len(self.used_vehicles)}, "
+                f"загрузка {self.get_used_fill():.1f}% (парк {self.get_fleet_fill():.1f}%), "
+                f"время {self.elapsed * 1000:.1f} мс")
+
+
+def pack(vehicles, clients, strategy: str = DEFAULT_STRATEGY, progress=None):
+    """Распределяет грузы выбранной стратегией и замеряет время решения."""
+    solve = get_strategy(strategy)
+    vehicles = list(vehicles)
+
+    started = time.perf_counter()
+    used, unplaced = solve(vehicles, clients, progress=progress)
+    elapsed = time.perf_counter() - started
+
+    return PackingResult(strategy, vehicles, used, unplaced, elapsed)
+
+
+class _PlannedClient:
+    """Копия клиента для расчета плана."""
+
+    __slots__ = ('index', 'cargo_weight', 'is_vip', 'is_loaded', 'volume', 'pallets')
+
+    def __init__(self, index, cargo_weight, is_vip, is_loaded, volume=0.0, pallets=0):
+        self.index = index
+        self.cargo_weight = cargo_weight
+        self.is_vip = is_vip
+        self.is_loaded = is_loaded
+        self.volume = volume
+        self.pallets = pallets
+
+
+class _PlannedVehicle:
+    """Копия транспорта для расчета плана: загрузки только записываются."""
+
+    __slots__ = ('index', 'capacity', 'current_load', 'max_volume', 'current_volume',
+                 'max_pallets', 'current_pallets', 'cars', 'clients_list', '_loads')
+
+    def __init__(self, index, capacity, current_load, loads, max_volume=UNLIMITED,
+                 current_volume=0.0, max_pallets=UNLIMITED, current_pallets=0, cars=None):
+        self.index = index
+        self.capacity = capacity
+        self.current_load = current_load
+        self.max_volume = max_volume
+        self.current_volume = current_volume
+        self.max_pallets = max_pallets
+        self.current_pallets = current_pallets
+        self.cars = cars  # Копия CarIndex поезда
+        self.clients_list = []  # Только грузы, загруженные по плану
+        self._loads = loads
+
+    def can_fit(self, weight, volume=0.0, pallets=0):
+        return (self.current_load + weight <= self.capacity
+                and self.current_volume + volume <= self.max_volume
+                and self.current_pallets + pallets <= self.max_pallets
+                and (self.cars is None or self.cars.find(weight, volume, pallets) >= 0))
+
+    def load_cargo(self, client):
+        if self.cars is not None:
+            self.cars.add(client)
+        self.current_load += client.cargo_weight
+        self.current_volume += client.volume
+        self.current_pallets += client.pallets
+        self.clients_list.append(client)
+        client.is_loaded = True
+        self._loads.append((self.index, client.index))
+
+
+class Move:
+    """Одно изменение плана: загрузка груза (source is None), выгрузка
+    (target is None) или перенос из source в target."""
+
+    def __init__(self, client, source, target):
+        self.client = client
+        self.source = source
+        self.target = target
+
+    def __str__(self):
+        if self.source is None:
+            return f"{self.client.name}: загрузить в {self.target.vehicle_id}"
+        if self.target is None:
+            return f"{self.client.name}: выгрузить из {self.source.vehicle_id}"
+        return f"{self.client.name}: перенести из {self.source.vehicle_id} в {self.target.vehicle_id}"
+
+
+# Сколько транспортов с наибольшим остатком просматривается при поиске
+# переноса, освобождающего место для груза
+EVICTION_SEARCH = 32
+
+
+def plan_moves(vehicles, clients, evict: bool = True):
+    """Дораспределяет грузы, не пересчитывая весь план.
+
+    Текущее распределение сохраняется. Каждый груз из clients, который еще
+    не загружен (VIP первыми, по убыванию веса), кладется в загруженный
+    транспорт с наименьшим подходящим остатком, иначе - в самый маленький
+    подходящий пустой. Если места нет нигде, при evict=True ищется один
+    перенос другого груза, освобождающий место.
+
+    Транспорт не изменяется (нужны атрибуты capacity, current_load,
+    ограничения объема и паллет и clients_list). Возвращает кортеж (список Move по порядку применения,
+    не поместившиеся клиенты).
+    """
+    pending = [c for c in order_clients(clients) if not c.is_loaded]
+    if not pending:
+        return [], []
+
+    vehicles = list(vehicles)
+    caps = [v.capacity for v in vehicles]
+    loads = [v.current_load for v in vehicles]
+    max_vols = [v.max_volume for v in vehicles]
+    vols = [v.current_volume for v in vehicles]
+    max_pals = [v.max_pallets for v in vehicles]
+    pals = [v.current_pallets for v in vehicles]
+    counts = [len(v.clients_list) for v in vehicles]
+    copied_cars = {}  # номер поезда -> копия CarIndex, изменяемая планом
+    added = {}      # номер транспорта -> грузы, добавленные планом
+    moved_out = set()  # id грузов, перенесенных планом из их транспорта
+
+    open_keys = sorted((caps[i] - loads[i], i) for i in range(len(vehicles)) if counts[i])
+    free_keys = sorted((caps[i] - loads[i], i) for i in range(len(vehicles)) if not counts[i])
+
+    def keys_of(i):
+        return open_keys if counts[i] else free_keys
+
+    def cars_of(i, write=False):
+        cars = copied_cars.get(i)
+        if cars is None:
+            cars = vehicles[i].cars
+            if write and cars is not None:
+                cars = copied_cars[i] = cars.copy()
+        return cars
+
+    def find(client, exclude=-1):
+        """Номер транспорта по правилу наилучшего подходящего или -1."""
+        weight, volume, pallets = client.cargo_weight, client.volume, client.pallets
+
+        def fits(i):
+            return (i != exclude and loads[i] + weight <= caps[i]
+                    and vols[i] + volume <= max_vols[i] and pals[i] + pallets <= max_pals[i]
+                    and (cars_of(i) is None or cars_of(i).find(weight, volume, pallets) >= 0))
+        for keys in (open_keys, free_keys):
+            pos = _find_fitting(keys, weight, fits)
+            if pos >= 0:
+                return keys[pos][1]
+        return -1
+
+    def change(i, delta_count, client):
+        keys = keys_of(i)
+        del keys[bisect.bisect_left(keys, (caps[i] - loads[i], i))]
+        cars = cars_of(i, write=True)
+        if delta_count > 0:
+            loads[i] += client.cargo_weight
+            vols[i] += client.volume
+            pals[i] += client.pallets
+            if cars is not None:
+                cars.add(client)
+        else:
+            loads[i] -= client.cargo_weight
+            vols[i] -= client.volume
+            pals[i] -= client.pallets
+            if cars is not None:
+                cars.remove(client)
+        counts[i] += delta_count
+        bisect.insort(keys_of(i), (caps[i] - loads[i], i))
+
+    def contents(i):
+        current = [c for c in vehicles[i].clients_list if id(c) not in moved_out]
+        return current + added.get(i, [])
+
+    moves = []
+    unplaced = []
+
+    def place(client, source, target):
+        if source >= 0:
+            change(source, -1, client)
+            moved_out.add(id(client))
+            if client in added.get(source, ()):
+                added[source].remove(client)
+        change(target, 1, client)
+        added.setdefault(target, []).append(client)
+        moves.append(Move(client, vehicles[source] if source >= 0 else None, vehicles[target]))
+
+    def evict_for(client):
+        """Ищет перенос одного груза, после которого client помещается."""
+        weight = client.cargo_weight
+        for _, i in reversed(open_keys[-EVICTION_SEARCH:]):
+            deficit = weight - (caps[i] - loads[i])
+            for other in sorted(contents(i), key=lambda c: c.cargo_weight):
+                if other.cargo_weight < deficit - _EPS * max(1.0, weight):
+                    continue
+                if (loads[i] - other.cargo_weight + weight > caps[i]
+                        or vols[i] - other.volume + client.volume > max_vols[i]
+                        or pals[i] - other.pallets + client.pallets > max_pals[i]):
+                    continue
+                cars = cars_of(i)
+                if cars is not None and not cars.fits_after_removing(other, weight, client.volume,
+                                                                     client.pallets):
+                    continue
+                target = find(other, exclude=i)
+                if target >= 0:
+                    place(other, i, target)
+                    return i
+        return -1
+
+    for client in pending:
+        target = find(client)
+        if target < 0 and evict:
+            target = evict_for(client)
+        if target < 0:
+            unplaced.append(client)
+            continue
+        place(client, -1, target)
+
+    return moves, unplaced
+
+
+# Время локального поиска по умолчанию, секунды
+IMPROVE_TIME_BUDGET = 0.5
+
+
+class ImprovementResult:
+    """Итог локального поиска: перемещения и насколько улучшился план."""
+
+    def __init__(self, moves, vehicles_before, vehicles_after, wasted_before, wasted_after, elapsed):
+        self.moves = moves
+        self.vehicles_before = vehicles_before
+        self.vehicles_after = vehicles_after
+        self.wasted_before = wasted_before  # Свободная грузоподъемность использованного транспорта
+        self.wasted_after = wasted_after
+        self.elapsed = elapsed
+
+    def __str__(self):
+        return (f"локальный поиск: транспорта {self.vehicles_before} -> {self.vehicles_after}, "
+                f"недогруз {self.wasted_before:.1f} -> {self.wasted_after:.1f} т, "
+                f"перемещений {len(self.moves)}, время {self.elapsed * 1000:.1f} мс")
+
+
+class _Improver:
+    """Состояние локального поиска: копии загрузок и содержимого транспорта.
+
+    Все изменения выполняются теми же операциями над числами, что и у
+    транспорта, поэтому найденные перемещения проходят его проверки.
+    """
+
+    def __init__(self, vehicles):
+        self.vehicles = list(vehicles)
+        self.caps = [v.capacity for v in self.vehicles]
+        self.loads = [v.current_load for v in self.vehicles]
+        self.max_vols = [v.max_volume for v in self.vehicles]
+        self.vols = [v.current_volume for v in self.vehicles]
+        self.max_pals = [v.max_pallets for v in self.vehicles]
+        self.pals = [v.current_pallets for v in self.vehicles]
+        self.cars = [v.cars for v in self.vehicles]
+        self._own_cars = set()  # Поезда, чьи CarIndex уже скопированы
+        self.contents = [list(v.clients_list) for v in self.vehicles]
+        self.index = {id(v): i for i, v in enumerate(self.vehicles)}
+        self.moves = []
+        self.touched = None  # Сохраненное состояние для отката попытки
+
+        n = len(self.vehicles)
+        self.open_keys = sorted((self.caps[i] - self.loads[i], i) for i in range(n) if self.contents[i])
+        self.empty_keys = sorted((self.caps[i], i) for i in range(n) if not self.contents[i])
+
+    def used_count(self):
+        return len(self.open_keys)
+
+    def wasted(self):
+        return sum(free for free, _ in self.open_keys)
+
+    def _unkey(self, i):
+        if self.contents[i]:
+            keys, key = self.open_keys, (self.caps[i] - self.loads[i], i)
+        else:
+            keys, key = self.empty_keys, (self.caps[i], i)
+        del keys[bisect.bisect_left(keys, key)]
+
+    def _key(self, i):
+        if self.contents[i]:
+            bisect.insort(self.open_keys, (self.caps[i] - self.loads[i], i))
+        else:
+            bisect.insort(self.empty_keys, (self.caps[i], i))
+
+    def _change(self, i, client, add):
+        if self.touched is not None and i not in self.touched:
+            cars = self.cars[i].copy() if self.cars[i] is not None else None
+            self.touched[i] = (self.loads[i], self.vols[i], self.pals[i], list(self.contents[i]), cars)
+        self._unkey(i)
+        cars = self._writable_cars(i)
+        if add:
+            self.loads[i] += client.cargo_weight
+            self.vols[i] += client.volume
+            self.pals[i] += client.pallets
+            self.contents[i].append(client)
+            if cars is not None:
+                cars.add(client)
+        else:
+            self.loads[i] -= client.cargo_weight
+            self.vols[i] -= client.volume
+            self.pals[i] -= client.pallets
+            self.contents[i].remove(client)
+            if cars is not None:
+                cars.remove(client)
+        self._key(i)
+
+    def _writable_cars(self, i):
+        """CarIndex поезда i, который можно менять (копия при первой записи)."""
+        if self.cars[i] is not None and i not in self._own_cars:
+            self.cars[i] = self.cars[i].copy()
+            self._own_cars.add(i)
+        return self.cars[i]
+
+    def transfer(self, client, source, target):
+        """Выгрузка из source и/или загрузка в target (-1 - нет)."""
+        if source >= 0:
+            self._change(source, client, False)
+        if target >= 0:
+            self._change(target, client, True)
+        self.moves.append(Move(client,
+                               self.vehicles[source] if source >= 0 else None,
+                               self.vehicles[target] if target >= 0 else None))
+
+    def begin(self):
+        self.touched = {}
+        return len(self.moves)
+
+    def rollback(self, mark):
+        for i, (load, volume, pallets, contents, cars) in self.touched.items():
+            self._unkey(i)
+            self.loads[i] = load
+            self.vols[i] = volume
+            self.pals[i] = pallets
+            self.contents[i] = contents
+            self.cars[i] = cars
+            if cars is not None:
+                self._own_cars.add(i)
+            self._key(i)
+        del self.moves[mark:]
+        self.touched = None
+
+    def commit(self):
+        self.touched = None
+
+    def fits(self, i, client):
+        cars = self.cars[i]
+        return (self.loads[i] + client.cargo_weight <= self.caps[i]
+                and self.vols[i] + client.volume <= self.max_vols[i]
+                and self.pals[i] + client.pallets <= self.max_pals[i]
+                and (cars is None or cars.find(client.cargo_weight, client.volume, client.pallets) >= 0))
+
+    def fits_exchange(self, i, removed, added):
+        """Поместится ли added в i после выгрузки removed."""
+        cars = self.cars[i]
+        return ((self.loads[i] - removed.cargo_weight) + added.cargo_weight <= self.caps[i]
+                and (self.vols[i] - removed.volume) + added.volume <= self.max_vols[i]
+                and (self.pals[i] - removed.pallets) + added.pallets <= self.max_pals[i]
+                and (cars is None or cars.fits_after_removing(removed, added.cargo_weight,
+                                                              added.volume, added.pallets)))
+
+    def best_fit(self, client, exclude):
+        """Загруженный транспорт с наименьшим подходящим остатком или -1."""
+        pos = _find_fitting(self.open_keys, client.cargo_weight,
+                            lambda i: i != exclude and self.fits(i, client))
+        return self.open_keys[pos][1] if pos >= 0 else -1
+
+    def swap(self, client, i):
+        """Меняет client из i на более легкий груз другого транспорта."""
+        weight = client.cargo_weight
+        for _, j in reversed(self.open_keys[-EVICTION_SEARCH:]):
+            if j == i:
+                continue
+            for other in sorted(self.contents[j], key=lambda c: c.cargo_weight):
+                if other.cargo_weight >= weight:
+                    break
+                if not self.fits_exchange(j, other, client):
+                    continue
+                if not self.fits_exchange(i, client, other):
+                    continue
+                self.transfer(other, j, -1)
+                self.transfer(client, i, j)
+                self.transfer(other, -1, i)
+                return True
+        return False
+
+    def try_empty(self, i, deadline):
+        """Пытается разгрузить транспорт i по другим использованным."""
+        mark = self.begin()
+        swaps = 2 * len(self.contents[i])
+        while self.contents[i]:
+            if time.perf_counter() > deadline:
+                break
+            client = max(self.contents[i], key=lambda c: c.cargo_weight)
+            target = self.best_fit(client, exclude=i)
+            if target >= 0:
+                self.transfer(client, i, target)
+            elif swaps > 0 and self.swap(client, i):
+                swaps -= 1
+            else:
+                break
+        if self.contents[i]:
+            self.rollback(mark)
+            return False
+        self.commit()
+        return True
+
+    def try_downsize(self, i):
+        """Переносит все грузы i в один пустой транспорт меньшей грузоподъемности."""
+        pos = bisect.bisect_left(self.empty_keys, (self.loads[i] - _EPS * max(1.0, self.loads[i]),))
+        for capacity, e in self.empty_keys[pos:pos + EVICTION_SEARCH]:
+            if capacity >= self.caps[i]:
+                return False
+            load, volume, pallets = self.loads[e], self.vols[e], self.pals[e]
+            cars = self.cars[e].copy() if self.cars[e] is not None else None
+            for client in self.contents[i]:
+                load += client.cargo_weight
+                volume += client.volume
+                pallets += client.pallets
+                if load > capacity or volume > self.max_vols[e] or pallets > self.max_pals[e]:
+                    break
+                if cars is not None:
+                    car = cars.find(client.cargo_weight, client.volume, client.pallets)
+                    if car < 0:
+                        break
+                    cars.put(client, car)
+            else:
+                for client in list(self.contents[i]):
+                    self.transfer(client, i, e)
+                return True
+        return False
+
+
+def improve_packing(vehicles, time_budget: float = IMPROVE_TIME_BUDGET):
+    """Улучшает готовое распределение локальным поиском.
+
+    Сначала пытается разгрузить наименее загруженный транспорт, перенося
+    его грузы в другой использованный (move) или меняя их на более легкие
+    (swap). Затем переносит содержимое транспорта целиком в пустой
+    транспорт меньшей грузоподъемности (relocate). Грузы только
+    перемещаются, поэтому загруженные VIP-клиенты остаются загруженными.
+
+    Транспорт не изменяется: возвращается ImprovementResult, перемещения
+    которого применяются по порядку.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget
+    state = _Improver(vehicles)
+    vehicles_before = state.used_count()
+    wasted_before = state.wasted()
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for _, i in sorted((state.loads[i], i) for _, i in state.open_keys):
+            if time.perf_counter() > deadline:
+                break
+            if state.contents[i] and state.try_empty(i, deadline):
+                improved = True
+
+    for _, i in sorted(((-state.caps[i], i) for _, i in state.open_keys)):
+        if time.perf_counter() > deadline:
+            break
+        state.try_downsize(i)
+
+    return ImprovementResult(state.moves, vehicles_before, state.used_count(),
+                             wasted_before, state.wasted(), time.perf_counter() - started)
+
+
+# Способы разбиения задачи для параллельного расчета: код -> название
+PARTITIONS = {
+    'band': "По диапазонам грузоподъемности",
+    'type': "По типу транспорта",
+}
+DEFAULT_PARTITION = 'band'
+
+# Меньшие парки считаются последовательно: запуск процессов дороже расчета
+PARALLEL_MIN_VEHICLES = 2000
+
+
+def _vehicle_fields(vehicle):
+    return (vehicle.capacity, vehicle.current_load, vehicle.max_volume,
+            vehicle.current_volume, vehicle.max_pallets, vehicle.current_pallets, vehicle.cars)
+
+
+def _client_fields(client):
+    return (client.cargo_weight, client.is_vip, client.is_loaded, client.volume, client.pallets)
+
+
+def _solve_part(strategy, vehicles, clients):
+    """Рассчитывает часть задачи в процессе пула.
+
+    vehicles - кортежи аргументов _PlannedVehicle после loads
+    (грузоподъемность, загрузка, объем, занятый объем, паллеты, занятые
+    паллеты, вагоны), clients - кортежи (вес, VIP, загружен, объем, паллеты). Возвращает загрузки, использованный транспорт и
+    не поместившихся клиентов в номерах внутри части.
+    """
+    loads = []
+    bins = [_PlannedVehicle(i, capacity, load, loads, *limits)
+            for i, (capacity, load, *limits) in enumerate(vehicles)]
+    items = [_PlannedClient(i, *fields) for i, fields in enumerate(clients)]
+    used, unplaced = get_strategy(strategy)(bins, items)
+    return loads, [v.index for v in used], [c.index for c in unplaced]
+
+
+class PackingPlan:
+    """Распределение, рассчитанное на копиях данных.
+
+    Конструктор копирует числа из транспорта и клиентов и вызывается в
+    потоке, который владеет объектами. solve() работает только с копиями
+    и может выполняться в рабочем потоке. apply() снова в потоке-владельце
+    загружает транспорт в том же порядке, что и стратегия, поэтому
+    результат совпадает с pack().
+
+    При reset=True план считается так, будто весь транспорт из vehicles
+    предварительно разгружен (транспорт должен иметь clients_list).
+
+    При workers > 1 большой парк делится на группы (см. PARTITIONS),
+    клиенты распределяются между группами пропорционально их свободной
+    грузоподъемности, и группы считаются параллельно в пуле процессов.
+    Не поместившиеся в своей группе клиенты затем размещаются той же
+    стратегией по всему парку. Группы не видят друг друга, поэтому
+    загрузка бывает хуже, чем при обычном расчете; разницу показывает
+    bench.py --workers.
+
+    При improve > 0 после расчета выполняется локальный поиск
+    (improve_packing) с этим бюджетом времени в секундах; его перемещения
+    возвращаются в PackingResult.improvement и применяются после apply().
+    Локальный поиск видит только грузы, загруженные по плану, поэтому
+    используется вместе с reset=True.
+    """
+
+    def __init__(self, vehicles, clients, strategy: str = DEFAULT_STRATEGY, reset: bool = False,
+                 workers: int = 1, partition: str = DEFAULT_PARTITION, improve: float = 0.0):
+        get_strategy(strategy)
+        if partition not in PARTITIONS:
+            raise ValueError(
+                f"Неизвестный способ разбиения '{partition}'. Доступны: {', '.join(PARTITIONS)}"
+            )
+        if workers < 1:
+            raise ValueError("Число процессов должно быть положительным")
+        self.strategy = strategy
+        self.workers = workers
+        self.partition = partition
+        self.improve = improve
+        self.improvement = None
+        self.vehicles = list(vehicles)
+        self.clients = list(clients)
+        self.loads = []  # Пары (номер транспорта, номер клиента) в порядке загрузки
+        self.used = None
+        self.unplaced = None
+        self.elapsed = None
+
+        if reset:
+            carried = {id(c) for v in self.vehicles for c in v.clients_list}
+            self._vehicles = [_PlannedVehicle(i, v.capacity, 0.0, self.loads,
+                                              v.max_volume, 0.0, v.max_pallets, 0,
+                                              v.cars.empty_copy() if v.cars is not None else None)
+                              for i, v in enumerate(self.vehicles)]
+            self._clients = [_PlannedClient(i, c.cargo_weight, c.is_vip,
+                                            c.is_loaded and id(c) not in carried,
+                                            c.volume, c.pallets)
+                             for i, c in enumerate(self.clients)]
+        else:
+            self._vehicles = [_PlannedVehicle(i, v.capacity, v.current_load, self.loads,
+                                              v.max_volume, v.current_volume,
+                                              v.max_pallets, v.current_pallets,
+                                              v.cars.copy() if v.cars is not None else None)
+                              for i, v in enumerate(self.vehicles)]
+            self._clients = [_PlannedClient(i, c.cargo_weight, c.is_vip, c.is_loaded,
+                                            c.volume, c.pallets)
+                             for i, c in enumerate(self.clients)]
+        check_strategy(strategy, sum(not c.is_loaded for c in self._clients))
+
+    def solve(self, progress=None):
+        """Рассчитывает план. Объекты программы не изменяются."""
+        if (self.workers > 1 and self.strategy != 'exact'
+                and len(self._vehicles) >= PARALLEL_MIN_VEHICLES):
+            self._solve_parallel(progress)
+        else:
+            self._solve_serial(progress)
+
+        if self.improve > 0:
+            self.improvement = improve_packing(self._vehicles, self.improve)
+        return self
+
+    def _solve_serial(self, progress=None):
+        solve = get_strategy(self.strategy)
+
+        started = time.perf_counter()
+        used, unplaced = solve(self._vehicles, self._clients, progress=progress)
+        self.elapsed = time.perf_counter() - started
+
+        self.used = [v.index for v in used]
+        self.unplaced = [c.index for c in unplaced]
+
+    def _partition(self):
+        """Делит транспорт на группы и распределяет между ними клиентов.
+
+        Возвращает список пар (номера транспорта, номера клиентов).
+        """
+        if self.partition == 'type':
+            by_type = {}
+            for vehicle, original in zip(self._vehicles, self.vehicles):
+                by_type.setdefault(original.__class__.__name__, []).append(vehicle.index)
+            groups = list(by_type.values())
+        else:
+            by_capacity = sorted(range(len(self._vehicles)), key=lambda i: self._vehicles[i].capacity)
+            size = -(-len(by_capacity) // self.workers)
+            # Внутри группы транспорт идет в исходном порядке, как при обычном расчете
+            groups = [sorted(by_capacity[start:start + size])
+                      for start in range(0, len(by_capacity), size)]
+
+        free = [sum(self._vehicles[i].capacity - self._vehicles[i].current_load for i in group)
+                for group in groups]
+        largest = [max(self._vehicles[i].capacity - self._vehicles[i].current_load for i in group)
+                   for group in groups]
+        assigned = [0.0] * len(groups)
+        members = [[] for _ in groups]
+
+        # Каждый груз - в ту группу, где он еще помещается в самый большой
+        # транспорт и которая после него будет заполнена меньше остальных
+        for client in order_clients(self._clients):
+            weight = client.cargo_weight
+            best = -1
+            for g in range(len(groups)):
+                if largest[g] < weight or free[g] <= 0:
+                    continue
+                if best < 0 or (assigned[g] + weight) / free[g] < (assigned[best] + weight) / free[best]:
+                    best = g
+            if best >= 0:
+                assigned[best] += weight
+                members[best].append(client.index)
+
+        # Клиенты без группы останутся на этап доразмещения
+        return list(zip(groups, members))
+
+    def _solve_parallel(self, progress=None):
+        # Модули пула процессов грузятся десятки миллисекунд, поэтому
+        # импортируются только здесь, а не при запуске программы
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        started = time.perf_counter()
+        parts = self._partition()
+
+        pool = ProcessPoolExecutor(max_workers=min(self.workers, len(parts)),
+                                   mp_context=multiprocessing.get_context('spawn'))
+        try:
+            futures = [
+                pool.submit(_solve_part, self.strategy,
+                            [_vehicle_fields(self._vehicles[i]) for i in group],
+                            [_client_fields(self._clients[i]) for i in members])
+                for group, members in parts
+            ]
+            pending = set(futures)
+            while pending:
+                if progress is not None:
+                    progress(len(futures) - len(pending), len(futures))
+                _, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            results = [future.result() for future in futures]
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        # Собираем части в порядке групп, чтобы результат не зависел от
+        # того, какой процесс закончил первым
+        used = []
+        leftovers = set(range(len(self._clients)))
+        for (group, members), (loads, part_used, part_unplaced) in zip(parts, results):
+            for vehicle_index, client_index in loads:
+                client = self._clients[members[client_index]]
+                self._vehicles[group[vehicle_index]].load_cargo(client)
+                leftovers.discard(client.index)
+            used.extend(group[i] for i in part_used)
+
+        # Доразмещение: не поместившиеся в своей группе - по всему парку
+        solve = get_strategy(self.strategy)
+        repair_used, unplaced = solve(self._vehicles, [self._clients[i] for i in sorted(leftovers)])
+        already_used = set(used)
+        used.extend(v.index for v in repair_used if v.index not in already_used)
+
+        self.elapsed = time.perf_counter() - started
+        self.used = used
+        self.unplaced = [c.index for c in unplaced]
+
+    def apply(self):
+        """Загружает транспорт по рассчитанному плану и возвращает PackingResult."""
+        if self.used is None:
+            raise RuntimeError("План еще не рассчитан")
+        for vehicle_index, client_index in self.loads:
+            self.vehicles[vehicle_index].load_cargo(self.clients[client_index])
+        result = PackingResult(self.strategy, self.vehicles,
+                               [self.vehicles[i] for i in self.used],
+                               [self.clients[i] for i in self.unplaced],
+                               self.elapsed)
+
+        if self.improvement is not None:
+            # Перемещения найдены на копиях - переводим их на объекты программы
+            improvement = self.improvement
+            moves = [Move(self.clients[move.client.index],
+                          self.vehicles[move.source.index] if move.source is not None else None,
+                          self.vehicles[move.target.index] if move.target is not None else None)
+                     for move in improvement.moves]
+            result.improvement = ImprovementResult(
+                moves, improvement.vehicles_before, improvement.vehicles_after,
+                improvement.wasted_before, improvement.wasted_after, improvement.elapsed)
+        return result
@@ -0,0 +1,313 @@
+"""Чтение и запись снимков транспортной компании.
+
+Поддерживаются три формата:
+- JSON Lines (.jsonl): строка-заголовок, затем по одной записи на каждого
+  клиента и каждый транспорт. Пишется и читается генераторами, поэтому
+  расход памяти не зависит от размера компании.
+- Двоичный (.bin): записи фиксированной длины для клиентов и транспорта,
+  отдельные таблицы назначений и строк. Открывается через mmap, записи
+  декодируются только при обращении к ним (см. BinarySnapshot). Вагоны
+  грузов поезда не хранятся: грузы раскладываются по вагонам при загрузке.
+- JSON: один документ с полями company_name, clients, vehicles, timestamp
+  (исходный формат save_to_file), поддерживается для чтения старых файлов.
+
+Записи передаются парами (вид, словарь), где вид - 'client' или 'vehicle'.
+Клиенты всегда записываются раньше транспорта.
+"""
+
+import json
+import mmap
+import os
+import struct
+
+from fleet import TYPE_CODES
+
+FORMAT_NAME = 'transport-company'
+FORMAT_VERSION = 2  # 2 - объем и паллеты клиентов и транспорта
+
+JSONL_EXTENSION = '.jsonl'
+BINARY_EXTENSION = '.bin'
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+# raw_decode без обертки json.loads и поиска пробелов регулярным выражением
+_raw_decode = json.JSONDecoder().raw_decode
+
+
+def write_jsonl(filename, header, records):
+    """Записывает снимок в формате JSON Lines.
+
+    Файл сначала пишется во временный и затем атомарно заменяет старый,
+    поэтому сбой во время записи не портит предыдущий снимок.
+    """
+    tmp_name = filename + '.tmp'
+    with open(tmp_name, 'w', encoding='utf-8') as f:
+        f.write(_encode({'record': 'header', 'format': FORMAT_NAME,
+                         'version': FORMAT_VERSION, **header}) + '\n')
+        for kind, data in records:
+            f.write(_encode({'record': kind, **data}) + '\n')
+    os.replace(tmp_name, filename)
+
+
+def _parse_header(line):
+    """Возвращает заголовок JSON Lines или None, если это не он."""
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or data.get('record') != 'header':
+        return None
+    if data.get('version', 0) > FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия снимка: {data['version']}")
+    return data
+
+
+def _jsonl_records(f):
+    with f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data, end = _raw_decode(line)
+            if end != len(line):
+                raise ValueError(f"Лишние данные после записи снимка: {line[end:end + 20]!r}")
+            yield data.pop('record', None), data
+
+
+def _legacy_records(data):
+    for client_data in data['clients']:
+        yield 'client', client_data
+    for vehicle_data in data['vehicles']:
+        yield 'vehicle', vehicle_data
+
+
+# ==================== ДВОИЧНЫЙ ФОРМАТ ====================
+#
+# Заголовок, затем секции подряд: клиенты, транспорт, назначения
+# (номера клиентов, uint32), смещения строк (uint64, строк + 1) и байты
+# строк в UTF-8. Все числа little-endian.
+
+BINARY_MAGIC = b'TCSNAP\x00\x01'
+
+# magic, версия, резерв, строка-название, строка-время,
+# клиентов, транспорта, назначений, строк, размер байтов строк
+_HEADER = struct.Struct('<8sHHIIQQQQQ4x')
+# вес, строка-имя, флаги (бит 0 - VIP, бит 1 - загружен), объем, паллеты
+_CLIENT = struct.Struct('<dIB3xdI4x')
+# грузоподъемность, загрузка, доп. параметр, первое назначение,
+# число назначений, строка-ID, код типа, ограничение объема,
+# ограничение паллет (у поезда - на вагон; 0 - без ограничения)
+_VEHICLE = struct.Struct('<dddQIIB7xdI4x')
+# Записи версии 1 без объема и паллет
+_CLIENT_V1 = struct.Struct('<dIB3x')
+_VEHICLE_V1 = struct.Struct('<dddQIIB7x')
+_INDEX = struct.Struct('<I')
+_OFFSET = struct.Struct('<Q')
+
+_CLIENT_VIP = 1
+_CLIENT_LOADED = 2
+
+_TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+_EXTRA_FIELDS = {'Train': 'number_of_cars', 'Airplane': 'max_altitude'}
+# Поля ограничений в словаре транспорта: у поезда они задаются на вагон
+_LIMIT_FIELDS = {'Train': ('car_volume', 'car_pallets')}
+_DEFAULT_LIMIT_FIELDS = ('max_volume', 'max_pallets')
+
+
+def write_binary(filename, header, records):
+    """Записывает снимок в двоичном формате.
+
+    Записи транспорта должны идти после всех клиентов, на которых они
+    ссылаются. Файл заменяется атомарно, как и в write_jsonl.
+    """
+    strings = []
+    string_index = {}
+
+    def intern(text):
+        index = string_index.get(text)
+        if index is None:
+            index = string_index[text] = len(strings)
+            strings.append(text.encode('utf-8'))
+        return index
+
+    company_name = intern(header['company_name'])
+    timestamp = intern(header.get('timestamp') or '')
+
+    clients = bytearray()
+    vehicles = bytearray()
+    assignments = bytearray()
+    client_numbers = {}  # имя -> номер записи клиента
+    assignment_count = 0
+
+    for kind, data in records:
+        if kind == 'client':
+            flags = (_CLIENT_VIP if data['is_vip'] else 0) | (_CLIENT_LOADED if data['is_loaded'] else 0)
+            client_numbers[data['name']] = len(client_numbers)
+            clients += _CLIENT.pack(data['cargo_weight'], intern(data['name']), flags,
+                                    data.get('volume', 0.0), data.get('pallets', 0))
+        elif kind == 'vehicle':
+            names = data['clients_list']
+            for name in names:
+                assignments += _INDEX.pack(client_numbers[name])
+            extra = data.get(_EXTRA_FIELDS.get(data['type']), 0.0)
+            volume_field, pallets_field = _LIMIT_FIELDS.get(data['type'], _DEFAULT_LIMIT_FIELDS)
+            vehicles += _VEHICLE.pack(data['capacity'], data['current_load'], extra,
+                                      assignment_count, len(names), intern(data['vehicle_id']),
+                                      TYPE_CODES[data['type']],
+                                      data.get(volume_field) or 0.0, data.get(pallets_field) or 0)
+            assignment_count += len(names)
+        else:
+            raise ValueError(f"Неизвестный вид записи: {kind}")
+
+    offsets = bytearray()
+    position = 0
+    for encoded in strings:
+        offsets += _OFFSET.pack(position)
+        position += len(encoded)
+    offsets += _OFFSET.pack(position)
+
+    tmp_name = filename + '.tmp'
+    with open(tmp_name, 'wb') as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, FORMAT_VERSION, 0, company_name, timestamp,
+                             len(clients) // _CLIENT.size, len(vehicles) // _VEHICLE.size,
+                             assignment_count, len(strings), position))
+        f.write(clients)
+        f.write(vehicles)
+        f.write(assignments)
+        f.write(offsets)
+        for encoded in strings:
+            f.write(encoded)
+    os.replace(tmp_name, filename)
+
+
+class BinarySnapshot:
+    """Двоичный снимок, отображенный в память через mmap.
+
+    Открытие читает только заголовок; записи клиентов, транспорта и строки
+    декодируются при обращении к ним.
+    """
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, _, company_name, timestamp, self.client_count, self.vehicle_count,
+         assignment_count, string_count, _) = _HEADER.unpack_from(self._mm, 0)
+        if magic != BINARY_MAGIC:
+            self.close()
+            raise ValueError("Файл не является двоичным снимком компании")
+        if version > FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Неподдерживаемая версия снимка: {version}")
+        self.version = version
+        self._client_struct = _CLIENT if version >= 2 else _CLIENT_V1
+        self._vehicle_struct = _VEHICLE if version >= 2 else _VEHICLE_V1
+
+        self._clients_at = _HEADER.size
+        self._vehicles_at = self._clients_at + self.client_count * self._client_struct.size
+        self._assignments_at = self._vehicles_at + self.vehicle_count * self._vehicle_struct.size
+        self._offsets_at = self._assignments_at + assignment_count * _INDEX.size
+        self._strings_at = self._offsets_at + (string_count + 1) * _OFFSET.size
+
+        self.header = {'company_name': self.string(company_name),
+                       'timestamp': self.string(timestamp) or None}
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def string(self, index):
+        start, end = struct.unpack_from('<QQ', self._mm, self._offsets_at + index * _OFFSET.size)
+        return self._mm[self._strings_at + start:self._strings_at + end].decode('utf-8')
+
+    def client(self, index):
+        """Возвращает клиента с номером index в виде словаря Client.to_dict."""
+        record = self._client_struct
+        weight, name, flags, *sizes = record.unpack_from(self._mm, self._clients_at + index * record.size)
+        data = {'name': self.string(name), 'cargo_weight': weight,
+                'is_vip': bool(flags & _CLIENT_VIP), 'is_loaded': bool(flags & _CLIENT_LOADED)}
+        if sizes:
+            data['volume'], data['pallets'] = sizes
+        return data
+
+    def client_name(self, index):
+        record = self._client_struct
+        name = record.unpack_from(self._mm, self._clients_at + index * record.size)[1]
+        return self.string(name)
+
+    def vehicle(self, index):
+        """Возвращает транспорт с номером index в виде словаря Vehicle.to_dict."""
+        record = self._vehicle_struct
+        (capacity, current_load, extra, first, count, vehicle_id,
+         type_code, *limits) = record.unpack_from(self._mm, self._vehicles_at + index * record.size)
+
+        start = self._assignments_at + first * _INDEX.size
+        numbers = struct.unpack_from(f'<{count}I', self._mm, start)
+
+        vehicle_type = _TYPE_NAMES[type_code]
+        data = {'vehicle_id': self.string(vehicle_id), 'capacity': capacity,
+                'current_load': current_load, 'type': vehicle_type,
+                'clients_list': [self.client_name(n) for n in numbers]}
+        if vehicle_type == 'Train':
+            data['number_of_cars'] = int(extra)
+        elif vehicle_type == 'Airplane':
+            data['max_altitude'] = extra
+        if limits:
+            volume_field, pallets_field = _LIMIT_FIELDS.get(vehicle_type, _DEFAULT_LIMIT_FIELDS)
+            data[volume_field] = limits[0] or None
+            data[pallets_field] = limits[1] or None
+        return data
+
+    def records(self):
+        """Генератор всех записей; по окончании обхода снимок закрывается."""
+        with self:
+            for i in range(self.client_count):
+                yield 'client', self.client(i)
+            for i in range(self.vehicle_count):
+                yield 'vehicle', self.vehicle(i)
+
+
+def open_snapshot(filename):
+    """Открывает снимок любого поддерживаемого формата.
+
+    Возвращает кортеж (заголовок, итератор записей). Для JSON Lines и
+    двоичного формата записи читаются из файла по мере обхода итератора.
+    """
+    with open(filename, 'rb') as f:
+        magic = f.read(len(BINARY_MAGIC))
+    if magic == BINARY_MAGIC:
+        snapshot = BinarySnapshot(filename)
+        return snapshot.header, snapshot.records()
+
+    f = open(filename, 'r', encoding='utf-8')
+    header = _parse_header(f.readline())
+
+    if header is not None:
+        return header, _jsonl_records(f)
+
+    with f:
+        f.seek(0)
+        data = json.load(f)
+    header = {'company_name': data['company_name'], 'timestamp': data.get('timestamp')}
+    return header, _legacy_records(data)
+
+
+def read_header(filename):
+    """Читает только заголовок снимка любого поддерживаемого формата."""
+    with open(filename, 'rb') as f:
+        magic = f.read(len(BINARY_MAGIC))
+    if magic == BINARY_MAGIC:
+        with BinarySnapshot(filename) as snapshot:
+            return snapshot.header
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        header = _parse_header(f.readline())
+        if header is not None:
+            return header
+        f.seek(0)
+        data = json.load(f)
+    return {'company_name': data['company_name'], 'timestamp': data.get('timestamp')}
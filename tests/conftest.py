@@ -0,0 +1,41 @@
+"""Общие настройки тестов: модули программы лежат в корне репозитория."""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import Airplane, Client, TransportCompany, Train, Vehicle  # noqa: E402
+
+
+def random_vehicle(rng, multi=False):
+    """Случайный транспорт любого типа; при multi - с объемом и паллетами."""
+    capacity = round(rng.uniform(5.0, 40.0), 1)
+    volume = rng.choice([None, 20.0, 40.0]) if multi else None
+    pallets = rng.choice([None, 4, 8]) if multi else None
+    kind = rng.random()
+    if kind < 0.6:
+        return Vehicle(capacity, volume, pallets)
+    if kind < 0.8:
+        cars = rng.randint(1, 4)
+        return Train(capacity, cars,
+                     volume / cars if volume is not None else None,
+                     max(1, pallets // cars) if pallets is not None else None)
+    return Airplane(capacity, 10000.0, volume, pallets)
+
+
+def random_client(rng, name, multi=False):
+    return Client(name, round(rng.uniform(0.5, 12.0), 1), rng.random() < 0.2,
+                  round(rng.uniform(0.0, 10.0), 1) if multi else 0.0,
+                  rng.randint(0, 3) if multi else 0)
+
+
+def random_company(seed, clients=60, vehicles=12, multi=False):
+    """Компания со случайными клиентами и транспортом, грузы распределены."""
+    rng = random.Random(seed)
+    company = TransportCompany(f"Тест {seed}")
+    company.add_vehicles(random_vehicle(rng, multi) for _ in range(vehicles))
+    company.add_clients(random_client(rng, f"c{i}", multi) for i in range(clients))
+    company.optimize_cargo_distribution()
+    return company
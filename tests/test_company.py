@@ -0,0 +1,122 @@
+"""Индексы, порядок и накопительная статистика TransportCompany."""
+
+import random
+
+import pytest
+
+from conftest import random_client, random_company, random_vehicle
+from core import Client, TransportCompany, Vehicle
+from packing import EXACT_MAX_CLIENTS, STRATEGIES
+
+
+def check_company(company):
+    """Итоги совпадают с пересчетом, индексы и позиции - со списками."""
+    company.check_statistics()
+    assert all(client._position == i for i, client in enumerate(company.clients))
+    assert all(vehicle._position == i for i, vehicle in enumerate(company.vehicles))
+    assert company._clients_by_name == {c.name: c for c in company.clients}
+    assert company._vehicles_by_id == {v.vehicle_id: v for v in company.vehicles}
+    carried = [c for v in company.vehicles for c in v.clients_list]
+    assert len(carried) == len({id(c) for c in carried})
+    assert {id(c) for c in carried} == {id(c) for c in company.clients if c.is_loaded}
+    assert company.get_load_percentages() == [v.get_load_percentage() for v in company.vehicles]
+    assert company.get_available_vehicles() == [v for v in company.vehicles
+                                                if v.get_available_capacity() > 0]
+
+
+def random_step(company, rng, names):
+    step = rng.random()
+    if step < 0.25:
+        company.add_client(random_client(rng, f"c{next(names)}", rng.random() < 0.3))
+    elif step < 0.35:
+        company.add_vehicle(random_vehicle(rng, rng.random() < 0.3))
+    elif step < 0.5 and company.clients:
+        company.remove_client(rng.choice(company.clients).name)
+    elif step < 0.57 and company.vehicles:
+        company.remove_vehicle(rng.choice(company.vehicles).vehicle_id)
+    elif step < 0.72 and company.vehicles:
+        # Ручная загрузка одного груза
+        client = rng.choice(company.clients) if company.clients else None
+        vehicle = rng.choice(company.vehicles)
+        if (client is not None and not client.is_loaded
+                and vehicle.can_fit(client.cargo_weight, client.volume, client.pallets)):
+            vehicle.load_cargo(client)
+    elif step < 0.82 and company.vehicles:
+        vehicle = rng.choice(company.vehicles)
+        if vehicle.clients_list and rng.random() < 0.5:
+            vehicle.unload_cargo(rng.choice(vehicle.clients_list).name)
+        else:
+            vehicle.unload_cargo()
+    elif step < 0.92:
+        company.optimize_cargo_distribution(rng.choice(['ffd', 'bfd', 'wfd', 'nf']))
+    else:
+        company.replan_cargo_distribution()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_operations_keep_statistics(seed):
+    rng = random.Random(seed)
+    names = iter(range(10 ** 6))
+    company = TransportCompany("Тест")
+    for _ in range(600):
+        random_step(company, rng, names)
+        check_company(company)
+
+
+def test_remove_keeps_order():
+    company = random_company(0, clients=30, vehicles=20)
+    clients = list(company.clients)
+    vehicles = list(company.vehicles)
+    for client in clients[::3]:
+        company.remove_client(client.name)
+    for vehicle in vehicles[::4]:
+        company.remove_vehicle(vehicle.vehicle_id)
+
+    assert company.clients == [c for c in clients if c not in clients[::3]]
+    assert company.vehicles == [v for v in vehicles if v not in vehicles[::4]]
+    check_company(company)
+
+
+def test_load_percentages_follow_vehicles_after_removal():
+    company = TransportCompany("Тест")
+    small, middle, large = Vehicle(10.0), Vehicle(20.0), Vehicle(40.0)
+    company.add_vehicles([small, middle, large])
+    company.add_client(Client("a", 10.0))
+    middle.load_cargo(company.get_client("a"))
+
+    company.remove_vehicle(small.vehicle_id)
+    assert company.vehicles == [middle, large]
+    assert company.get_load_percentages() == [50.0, 0.0]
+    check_company(company)
+
+
+def test_removed_object_can_be_added_again():
+    company = random_company(1, clients=10, vehicles=5)
+    client = company.clients[2]
+    vehicle = company.vehicles[1]
+    company.remove_client(client.name)
+    company.remove_vehicle(vehicle.vehicle_id)
+    company.add_client(client)
+    company.add_vehicle(vehicle)
+
+    assert company.clients[-1] is client and company.vehicles[-1] is vehicle
+    check_company(company)
+
+
+@pytest.mark.parametrize('strategy', list(STRATEGIES))
+def test_optimize_with_every_strategy(strategy):
+    company = random_company(1, clients=EXACT_MAX_CLIENTS, vehicles=6, multi=True)
+    company.optimize_cargo_distribution(strategy)
+    check_company(company)
+    assert (len(company.last_packing.unplaced)
+            == sum(not c.is_loaded for c in company.clients))
+
+
+def test_exact_over_limit_keeps_current_plan():
+    company = random_company(2, clients=EXACT_MAX_CLIENTS + 5, vehicles=10)
+    before = [[c.name for c in v.clients_list] for v in company.vehicles]
+    for options in ({}, {'improve': 0.1}, {'workers': 2}):
+        with pytest.raises(ValueError):
+            company.optimize_cargo_distribution('exact', **options)
+        assert [[c.name for c in v.clients_list] for v in company.vehicles] == before
+        check_company(company)
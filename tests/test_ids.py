@@ -0,0 +1,30 @@
+"""Выдача ID транспорта и регистрация ID, пришедших извне."""
+
+import pytest
+
+from ids import IdAllocator
+
+
+def test_allocated_ids_skip_reserved_ones():
+    ids = IdAllocator(batch_size=4, start=100)
+    first = ids.allocate('T')
+    ids.reserve('T-00000030')  # 36**1 * 3 = 108: впереди счетчика
+    ids.reserve_many(['P-0000002S', 'нестандартный', 'T-abc', 'T-0000001_'])
+    issued = [first] + ids.allocate_many('T', 50) + [ids.allocate('A')]
+
+    numbers = [int(vehicle_id.split('-')[1], 36) for vehicle_id in issued]
+    assert len(set(numbers)) == len(numbers)
+    assert numbers == sorted(numbers)
+    assert 108 not in numbers and 100 in numbers and 101 not in numbers
+
+
+def test_reserve_behind_counter_keeps_batch():
+    ids = IdAllocator(batch_size=8, start=1000)
+    ids.allocate('T')
+    ids.reserve_many(f'T-{n:08d}' for n in range(10))  # Номера далеко позади
+    assert ids.allocate('T') == 'T-000000RT'  # 1001 в 36-ричной записи
+
+
+def test_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        IdAllocator(batch_size=0)
@@ -0,0 +1,109 @@
+"""Восстановление компании из снимка и журнала."""
+
+import random
+import time
+
+import pytest
+
+import journal
+from conftest import random_client, random_company, random_vehicle
+from core import TransportCompany
+from journal import Journal
+
+
+def state(company):
+    return (company.get_statistics(),
+            [c.to_dict() for c in company.clients],
+            [v.to_dict() for v in company.vehicles])
+
+
+def check_restored(path, expected):
+    """Компания, открытая из снимка и журнала path, совпадает с expected."""
+    company = TransportCompany("Восстановленная")
+    log = Journal(path)
+    log.open(company)
+    log.close()
+    statistics, clients, vehicles = state(company)
+    # Суммы весов накапливаются в другом порядке и могут отличаться округлением
+    assert statistics == pytest.approx(expected[0])
+    assert (clients, vehicles) == expected[1:]
+
+
+def change(company, rng, steps):
+    for step in range(steps):
+        kind = step % 5
+        if kind == 0:
+            company.add_client(random_client(rng, f"j{step}"))
+        elif kind == 1:
+            company.add_vehicle(random_vehicle(rng))
+        elif kind == 2 and company.clients:
+            company.remove_client(rng.choice(company.clients).name)
+        elif kind == 3 and company.vehicles:
+            company.remove_vehicle(rng.choice(company.vehicles).vehicle_id)
+        else:
+            company.optimize_cargo_distribution(rng.choice(['ffd', 'bfd', 'wfd']))
+
+
+def test_replay_restores_company(tmp_path):
+    path = str(tmp_path / 'company.jsonl')
+    company = random_company(0)
+    log = Journal(path, compact_every=10 ** 6)
+    log.open(company)
+    change(company, random.Random(0), 200)
+    expected = state(company)
+    log.close()
+
+    check_restored(path, expected)
+
+
+def test_replay_across_compactions(tmp_path):
+    path = str(tmp_path / 'company.jsonl')
+    company = TransportCompany("Тест")
+    log = Journal(path, compact_every=7)
+    log.open(company)
+    change(company, random.Random(1), 300)
+    expected = state(company)
+    log.close()
+
+    check_restored(path, expected)
+
+
+def test_torn_last_record_is_skipped(tmp_path):
+    path = str(tmp_path / 'company.jsonl')
+    company = random_company(2)
+    log = Journal(path, compact_every=10 ** 6)
+    log.open(company)
+    change(company, random.Random(2), 20)
+    expected = state(company)
+    log.close()
+
+    with open(log.log_path, 'a', encoding='utf-8') as f:
+        f.write('{"seq": 100000, "op": "add_cli')  # Оборванная запись
+    check_restored(path, expected)
+
+
+def test_load_during_background_compaction(tmp_path, monkeypatch):
+    other = str(tmp_path / 'other.json')
+    random_company(3).save_to_file(other)
+
+    write_jsonl = journal.write_jsonl
+
+    def slow_write_jsonl(*args, **kwargs):
+        time.sleep(0.3)
+        return write_jsonl(*args, **kwargs)
+
+    monkeypatch.setattr(journal, 'write_jsonl', slow_write_jsonl)
+
+    path = str(tmp_path / 'company.jsonl')
+    company = TransportCompany("Тест")
+    log = Journal(path, compact_every=5)
+    log.open(company)
+    change(company, random.Random(3), 5)  # Запускает фоновое сжатие
+    assert log._compactor is not None and log._compactor.is_alive()
+
+    company.load_from_file(other)
+    company.optimize_cargo_distribution()
+    expected = state(company)
+    log.close()
+
+    check_restored(path, expected)
@@ -0,0 +1,187 @@
+"""Стратегии распределения и деревья отрезков против простых эталонов."""
+
+import itertools
+import random
+
+import pytest
+
+import packing
+from conftest import random_client, random_vehicle
+from core import Client, Train, Vehicle
+from packing import (CapacityTree, PackingPlan, VectorCapacityTree, branch_and_bound,
+                     first_fit_decreasing, order_clients, pack, worst_fit_decreasing)
+
+
+def random_instance(seed, multi):
+    rng = random.Random(seed)
+    vehicles = [random_vehicle(rng, multi) for _ in range(rng.randint(0, 25))]
+    clients = [random_client(rng, f"c{i}", multi) for i in range(rng.randint(0, 120))]
+    return vehicles, clients
+
+
+def placements(vehicles, used):
+    return ([vehicles.index(v) for v in used],
+            [[c.name for c in v.clients_list] for v in vehicles])
+
+
+def naive_first_fit(vehicles, clients):
+    """First Fit Decreasing перебором: сначала открытый транспорт, затем свободный."""
+    used = []
+    for client in order_clients(clients):
+        fits = [v for v in used + [v for v in vehicles if v not in used]
+                if v.can_fit(client.cargo_weight, client.volume, client.pallets)]
+        if fits:
+            if fits[0] not in used:
+                used.append(fits[0])
+            fits[0].load_cargo(client)
+    return used
+
+
+def free_weight(vehicle):
+    """Остаток по весу; у поезда - не больше остатка самого свободного вагона."""
+    free = vehicle.capacity - vehicle.current_load
+    if vehicle.cars is not None:
+        free = min(free, max(vehicle.cars.capacity - load for load in vehicle.cars.loads))
+    return free
+
+
+def naive_worst_fit(vehicles, clients):
+    """Worst Fit Decreasing перебором: подходящий транспорт с наибольшим остатком по весу."""
+    used = []
+    for client in order_clients(clients):
+        ranked = sorted(range(len(vehicles)), key=lambda i: (-free_weight(vehicles[i]), i))
+        for i in ranked:
+            vehicle = vehicles[i]
+            if vehicle.can_fit(client.cargo_weight, client.volume, client.pallets):
+                if vehicle not in used:
+                    used.append(vehicle)
+                vehicle.load_cargo(client)
+                break
+    return used
+
+
+@pytest.mark.parametrize('multi', [False, True])
+@pytest.mark.parametrize('strategy, reference', [
+    (first_fit_decreasing, naive_first_fit),
+    (worst_fit_decreasing, naive_worst_fit),
+])
+def test_strategy_matches_naive_reference(strategy, reference, multi):
+    for seed in range(150):
+        vehicles, clients = random_instance(seed, multi)
+        used, _ = strategy(vehicles, clients)
+        expected_vehicles, expected_clients = random_instance(seed, multi)
+        expected_used = reference(expected_vehicles, expected_clients)
+        assert placements(vehicles, used) == placements(expected_vehicles, expected_used), seed
+
+
+def test_capacity_tree_finds_leftmost_fitting_slot():
+    rng = random.Random(0)
+    values = [rng.uniform(0, 10) for _ in range(37)]
+    tree = CapacityTree.from_values(values)
+    for _ in range(2000):
+        if rng.random() < 0.5:
+            index = rng.randrange(len(values))
+            values[index] = rng.uniform(0, 10)
+            tree.update(index, values[index])
+        weight = rng.uniform(0, 11)
+        banned = rng.randrange(len(values))
+        expected = next((i for i, value in enumerate(values)
+                         if value >= weight and i != banned), -1)
+        assert tree.find_first(weight, lambda i: i != banned) == expected
+        assert tree.max() == max(values)
+
+
+def test_vector_tree_finds_leftmost_fitting_slot():
+    rng = random.Random(1)
+
+    def triple():
+        return rng.uniform(0, 10), rng.uniform(0, 10), rng.randint(0, 5)
+
+    values = [triple() for _ in range(29)]
+    tree = VectorCapacityTree.from_values(values)
+    for _ in range(2000):
+        if rng.random() < 0.5:
+            index = rng.randrange(len(values))
+            values[index] = triple()
+            tree.update(index, values[index])
+        demand = triple()
+        expected = next((i for i, value in enumerate(values)
+                         if all(v >= d for v, d in zip(value, demand))), -1)
+        assert tree.find_first(demand, lambda i: True) == expected
+
+
+def brute_force_cost(vehicles, clients):
+    """Лучшая стоимость branch_and_bound полным перебором назначений."""
+    best = None
+    for assignment in itertools.product(range(-1, len(vehicles)), repeat=len(clients)):
+        loads = [0.0] * len(vehicles)
+        for client, j in zip(clients, assignment):
+            if j >= 0:
+                loads[j] += client.cargo_weight
+        if any(load > v.capacity for load, v in zip(loads, vehicles)):
+            continue
+        used = {j for j in assignment if j >= 0}
+        cost = (sum(c.is_vip and j < 0 for c, j in zip(clients, assignment)),
+                sum(j < 0 for j in assignment),
+                len(used),
+                round(sum(vehicles[j].capacity - loads[j] for j in used), 6))
+        best = cost if best is None or cost < best else best
+    return best
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_branch_and_bound_is_optimal_on_small_tasks(seed):
+    rng = random.Random(seed)
+    vehicles = [Vehicle(float(rng.randint(3, 10))) for _ in range(rng.randint(1, 4))]
+    clients = [Client(f"c{i}", float(rng.randint(1, 6)), rng.random() < 0.3)
+               for i in range(rng.randint(1, 6))]
+    expected = brute_force_cost(vehicles, clients)
+
+    used, unplaced = branch_and_bound(vehicles, clients)
+    cost = (sum(c.is_vip for c in unplaced), len(unplaced), len(used),
+            round(sum(v.capacity - v.current_load for v in used), 6))
+    assert cost == expected
+    assert sum(len(v.clients_list) for v in vehicles) == len(clients) - len(unplaced)
+
+
+@pytest.mark.parametrize('strategy', ['ffd', 'bfd', 'wfd', 'nf'])
+def test_plan_on_copies_matches_pack(strategy):
+    for seed in range(20):
+        vehicles, clients = random_instance(seed, multi=seed % 2 == 1)
+        plan = PackingPlan(vehicles, clients, strategy).solve()
+        assert all(not v.clients_list for v in vehicles)
+        result = plan.apply()
+
+        expected_vehicles, expected_clients = random_instance(seed, multi=seed % 2 == 1)
+        expected = pack(expected_vehicles, expected_clients, strategy)
+        assert (placements(vehicles, result.used_vehicles)
+                == placements(expected_vehicles, expected.used_vehicles))
+
+
+@pytest.mark.parametrize('partition', ['band', 'type'])
+def test_parallel_plan_places_every_client_once(monkeypatch, partition):
+    def serial(self, progress=None):
+        raise AssertionError("ожидался параллельный расчет")
+
+    monkeypatch.setattr(packing, 'PARALLEL_MIN_VEHICLES', 1)
+    monkeypatch.setattr(PackingPlan, '_solve_serial', serial)
+    vehicles, clients = random_instance(7, multi=False)
+    result = PackingPlan(vehicles, clients, 'ffd', workers=2, partition=partition).solve().apply()
+
+    carried = [c for v in vehicles for c in v.clients_list]
+    assert len(carried) == len(set(map(id, carried)))
+    assert {id(c) for c in carried} | {id(c) for c in result.unplaced} == set(map(id, clients))
+    assert all(v.current_load <= v.capacity + 1e-9 for v in vehicles)
+    assert set(map(id, result.used_vehicles)) == {id(v) for v in vehicles if v.clients_list}
+
+
+@pytest.mark.parametrize('strategy', ['ffd', 'bfd', 'wfd', 'nf', 'exact'])
+def test_train_cars_are_separate_bins(strategy):
+    train = Train(20.0, 2)  # Два вагона по 10 т
+    clients = [Client(name, weight) for name, weight in
+               [("big", 12.0), ("a", 6.0), ("b", 6.0), ("c", 4.0), ("d", 5.0)]]
+    result = pack([train], clients, strategy)
+
+    assert sorted(c.name for c in result.unplaced) == ["big", "d"]
+    assert sorted(train.cars.loads) == [6.0, 10.0]
+    assert all(load <= train.cars.capacity for load in train.cars.loads)
@@ -0,0 +1,162 @@
+"""Снимки компании в форматах JSON, JSON Lines и двоичном; импорт из CSV и JSON Lines."""
+
+import json
+import os
+
+import pytest
+
+import importer
+from conftest import random_company
+from core import TransportCompany
+from importer import ClientImport, import_clients, parse_clients, read_fleet
+
+FORMATS = ['company.json', 'company.jsonl', 'company.bin']
+
+
+def records(company):
+    return [(kind, {k: v for k, v in data.items() if k != 'timestamp'})
+            for kind, data in company.iter_records()]
+
+
+@pytest.mark.parametrize('filename', FORMATS)
+@pytest.mark.parametrize('multi', [False, True])
+def test_round_trip(tmp_path, filename, multi):
+    company = random_company(4, clients=300, vehicles=40, multi=multi)
+    path = str(tmp_path / filename)
+    company.save_to_file(path)
+
+    loaded = TransportCompany("Пустая")
+    assert loaded.load_from_file(path) == []
+    assert loaded.name == company.name
+    assert records(loaded) == records(company)
+    assert loaded.get_statistics() == pytest.approx(company.get_statistics())
+    loaded.check_statistics()
+
+
+@pytest.mark.parametrize('filename', FORMATS)
+def test_format_is_detected_by_content(tmp_path, filename):
+    company = random_company(5)
+    path = str(tmp_path / filename)
+    company.save_to_file(path)
+    renamed = str(tmp_path / 'company.dat')
+    os.rename(path, renamed)
+
+    loaded = TransportCompany()
+    assert loaded.load_from_file(renamed) == []
+    assert records(loaded) == records(company)
+
+
+def test_inconsistent_snapshot_is_reported(tmp_path):
+    company = random_company(6)
+    path = str(tmp_path / 'company.json')
+    company.save_to_file(path)
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    vehicle = next(v for v in data['vehicles'] if v['clients_list'])
+    vehicle['current_load'] += 1.0
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+    loaded = TransportCompany()
+    issues = loaded.load_from_file(path)
+    assert any(vehicle['vehicle_id'] in issue for issue in issues)
+    loaded.check_statistics()
+
+
+def write_lines(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    return str(path)
+
+
+def test_import_rejects_bad_rows(tmp_path):
+    csv_path = write_lines(tmp_path / 'orders.csv', [
+        'name,cargo_weight,is_vip,volume,pallets',
+        'a,1.5,да,2,1',
+        'b,-1,,,',
+        ',2,,,',
+        'c,2,может быть,,',
+        'd,3,нет,,',
+        'a,4,,,',
+    ])
+    jsonl_path = write_lines(tmp_path / 'orders.jsonl', [
+        '{"name": "e", "cargo_weight": 2.5, "is_vip": true}',
+        '{"name": "f", "cargo_weight": "x"}',
+        'не JSON',
+    ])
+    rejects = str(tmp_path / 'rejects.jsonl')
+
+    company = TransportCompany()
+    summary = import_clients(company, [csv_path, jsonl_path], rejects, batch_size=2)
+
+    assert sorted(c.name for c in company.clients) == ['a', 'd', 'e']
+    assert company.get_client('a').is_vip and company.get_client('a').pallets == 1
+    assert summary['imported'] == 3
+    assert summary['rejected'] == summary['rows'] - 3 == 6
+    with open(rejects, encoding='utf-8') as f:
+        lines = [(r['file'], r['line']) for r in map(json.loads, f)]
+    assert sorted(lines) == sorted([(csv_path, n) for n in (3, 4, 5, 7)]
+                                   + [(jsonl_path, n) for n in (2, 3)])
+    company.check_statistics()
+
+
+def test_clean_import_removes_old_rejects(tmp_path):
+    rejects = str(tmp_path / 'rejects.jsonl')
+    bad = write_lines(tmp_path / 'bad.csv', ['name,cargo_weight', 'a,x'])
+    good = write_lines(tmp_path / 'good.csv', ['name,cargo_weight', 'a,1'])
+
+    assert import_clients(TransportCompany(), bad, rejects)['rejected'] == 1
+    assert os.path.exists(rejects)
+    assert import_clients(TransportCompany(), good, rejects)['rejected'] == 0
+    assert not os.path.exists(rejects)
+
+
+def test_parse_and_add_separately(tmp_path):
+    path = write_lines(tmp_path / 'orders.csv',
+                       ['name,cargo_weight'] + [f'c{k},{k % 5 + 1}' for k in range(50)] + ['c0,1'])
+    batches = list(parse_clients(path, batch_size=7))  # Разбор компанию не трогает
+
+    company = TransportCompany()
+    session = ClientImport(company)
+    for batch in batches:
+        session.add(*batch)
+    summary = session.close()
+
+    expected = TransportCompany()
+    assert ({k: v for k, v in summary.items() if k != 'elapsed'}
+            == {k: v for k, v in import_clients(expected, path).items() if k != 'elapsed'})
+    assert records(company) == records(expected)
+
+
+def test_import_in_processes_matches_sequential(tmp_path, monkeypatch):
+    files = [write_lines(tmp_path / f'part{i}.csv',
+                         ['name,cargo_weight,is_vip'] + [f'p{i}-{k},{k % 7 + 1},{k % 3 == 0}'
+                                                         for k in range(500)])
+             for i in range(3)]
+    sequential = TransportCompany()
+    import_clients(sequential, files)
+
+    monkeypatch.setattr(importer, 'PARALLEL_MIN_BYTES', 0)
+    parallel = TransportCompany()
+    summary = import_clients(parallel, files, workers=2, batch_size=100)
+
+    assert summary['imported'] == 1500
+    assert (sorted(tuple(c.to_dict().values()) for c in parallel.clients)
+            == sorted(tuple(c.to_dict().values()) for c in sequential.clients))
+    parallel.check_statistics()
+
+
+def test_read_fleet(tmp_path):
+    path = write_lines(tmp_path / 'fleet.csv', [
+        'type,capacity,max_volume,max_pallets,number_of_cars,car_volume,car_pallets,max_altitude',
+        'Vehicle,10,30,,,,,',
+        'Train,120,,,4,20,6,',
+        'Airplane,50,,,,,,9000',
+    ])
+    vehicles = read_fleet(path)
+    assert [v.__class__.__name__ for v in vehicles] == ['Vehicle', 'Train', 'Airplane']
+    assert vehicles[1].max_volume == 80 and vehicles[2].max_altitude == 9000
+
+    bad = write_lines(tmp_path / 'bad.csv', ['type,capacity', 'Ship,10'])
+    with pytest.raises(ValueError):
+        read_fleet(bad)